@@ -26,13 +26,21 @@ def measurement_within_tol(measurement: float, target: float, tolerance: float):
 
 
 # function to create a channel scan on a DAQ with a given SCPI function (.1sec delay, <cycles> number of repeat scans)
-def createScanAndRead(instr, func: str, chanStart: int, chanEnd: int, cycles: int):
-    serial_protocols.socket_write(
-        instr, f"SENS:FUNC '{func}', (@{chanStart}:{chanEnd})\r\n"
+# data_format SREAL or DREAL reads the buffer as binary, the DAQ is put back to ASCII afterwards
+def createScanAndRead(
+    instr, func: str, chanStart: int, chanEnd: int, cycles: int, data_format="ASCII"
+):
+    serial_protocols.socket_write_batch(
+        instr,
+        [
+            f"SENS:FUNC '{func}', (@{chanStart}:{chanEnd})",
+            f"ROUT:DEL .1, (@{chanStart}:{chanEnd})",
+            f"ROUT:SCAN:COUN:SCAN {cycles}",
+            f"ROUT:SCAN:CRE (@{chanStart}:{chanEnd})",
+        ]
+        + serial_protocols.binary_format_commands(data_format),
     )
-    serial_protocols.socket_write(instr, f"ROUT:DEL .1, (@{chanStart}:{chanEnd})\r\n")
-    serial_protocols.socket_write(instr, f"ROUT:SCAN:COUN:SCAN {cycles}\r\n")
-    serial_protocols.socket_write(instr, f"ROUT:SCAN:CRE (@{chanStart}:{chanEnd})\r\n")
+    # INIT/*WAI stay out of the batch so the error query does not block on the scan
     serial_protocols.socket_write(instr, "INIT\r\n")
     serial_protocols.socket_write(instr, "*WAI\r\n")
 
@@ -47,10 +55,20 @@ def createScanAndRead(instr, func: str, chanStart: int, chanEnd: int, cycles: in
     buffer_end = serial_protocols.socket_read(instr)
     buffer_end = buffer_end.strip("\n")
 
+    query = f':TRAC:DATA? {buffer_start}, {buffer_end}, "defbuffer1", READ\r\n'
+    if data_format in serial_protocols.BINARY_FORMATS:
+        # readings arrive as one block of floats, no string split or float() per reading
+        points = int(buffer_end) - int(buffer_start) + 1
+        try:
+            return serial_protocols.socket_query_binary(
+                instr, query, data_format, points
+            ).tolist()
+        finally:
+            # later ASCII reads on this connection expect text
+            serial_protocols.socket_write(instr, "FORM:DATA ASC\r\n")
+
     # put data in the buffer, convert to float
-    serial_protocols.socket_write(
-        instr, f':TRAC:DATA? {buffer_start}, {buffer_end}, "defbuffer1", READ\r\n'
-    )
+    serial_protocols.socket_write(instr, query)
     list = serial_protocols.socket_read(instr)
     list = list.split(",")
     for item in range(0, len(list)):
@@ -4,6 +4,7 @@ from system import serial_protocols
 res_channels = 12
 volt_channels = 8
 scans = 5
+data_format = "ASCII"  # SREAL or DREAL reads the DMM buffer as binary floats
 meas = {
     "GND": 0,
     "mems_X": 1,
@@ -53,11 +54,7 @@ def Ruby_Scan_Voltage(daq, supply):
     buffer_start = buffer_start.strip("\n")
     buffer_end = serial_protocols.serial_write_read(daq, ":TRAC:ACT:END?")
     buffer_end = buffer_end.strip("\n")
-    #put data in the buffer, convert to float
-    list = serial_protocols.serial_write_read(daq, ":TRAC:DATA? " + buffer_start + ", " + buffer_end + ", \"defbuffer1\", READ")
-    list = list.split(",")
-    for item in range(0, len(list)):
-        list[item] = float(list[item])
+    list = Ruby_Read_Buffer(daq, buffer_start, buffer_end)
     
     return list
 
@@ -80,8 +77,20 @@ def Ruby_Scan_Resistance(daq, supply):
     buffer_start = buffer_start.strip("\n")
     buffer_end = serial_protocols.serial_write_read(daq, ":TRAC:ACT:END?")
     buffer_end = buffer_end.strip("\n")
+    list = Ruby_Read_Buffer(daq, buffer_start, buffer_end)
+    return list
+
+def Ruby_Read_Buffer(daq, buffer_start, buffer_end):
+    query = ":TRAC:DATA? " + buffer_start + ", " + buffer_end + ", \"defbuffer1\", READ"
+    if data_format in serial_protocols.BINARY_FORMATS:
+        #read the buffer as one binary block of floats
+        points = int(buffer_end) - int(buffer_start) + 1
+        readings = serial_protocols.serial_query_binary(
+            daq, query, data_format, data_points=points
+        )
+        return readings.tolist()
     #put data in the buffer, convert to float
-    list = serial_protocols.serial_write_read(daq, ":TRAC:DATA? " + buffer_start + ", " + buffer_end + ", \"defbuffer1\", READ")
+    list = serial_protocols.serial_write_read(daq, query)
     list = list.split(",")
     for item in range(0, len(list)):
         list[item] = float(list[item])
@@ -96,6 +105,9 @@ def Ruby_calibration_measurement():
     print(serial_protocols.serial_write_read(supply, "*IDN?"))
     serial_protocols.serial_write(daq, "*RST")
     serial_protocols.serial_write(daq, "FORM:ASC:PREC 5")
+    if data_format in serial_protocols.BINARY_FORMATS:
+        for command in serial_protocols.binary_format_commands(data_format):
+            serial_protocols.serial_write(daq, command)
     
     #scan channels for voltage and resistance measurements
     res_list = Ruby_Scan_Resistance(daq, supply)
@@ -115,8 +127,9 @@ def Ruby_calibration_measurement():
             col.append(volt_list[i+j*volt_channels])
         volt_array.append(sum(col) / len(col))
     
-    #clear daq buffer and close out devices
+    #clear daq buffer, back to ascii readings and close out devices
     serial_protocols.serial_write(daq, ":TRAC:CLE")
+    serial_protocols.serial_write(daq, "FORM:DATA ASC")
     serial_protocols.serial_close(daq)
     serial_protocols.serial_close(supply)
 
@@ -4,12 +4,16 @@ import time
 
 from eseries import E96, find_nearest
 from PySide6.QtWidgets import QLabel
-from pyvisa import errors
 
 import PreCalPrimitives as prim
+from system import connection_pool
 from system import serial_protocols
 
 
+def reset_daq(daq) -> None:
+    serial_protocols.socket_write(daq, "*RST\r\n")
+
+
 class Subroutine:
     def __init__(self, window) -> None:
         self.window = window
@@ -279,29 +283,20 @@ class Subroutine:
         resistanceScan: tuple,
         cycles: int,
     ):
-        # talk to the daq and power supply
-        retrying = 3
-        while retrying:
-            try:
-                daq = serial_protocols.socket_open(daq_addr, 5025)
-                retrying = 0
-            except errors.VisaIOError:
-                retrying -= 1
-                if retrying == 0:
-                    print("could not connect to DAQ, quitting program")
-                    quit()
-        retrying = 3
-        while retrying:
-            try:
-                supply = serial_protocols.socket_open(supply_addr, 5555)
-                retrying = 0
-            except errors.VisaIOError:
-                retrying -= 1
-                if retrying == 0:
-                    print("could not connect to power supply, quitting program")
-                    quit()
-
-        serial_protocols.socket_write(daq, "*RST\r\n")
+        # talk to the daq and power supply. the pool keeps both sessions open
+        # between boards, the daq is only reset when a new session is opened.
+        try:
+            daq = connection_pool.socket_connection(
+                daq_addr, 5025, on_connect=reset_daq
+            )
+        except ConnectionError:
+            print("could not connect to DAQ, quitting program")
+            quit()
+        try:
+            supply = connection_pool.socket_connection(supply_addr, 5555)
+        except ConnectionError:
+            print("could not connect to power supply, quitting program")
+            quit()
 
         # scan channels for voltage and resistance measurements
         prim.powerSupplyChanOff(supply, 1)
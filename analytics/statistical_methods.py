@@ -1,4 +1,5 @@
 import sys
+import math
 import logging
 
 from analytics import numerical_methods
@@ -66,6 +67,27 @@ def standard_deviation_from_mean(data: list) -> float:
         return sig
 
 
+def sample_statistics(data) -> tuple[float, float, float, float]:
+    """compute mean, sample standard deviation, min and max of a sample.
+
+    unlike mean, any sequence of floats works (array, memoryview, slices), and
+    zero readings are kept.
+
+    Args:
+        data (Sequence[float]): sample values
+
+    Returns:
+        tuple[float, float, float, float]: mean, standard deviation, min, max.
+    """
+    n = len(data)
+    if n == 0:
+        logging.warning("List size too small")
+        return 0.0, 0.0, 0.0, 0.0
+    xbar = math.fsum(data) / n
+    sig = (math.fsum((x - xbar) ** 2 for x in data) / (n - 1)) ** 0.5 if n > 1 else 0.0
+    return xbar, sig, min(data), max(data)
+
+
 def r_score(x_data: list, y_data: list, coefficients: list) -> tuple[float, float]:
     """compute the coefficient of determination for a curve-fit. (r-score)
 
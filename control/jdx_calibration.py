@@ -4,14 +4,20 @@ import math
 import os
 import sys
 
+from control import point_pipeline
+
 from instrumentation import chamber
+from instrumentation import instrument_config
 from instrumentation import thermometry
 from instrumentation import motor_control
 
+from system import async_transport
+from system import connection_pool
 from system import digital_coms
 from system import settings
 from system import serial_protocols
 from system import countdown
+from system import settle_detector
 from system import stage_configuration
 
 from network import get_specs
@@ -220,44 +226,57 @@ def cycle_through_angles(
         temp (int): _description_
     """
     try:
+        # logging of a point runs while the stage moves to the next one.
+        with point_pipeline.PointPipeline() as pipeline:
+            for point_idx, point in enumerate(specs.cal_points_array, start=1):
+                print(
+                    f"\nMoving to {point} degrees ({point_idx}/{len(specs.cal_points_array)})"
+                )
 
-        for point_idx, point in enumerate(specs.cal_points_array, start=1):
-            print(
-                f"\nMoving to {point} degrees ({point_idx}/{len(specs.cal_points_array)})"
-            )
+                motor_control.move_stage_to_angle(instrumentation["Stage"], point)
 
-            motor_control.move_stage_to_angle(instrumentation["Stage"], point)
+                wait_for_sensors_to_settle(specs, port_dict, f"{point} degrees")
 
-            countdown.countdown(specs.settle_time)
+                for _ in range(stage_configuration.DATA_ATTEMPTS):
+                    # get data from all sensors.
 
-            for _ in range(stage_configuration.DATA_ATTEMPTS):
-                # get data from all sensors.
+                    data_from_sensors = get_data_from_sensors(
+                        port_dict,
+                        instrumentation["Stage"],
+                        instrumentation["DataAq"],
+                    )
 
-                data_from_sensors = get_data_from_sensors(
-                    port_dict,
-                    instrumentation["Stage"],
-                    instrumentation["DataAq"],
-                )
+                    # make sure the dataset from the all the sensors is not empty. i.e error.
 
-                # make sure the dataset from the all the sensors is not empty. i.e error.
+                    valid_data_flag = check_data_from_sensors(data_from_sensors)
 
-                valid_data_flag = check_data_from_sensors(data_from_sensors)
+                    if valid_data_flag is True:
+                        break
 
-                if valid_data_flag is True:
-                    break
+                current_time = datetime.datetime.now().strftime(
+                    settings.DATETIME_FORMAT
+                )
 
-            # let the user see what the data from all the sensors looks like.
-            display_results_from_sensor(data_from_sensors, specs, axis, cycle, temp)
+                # let the user see what the data from all the sensors looks like.
+                display_results_from_sensor(
+                    data_from_sensors,
+                    specs,
+                    axis,
+                    cycle,
+                    temp,
+                )
 
-            # write the data to a log file for each serial number tested.
-            log_data_from_sensors(
-                data_from_sensors,
-                unit_id_dict,
-                axis,
-                cycle,
-                temp,
-                "Thermal Calibration",
-            )
+                # write the data to a log file for each serial number tested.
+                pipeline.submit(
+                    log_data_from_sensors,
+                    data_from_sensors,
+                    unit_id_dict,
+                    axis,
+                    cycle,
+                    temp,
+                    "Thermal Calibration",
+                    current_time=current_time,
+                )
 
     except Exception as e:
         exc_type, exc_obj, exc_tb = sys.exc_info()
@@ -267,6 +286,53 @@ def cycle_through_angles(
     return
 
 
+def wait_for_sensors_to_settle(
+    specs: get_specs.mems_specs, port_dict: dict, label: str
+) -> float:
+    """wait until the jdx outputs are stable, at most the part's settle time.
+
+    Args:
+        specs (get_specs.mems_specs): part definition, settle_time is the ceiling
+        port_dict (dict): open serial ports to the sensors keyed by port
+        label (str): what is settling, for the log
+
+    Returns:
+        float: seconds the settle took.
+    """
+    if not stage_configuration.SETTLE_DETECTION:
+        countdown.countdown(specs.settle_time)
+        return specs.settle_time
+
+    def sample() -> list:
+        readings = async_transport.run(read_sensor_outputs(port_dict))
+        return [value for x, y, *_ in readings.values() for value in (x, y)]
+
+    criteria = settle_detector.SettleCriteria(
+        **stage_configuration.SETTLE_CRITERIA["JDX"]
+    )
+    return settle_detector.wait_for_settle(sample, specs.settle_time, criteria, label)
+
+
+async def read_sensor_outputs(port_dict: dict) -> dict:
+    """read every active jdx once, all at the same time.
+
+    Args:
+        port_dict (dict): open serial ports to the sensors keyed by port
+
+    Returns:
+        dict: x, y, z, t per port.
+    """
+    return await async_transport.gather(
+        **{
+            port: async_transport.run_on_port(
+                port_dict[port], digital_coms.get_position_data_from_jdx
+            )
+            for port in port_dict.keys()
+            if port not in deactivated_sensors_list
+        }
+    )
+
+
 def display_results_from_sensor(
     data_from_sensors: dict,
     specs: get_specs.mems_specs,
@@ -329,6 +395,7 @@ def log_data_from_sensors(
     cycle: int,
     temp: int,
     test_name: str,
+    current_time: str | None = None,
 ) -> None:
     """_summary_
 
@@ -339,17 +406,16 @@ def log_data_from_sensors(
         axis (int): _description_
         cycle (int): _description_
         temp (int): _description_
+        current_time (str | None, optional): when the data was read. Defaults to now.
     """
     try:
+        if current_time is None:
+            current_time = datetime.datetime.now().strftime(settings.DATETIME_FORMAT)
 
         for port in data_from_sensors.keys():
             if port not in deactivated_sensors_list:
                 file = filesystem.build_test_data_file(unit_id_dict, port)
 
-                current_time = datetime.datetime.now().strftime(
-                    settings.DATETIME_FORMAT
-                )
-
                 with open(file, "a") as write_file:
                     write_file.write(
                         f'{current_time},{stage_configuration.__STAGE_NAME__},{test_name},{axis},{cycle},{temp},{data_from_sensors[port]["A"]},{data_from_sensors[port]["X"]},{data_from_sensors[port]["Y"]},{data_from_sensors[port]["Z"]},{data_from_sensors[port]["T"]},{data_from_sensors[port]["P"]}\n'
@@ -385,18 +451,19 @@ def get_data_from_sensors(
     try:
         data = {}
 
+        # the jdx ports, the stage and the thermometry are independent instruments,
+        # so the point takes as long as the slowest one instead of the sum of them.
+        readings = async_transport.run(
+            read_instruments_concurrently(port_dict, stage_port)
+        )
+
         for port in port_dict.keys():
             if port not in deactivated_sensors_list:
-                for _ in range(3):
-                    x, y, z, t = digital_coms.get_position_data_from_jdx(
-                        port_dict[port]
-                    )
+                x, y, z, t = readings[port]
 
-                angle = motor_control.get_position_from_stage(
-                    stage_port,
-                )
+                angle = readings["angle"]
 
-                plate_temp, pilar_temp = thermometry.get_system_temperatures()
+                plate_temp, pilar_temp = readings["temps"]
 
             else:
                 print(
@@ -430,6 +497,46 @@ def get_data_from_sensors(
     return data
 
 
+def read_jdx(port: serial_protocols.serial_open) -> tuple[float, float, float, float]:
+    """read a jdx three times and keep the last sample.
+
+    Args:
+        port (serial_protocols.serial_open): open serial port to the jdx
+
+    Returns:
+        tuple[float, float, float, float]: x, y, z, t
+    """
+    for _ in range(3):
+        x, y, z, t = digital_coms.get_position_data_from_jdx(port)
+    return x, y, z, t
+
+
+async def read_instruments_concurrently(
+    port_dict: dict, stage_port: serial_protocols.serial_open
+) -> dict:
+    """read every active jdx, the stage position and the thermometry at once.
+
+    Args:
+        port_dict (dict): open serial ports to the sensors keyed by port
+        stage_port (serial_protocols.serial_open): connection to the rotary stage
+
+    Returns:
+        dict: x, y, z, t per port, plus "angle" and "temps".
+    """
+    sensor_reads = {
+        port: async_transport.run_on_port(port_dict[port], read_jdx)
+        for port in port_dict.keys()
+        if port not in deactivated_sensors_list
+    }
+    return await async_transport.gather(
+        angle=async_transport.run_on_port(
+            stage_port, motor_control.get_position_from_stage
+        ),
+        temps=async_transport.run_blocking(thermometry.get_system_temperatures),
+        **sensor_reads,
+    )
+
+
 def jdx_polarity_verification(
     specs: get_specs.mems_specs, port_dict: dict, instrumentation: dict, axis: int
 ) -> None:
@@ -525,10 +632,12 @@ def configure_jdx(
 
             # uncomment when ready to go to live testing.
 
-            dev = serial_protocols.serial_open(
+            dev = connection_pool.serial_connection(
                 port, 19200, bytesize=8, parity="E", use_visa=False
             )
 
+            instrument_config.apply_pacing_profile(dev, "JDX")
+
             port_dict[key] = dev
 
             print(f"\nConfiguring sensor on {port}")
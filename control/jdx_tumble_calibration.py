@@ -5,8 +5,7 @@ import datetime
 from analytics import analyze_cal_data
 
 from control import jdx_calibration
-
-from instrumentation import motor_control
+from control import motion_route
 
 # from network import commit_calibration_data
 from network import get_specs
@@ -72,7 +71,7 @@ def jdx_tumble_sequence(
         instrumentation (dict): dict of open serial ports to instrumentation
     """
 
-    motor_control.move_stage_to_angle(instrumentation["Stage"], 0)
+    motion_route.move_to(instrumentation["Stage"], 0)
 
     input("Press Enter to start.")
 
@@ -85,52 +84,10 @@ def jdx_tumble_sequence(
         tumble_matrix_minus[key] = []
 
     for axis in range(2):
-        motor_control.move_stage_to_angle(instrumentation["Stage"], 90)
-
-        countdown.countdown(specs.settle_time)
-
-        data_p90 = jdx_calibration.get_data_from_sensors(
-            port_dict, instrumentation["Stage"], instrumentation["DataAq"]
-        )
-
-        for port in port_dict:
-            current_time = datetime.datetime.now().strftime(settings.DATETIME_FORMAT)
-            print(
-                "{} - {} - Angle: {:.5f}, Plate Temp: {}, X: {:.5f}, Y: {:.5f}, Z: {:.5f}, T: {:.5f}".format(
-                    current_time,
-                    port,
-                    data_p90[port]["A"],
-                    data_p90[port]["P"],
-                    data_p90[port]["X"],
-                    data_p90[port]["Y"],
-                    data_p90[port]["Z"],
-                    data_p90[port]["T"],
-                )
-            )
-
-        motor_control.move_stage_to_angle(instrumentation["Stage"], -90)
-
-        countdown.countdown(specs.settle_time)
-
-        data_n90 = jdx_calibration.get_data_from_sensors(
-            port_dict, instrumentation["Stage"], instrumentation["DataAq"]
+        data_p90, data_n90 = collect_tumble_pair(
+            specs, port_dict, instrumentation, 90, -90, end=0.0 if axis < 1 else None
         )
 
-        for port in port_dict:
-            current_time = datetime.datetime.now().strftime(settings.DATETIME_FORMAT)
-            print(
-                "{} - {} - Angle: {:.5f}, Plate Temp: {}, X: {:.5f}, Y: {:.5f}, Z: {:.5f}, T: {:.5f}".format(
-                    current_time,
-                    port,
-                    data_n90[port]["A"],
-                    data_n90[port]["P"],
-                    data_n90[port]["X"],
-                    data_n90[port]["Y"],
-                    data_n90[port]["Z"],
-                    data_n90[port]["T"],
-                )
-            )
-
         for key in port_dict:
             tumble_matrix_plus[key].append(
                 [data_p90[key]["X"], data_p90[key]["Y"], data_p90[key]["Z"]]
@@ -140,59 +97,14 @@ def jdx_tumble_sequence(
             )
 
         if axis < 1:
-            motor_control.move_stage_to_angle(instrumentation["Stage"], 0)
             input(
                 f"Mount each sensor in the {specs.mount[axis]} orientation. Then press enter."
             )
 
-    motor_control.move_stage_to_angle(instrumentation["Stage"], 180)
-
-    countdown.countdown(specs.settle_time)
-
-    data_180 = jdx_calibration.get_data_from_sensors(
-        port_dict, instrumentation["Stage"], instrumentation["DataAq"]
-    )
-
-    for port in port_dict:
-        current_time = datetime.datetime.now().strftime(settings.DATETIME_FORMAT)
-        print(
-            "{} - {} - Angle: {:.5f}, Plate Temp: {}, X: {:.5f}, Y: {:.5f}, Z: {:.5f}, T: {:.5f}".format(
-                current_time,
-                port,
-                data_180[port]["A"],
-                data_180[port]["P"],
-                data_180[port]["X"],
-                data_180[port]["Y"],
-                data_180[port]["Z"],
-                data_180[port]["T"],
-            )
-        )
-
-    motor_control.move_stage_to_angle(instrumentation["Stage"], 0)
-
-    countdown.countdown(specs.settle_time)
-
-    data_0 = jdx_calibration.get_data_from_sensors(
-        port_dict, instrumentation["Stage"], instrumentation["DataAq"]
+    data_0, data_180 = collect_tumble_pair(
+        specs, port_dict, instrumentation, 0, 180, end=0.0
     )
 
-    for port in port_dict:
-        current_time = datetime.datetime.now().strftime(settings.DATETIME_FORMAT)
-        print(
-            "{} - {} - Angle: {:.5f}, Plate Temp: {}, X: {:.5f}, Y: {:.5f}, Z: {:.5f}, T: {:.5f}".format(
-                current_time,
-                port,
-                data_0[port]["A"],
-                data_0[port]["P"],
-                data_0[port]["X"],
-                data_0[port]["Y"],
-                data_0[port]["Z"],
-                data_0[port]["T"],
-            )
-        )
-
-    motor_control.move_stage_to_angle(instrumentation["Stage"], 0)
-
     for key in port_dict:
         tumble_matrix_plus[key].append(
             [data_0[key]["X"], data_0[key]["Y"], data_0[key]["Z"]]
@@ -204,3 +116,59 @@ def jdx_tumble_sequence(
         # print(f"Mount each sensor in the Z orientation - {specs.mount3}")
 
     return tumble_matrix_plus, tumble_matrix_minus
+
+
+def collect_tumble_pair(
+    specs: get_specs.mems_specs,
+    port_dict: dict,
+    instrumentation: dict,
+    angle_1: float,
+    angle_2: float,
+    end: float | None = None,
+) -> tuple[dict, dict]:
+    """take data at two angles, visiting them in the shorter order.
+
+    Args:
+        specs (get_specs.mems_specs): class of specs for unit
+        port_dict (dict): dict of open serial ports to sensors
+        instrumentation (dict): dict of open serial ports to instrumentation
+        angle_1 (float): first angle in degrees
+        angle_2 (float): second angle in degrees
+        end (float | None, optional): angle to park at afterwards. Defaults to None.
+
+    Returns:
+        tuple[dict, dict]: data at angle_1 and at angle_2.
+    """
+    route = motion_route.plan_from_stage(
+        instrumentation["Stage"], [angle_1, angle_2], end=end
+    )
+    motion_route.start_route(instrumentation["Stage"], route)
+
+    data = {}
+    for visit in route.visits:
+        motion_route.move_to(instrumentation["Stage"], visit.angle)
+
+        countdown.countdown(specs.settle_time)
+
+        data[visit.point] = jdx_calibration.get_data_from_sensors(
+            port_dict, instrumentation["Stage"], instrumentation["DataAq"]
+        )
+
+        for port in port_dict:
+            current_time = datetime.datetime.now().strftime(settings.DATETIME_FORMAT)
+            print(
+                "{} - {} - Angle: {:.5f}, Plate Temp: {}, X: {:.5f}, Y: {:.5f}, Z: {:.5f}, T: {:.5f}".format(
+                    current_time,
+                    port,
+                    data[visit.point][port]["A"],
+                    data[visit.point][port]["P"],
+                    data[visit.point][port]["X"],
+                    data[visit.point][port]["Y"],
+                    data[visit.point][port]["Z"],
+                    data[visit.point][port]["T"],
+                )
+            )
+
+    motion_route.finish_route(instrumentation["Stage"], route)
+
+    return data[0], data[1]
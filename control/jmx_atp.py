@@ -22,7 +22,7 @@ def jmx_atp(
     mode = "Current" if specs.output_type == "jmx_current" else "Voltage"
     channels = len(unit_id_dict)
     data_aq_init.config_data_aq_for_voltage(
-        instrumentation["DataAq"], mode=mode, channels=channels
+        instrumentation["DataAq"], mode=mode, channels=channels, specs=specs
     )
 
     jmx_calibration.analog_mems_calibration(
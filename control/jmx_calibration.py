@@ -3,12 +3,18 @@ import sys
 import datetime
 import logging
 import math
+import time
 
 from system import settings
+from system import async_transport
 from system import countdown
+from system import settle_detector
 
 from system import stage_configuration
 
+from control import motion_route
+from control import point_pipeline
+
 from instrumentation import chamber
 from instrumentation import motor_control
 from instrumentation import data_aq_read
@@ -90,7 +96,12 @@ def analog_mems_calibration(
                                 "Testing the linearity/bias/transverse axis misalignment of the sensor."
                             )
                             success_flag = test_linearity(
-                                specs, instrumentation, unit_id_dict, axis, cycle
+                                specs,
+                                instrumentation,
+                                unit_id_dict,
+                                axis,
+                                cycle,
+                                home=not specs.test_bias,
                             )
                         else:
                             print(settings.TERMINAL_SPACER)
@@ -232,7 +243,7 @@ def reset_axis(message: str, instrumentation: dict) -> None:
         message (str): _description_
     """
 
-    _ = motor_control.move_stage_to_angle(instrumentation["Stage"], 0)
+    _ = motion_route.move_to(instrumentation["Stage"], 0)
     print(f"\nReset axis to the {message}")
 
     input("Press enter to continue")
@@ -262,13 +273,25 @@ def get_data_from_sensors(
 ) -> dict:
 
     channels = len(unit_id_dict)
-    data = data_aq_read.read_data_from_data_aq(
-        instrumentation["DataAq"], mode=mode, channels=channels
-    )
-
-    plate_temp, pilar_temp = thermometry.get_system_temperatures()
 
-    position = motor_control.get_position_from_stage(instrumentation["Stage"])
+    # the daq, thermometry and stage are read at the same time.
+    readings = async_transport.run(
+        async_transport.gather(
+            data=async_transport.run_on_port(
+                instrumentation["DataAq"],
+                data_aq_read.read_data_from_data_aq,
+                mode=mode,
+                channels=channels,
+            ),
+            temps=async_transport.run_blocking(thermometry.get_system_temperatures),
+            position=async_transport.run_on_port(
+                instrumentation["Stage"], motor_control.get_position_from_stage
+            ),
+        )
+    )
+    data = readings["data"]
+    plate_temp, pilar_temp = readings["temps"]
+    position = readings["position"]
     if specs.sensor_type == "accelerometer":
         actual_position = math.sin(math.radians(position))
     else:
@@ -293,7 +316,7 @@ def home_stage(instrumentation: dict) -> None:
     """
 
     angle_0: float = 0.0
-    motor_control.move_stage_to_angle(instrumentation["Stage"], angle_0)
+    motion_route.move_to(instrumentation["Stage"], angle_0)
 
 
 def move_to_angle_and_collect_data(
@@ -310,15 +333,63 @@ def move_to_angle_and_collect_data(
         display_angle = angle
     display_units = specs.input_units
     print(f"\nMoving stage to {display_angle:.6f} ({display_units})")
-    motor_control.move_stage_to_angle(instrumentation["Stage"], angle)
+    motion_route.move_to(instrumentation["Stage"], angle)
 
     print(
-        f"Sitting at angle {display_angle:.6f} ({display_units}) for {specs.settle_time} s."
+        f"Sitting at angle {display_angle:.6f} ({display_units}) for up to {specs.settle_time} s."
     )
-    countdown.countdown(specs.settle_time)
+    # the DAQ scans in the background while the sensors settle, the settle check
+    # and the reading both come from those scans.
+    data_aq_read.start_acquisition(instrumentation["DataAq"])
+    try:
+        wait_for_sensors_to_settle(
+            specs, instrumentation, unit_id_dict, f"angle {display_angle:.6f}"
+        )
+
+        print("Collecting data")
+        return get_data_from_sensors(unit_id_dict, specs, instrumentation, angle=angle)
+    finally:
+        data_aq_read.stop_acquisition(instrumentation["DataAq"])
+
+
+def wait_for_sensors_to_settle(
+    specs: get_specs.mems_specs, instrumentation: dict, unit_id_dict: dict, label: str
+) -> float:
+    """wait until the sensor outputs are stable, at most the part's settle time.
 
-    print("Collecting data")
-    return get_data_from_sensors(unit_id_dict, specs, instrumentation, angle=angle)
+    Args:
+        specs (get_specs.mems_specs): part definition, settle_time is the ceiling
+        instrumentation (dict): active instrumentation connections
+        unit_id_dict (dict): sensors under test keyed by port
+        label (str): what is settling, for the log
+
+    Returns:
+        float: seconds the settle took.
+    """
+    if not stage_configuration.SETTLE_DETECTION:
+        countdown.countdown(specs.settle_time)
+        return specs.settle_time
+
+    channels = len(unit_id_dict)
+    data_aq = instrumentation["DataAq"]
+    since = time.time()
+
+    def sample() -> list:
+        nonlocal since
+        if data_aq_read.get_acquisition(data_aq) is None:
+            data = data_aq_read.read_data_from_data_aq(data_aq, "Voltage", channels)
+        else:
+            # average of the background scans since the last sample.
+            data = data_aq_read.read_window_from_data_aq(
+                data_aq, "Voltage", channels, since
+            )
+            since = time.time()
+        return [value for port in unit_id_dict for value in data[port][:2]]
+
+    criteria = settle_detector.SettleCriteria(
+        **stage_configuration.SETTLE_CRITERIA["JMX"]
+    )
+    return settle_detector.wait_for_settle(sample, specs.settle_time, criteria, label)
 
 
 def test_static_metrics(
@@ -351,37 +422,36 @@ def test_static_metrics(
         angle_1: float = max(specs.cal_points_array)
         angle_2: float = min(specs.cal_points_array)
 
-    data_from_sensors_1: dict = move_to_angle_and_collect_data(
-        specs, instrumentation, unit_id_dict, angle_1
-    )
-
-    log_calibration_data(
-        unit_id_dict,
-        data_from_sensors_1,
-        axis,
-        0,
-        0,
-        test,
-        specs.input_units,
-        specs.output_units,
+    route = motion_route.plan_from_stage(
+        instrumentation["Stage"], [(angle_1, test), (angle_2, test)], end=0.0
     )
+    motion_route.start_route(instrumentation["Stage"], route)
+
+    # the readers of the data file take the first row as angle_1, so rows are
+    # logged in plan order whatever order the stage visits the angles in.
+    plan_order = motion_route.PlanOrder(route)
+    readings = []
+    for visit in route.visits:
+        data_from_sensors: dict = move_to_angle_and_collect_data(
+            specs, instrumentation, unit_id_dict, visit.angle
+        )
 
-    data_from_sensors_2: dict = move_to_angle_and_collect_data(
-        specs, instrumentation, unit_id_dict, angle_2
-    )
+        for test_type, data in plan_order.add(visit, data_from_sensors):
+            log_calibration_data(
+                unit_id_dict,
+                data,
+                axis,
+                0,
+                0,
+                test_type,
+                specs.input_units,
+                specs.output_units,
+            )
+            readings.append(data)
 
-    log_calibration_data(
-        unit_id_dict,
-        data_from_sensors_2,
-        axis,
-        0,
-        0,
-        test,
-        specs.input_units,
-        specs.output_units,
-    )
+    motion_route.finish_route(instrumentation["Stage"], route)
 
-    home_stage(instrumentation)
+    data_from_sensors_1, data_from_sensors_2 = readings
 
     return data_from_sensors_1, data_from_sensors_2
 
@@ -460,10 +530,17 @@ def test_transverse_axis_misalignment(
 
 
 def test_linearity(
-    specs: get_specs.mems_specs, instrumentation: dict, unit_id_dict: dict, axis: int, cycle: int
+    specs: get_specs.mems_specs,
+    instrumentation: dict,
+    unit_id_dict: dict,
+    axis: int,
+    cycle: int,
+    home: bool = True,
 ) -> bool:
     """This will test the linearity of each sensor over a prescribed range and number
-    of points.
+    of points. the pendulous and zero tilt angles are measured in the same sweep.
+
+    home is False when the next test moves the stage anyway.
 
     Returns:
         boolean: pass/fail
@@ -473,96 +550,70 @@ def test_linearity(
     input_current_tested = False
 
     if specs.output_type == "analog voltage":
-
-        data_from_sensors_pend_ccw: dict = move_to_angle_and_collect_data(
-            specs, instrumentation, unit_id_dict, -90
-        )
-
-        log_calibration_data(
-            unit_id_dict,
-            data_from_sensors_pend_ccw,
-            axis,
-            cycle,
-            temp,
-            "Y-Transverse Axis Misalignment",
-            specs.input_units,
-            specs.output_units,
-        )
-
-    for point in specs.cal_points_array:
-        if specs.test_input_current:
-            print("Checking input current for all sensors.")
-            if (
-                abs(point) == max(specs.cal_points_array)
-                and input_current_tested is False
-            ):
-                test_input_current(specs, instrumentation, unit_id_dict)
-                input_current_tested = True
-
-        if specs.output_type == "analog voltage":
-            data_from_sensors: dict = move_to_angle_and_collect_data(
-                specs, instrumentation, unit_id_dict, point
-            )
-
-            log_calibration_data(
-                unit_id_dict,
-                data_from_sensors,
-                axis,
-                cycle,
-                temp,
-                "Linearity",
-                specs.input_units,
-                specs.output_units,
-            )
-
-    if specs.output_type == "analog voltage":
-
-        data_from_sensors_pend_cw: dict = move_to_angle_and_collect_data(
-            specs, instrumentation, unit_id_dict, 90
-        )
-
-        log_calibration_data(
-            unit_id_dict,
-            data_from_sensors_pend_cw,
-            axis,
-            cycle,
-            temp,
-            "Y-Transverse Axis Misalignment",
-            specs.input_units,
-            specs.output_units,
-        )
-
-        data_from_sensors_180: dict = move_to_angle_and_collect_data(
-            specs, instrumentation, unit_id_dict, 180
+        points = [(-90, "Y-Transverse Axis Misalignment")]
+        points += [(point, "Linearity") for point in specs.cal_points_array]
+        points += [
+            (90, "Y-Transverse Axis Misalignment"),
+            (180, "Z-Transverse Axis Misalignment"),
+            (0, "Z-Transverse Axis Misalignment"),
+        ]
+        route = motion_route.plan_from_stage(
+            instrumentation["Stage"], points, end=0.0 if home else None
         )
+        motion_route.start_route(instrumentation["Stage"], route)
+
+        # rows are written while the stage moves to the next angle, the pipeline
+        # is drained before the fit reads them back. the readers of the
+        # data file tell the transverse readings apart by row order, so rows are
+        # logged in plan order, not in the order the stage visits the angles.
+        plan_order = motion_route.PlanOrder(route)
+        with point_pipeline.PointPipeline() as pipeline:
+            for visit in route.visits:
+                if (
+                    specs.test_input_current
+                    and abs(visit.angle) == max(specs.cal_points_array)
+                    and input_current_tested is False
+                ):
+                    pipeline.drain()
+                    print("Checking input current for all sensors.")
+                    test_input_current(specs, instrumentation, unit_id_dict)
+                    input_current_tested = True
 
-        log_calibration_data(
-            unit_id_dict,
-            data_from_sensors_180,
-            axis,
-            cycle,
-            temp,
-            "Z-Transverse Axis Misalignment",
-            specs.input_units,
-            specs.output_units,
-        )
+                data_from_sensors: dict = move_to_angle_and_collect_data(
+                    specs, instrumentation, unit_id_dict, visit.angle
+                )
+                current_time = datetime.datetime.now().strftime(
+                    settings.DATETIME_FORMAT
+                )
+                for port in data_from_sensors:
+                    print_data_to_terminal(
+                        data_from_sensors, port, specs.input_units, specs.output_units
+                    )
 
-        data_from_sensors_0: dict = move_to_angle_and_collect_data(
-            specs, instrumentation, unit_id_dict, 0
-        )
+                for test_type, (data, read_time) in plan_order.add(
+                    visit, (data_from_sensors, current_time)
+                ):
+                    pipeline.submit(
+                        log_calibration_data,
+                        unit_id_dict,
+                        data,
+                        axis,
+                        cycle,
+                        temp,
+                        test_type,
+                        specs.input_units,
+                        specs.output_units,
+                        current_time=read_time,
+                        display=False,
+                    )
 
-        log_calibration_data(
-            unit_id_dict,
-            data_from_sensors_0,
-            axis,
-            cycle,
-            temp,
-            "Z-Transverse Axis Misalignment",
-            specs.input_units,
-            specs.output_units,
-        )
+            motion_route.finish_route(instrumentation["Stage"], route)
 
-    home_stage(instrumentation)
+    elif specs.test_input_current and any(
+        abs(point) == max(specs.cal_points_array) for point in specs.cal_points_array
+    ):
+        print("Checking input current for all sensors.")
+        test_input_current(specs, instrumentation, unit_id_dict)
 
     axis_flag = stage_configuration.AXES_DECODER[str(axis)]
 
@@ -636,6 +687,8 @@ def log_calibration_data(
     test_type: str = "",
     input_units: str = "g",
     output_units: str = "VDC",
+    current_time: str | None = None,
+    display: bool = True,
 ) -> None:
     """log data from all units into csv file.
 
@@ -646,15 +699,19 @@ def log_calibration_data(
         cycle_index (int): _description_
         temp_index (int): _description_
         test_type (str, optional): _description_. Defaults to "".
+        current_time (str | None, optional): when the data was read. Defaults to now.
+        display (bool, optional): print the data too, False when the caller
+            already did. Defaults to True.
     """
     try:
+        if current_time is None:
+            current_time = datetime.datetime.now().strftime(settings.DATETIME_FORMAT)
 
         for port in data_dict:
             file = filesystem.build_test_data_file(unit_id_dict, port)
 
-            current_time = datetime.datetime.now().strftime(settings.DATETIME_FORMAT)
-
-            print_data_to_terminal(data_dict, port, input_units, output_units)
+            if display:
+                print_data_to_terminal(data_dict, port, input_units, output_units)
 
             with open(file, "a") as write_file:
                 write_file.write(
@@ -713,7 +770,7 @@ def test_noise(
 
         # reconfigure DAQ for VDC
         data_aq_init.config_data_aq_for_voltage(
-            instrumentation["DataAq"], mode, channels, False, "DC"
+            instrumentation["DataAq"], mode, channels, False, "DC", specs
         )
 
         log_calibration_data(
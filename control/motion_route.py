@@ -0,0 +1,274 @@
+import logging
+import math
+import sys
+import weakref
+from dataclasses import dataclass
+
+from instrumentation import motor_control
+
+from system import stage_configuration
+
+
+# stage route planning. a test plan lists the angles it needs, the planner visits
+# them in one sweep so every point is approached from the same side and the total
+# travel is as short as possible. moves to where the stage already is are dropped,
+# every planned point still gets its own reading. the route only decides the
+# motion, readings are handed back in plan order (see PlanOrder) because the data
+# files are read back by row order.
+
+
+@dataclass
+class Visit:
+    angle: float
+    label: str = ""  # test the reading is logged for
+    point: int = 0  # index of the point in the test plan
+
+
+@dataclass
+class Route:
+    visits: list  # Visit, in the order they are measured
+    lead_in: float | None = None  # angle to pass through before the first visit
+    end: float | None = None  # angle the stage is parked at afterwards
+    travel: float = 0.0  # degrees
+
+
+def plan_visits(points) -> list:
+    """one visit per point of a test plan.
+
+    Args:
+        points (Iterable[float | tuple[float, str]]): angles, or (angle, test) pairs
+
+    Returns:
+        list[Visit]: visits in plan order.
+    """
+    visits = []
+    for index, point in enumerate(points):
+        angle, label = point if isinstance(point, tuple) else (point, "")
+        visits.append(Visit(angle, label, index))
+    return visits
+
+
+class PlanOrder:
+    """hand back readings taken along a route in the order the test plan listed
+    its points. a reading is released once every point before it has one."""
+
+    def __init__(self, route: Route) -> None:
+        self.labels = {visit.point: visit.label for visit in route.visits}
+        self.readings = {}
+        self.next = 0
+
+    def add(self, visit: Visit, reading) -> list:
+        """file the reading of a visit under its plan point.
+
+        Args:
+            visit (Visit): visit the reading was taken at
+            reading (object): data to hand back
+
+        Returns:
+            list[tuple[str, object]]: (test, reading) pairs now due, in plan order.
+        """
+        self.readings[visit.point] = reading
+        due = []
+        while self.next in self.readings:
+            due.append((self.labels[self.next], self.readings.pop(self.next)))
+            self.next += 1
+        return due
+
+
+def sweep_travel(
+    angles: list, start: float, end: float | None, direction: int, offset: float
+) -> tuple[float, float | None]:
+    """travel of a sweep through sorted angles, approaching each in one direction.
+
+    Args:
+        angles (list): angles in sweep order
+        start (float): where the stage is
+        end (float | None): where it is parked afterwards, None to stay
+        direction (int): 1 to approach every angle from below, -1 from above
+        offset (float): overshoot of the lead-in move in degrees
+
+    Returns:
+        tuple[float, float | None]: travel in degrees and the lead-in angle.
+    """
+    first, last = angles[0], angles[-1]
+    lead_in = None
+    if (first - start) * direction < 0:
+        # the first angle is behind the stage, pass it and come back.
+        lead_in = first - direction * offset
+        travel = abs(start - lead_in) + offset
+    else:
+        travel = abs(first - start)
+    travel += abs(last - first)
+    if end is not None:
+        travel += abs(end - last)
+    return travel, lead_in
+
+
+def plan_route(
+    points,
+    start: float = 0.0,
+    end: float | None = None,
+    direction: int | None = None,
+    offset: float | None = None,
+) -> Route:
+    """order the angles of a test plan for the least stage travel.
+
+    Args:
+        points (Iterable[float | tuple[float, str]]): angles, or (angle, test) pairs
+        start (float, optional): where the stage is. Defaults to 0.0.
+        end (float | None, optional): where the stage is parked afterwards, None
+            if the next target is not known yet. Defaults to None.
+        direction (int | None, optional): 1 to approach from below, -1 from above,
+            0 for either. Defaults to STAGE_APPROACH_DIRECTION.
+        offset (float | None, optional): lead-in overshoot in degrees. Defaults to
+            STAGE_APPROACH_OFFSET.
+
+    Returns:
+        Route: visits in measurement order.
+    """
+    direction = (
+        stage_configuration.STAGE_APPROACH_DIRECTION if direction is None else direction
+    )
+    offset = stage_configuration.STAGE_APPROACH_OFFSET if offset is None else offset
+
+    visits = plan_visits(points)
+    if not visits:
+        return Route([], end=end, travel=abs(end - start) if end is not None else 0.0)
+
+    best = None
+    for sweep in (1, -1):
+        if direction and sweep != direction:
+            continue
+        # sorted is stable, so points at the same angle keep their plan order and
+        # are read one after the other without a move in between.
+        ordered = sorted(visits, key=lambda visit: sweep * visit.angle)
+        travel, lead_in = sweep_travel(
+            [visit.angle for visit in ordered], start, end, sweep, offset
+        )
+        if best is None or travel < best.travel:
+            best = Route(ordered, lead_in, end, travel)
+
+    logging.info(
+        f"Stage route: {[visit.angle for visit in best.visits]} (deg), "
+        f"{best.travel:.1f} (deg) of travel"
+    )
+    return best
+
+
+_targets = weakref.WeakKeyDictionary()
+
+
+def _last_target(port: object) -> float | None:
+    try:
+        return _targets.get(port)
+    except TypeError:
+        return None
+
+
+def _set_last_target(port: object, angle: float | None) -> None:
+    try:
+        if angle is None:
+            _targets.pop(port, None)
+        else:
+            _targets[port] = angle
+    except TypeError:
+        pass
+
+
+def stage_position(port: object) -> float:
+    """where the stage is, in the same frame angles are commanded in.
+
+    Args:
+        port (object): stage connection
+
+    Returns:
+        float: angle in degrees.
+    """
+    angle = motor_control.get_position_from_stage(port)
+    if angle is None or math.isnan(angle):
+        return math.nan
+    if stage_configuration.REVERSE_POLARITY is True:
+        angle = -angle
+    return angle
+
+
+def move_to(port: object, angle: float) -> float:
+    """move the stage unless it is already at the angle.
+
+    the last commanded angle per connection is remembered, the position is read
+    back before a move is dropped. a failed move is logged and raised again, so
+    no reading is taken at the wrong angle.
+
+    Args:
+        port (object): stage connection
+        angle (float): angle in degrees
+
+    Returns:
+        float: angle the stage is at in degrees.
+    """
+    last = _last_target(port)
+    if last is not None and abs(last - angle) < stage_configuration.STAGE_ACCURACY:
+        current = stage_position(port)
+        if abs(current - angle) < stage_configuration.STAGE_ACCURACY:
+            logging.info(f"Stage already at {angle} (deg), move dropped")
+            return current
+
+    _set_last_target(port, None)
+    try:
+        current = motor_control.move_stage_to_angle(port, angle)
+        if stage_configuration.REVERSE_POLARITY is True and current is not None:
+            current = -current
+        if current is not None and (
+            abs(current - angle) < stage_configuration.STAGE_ACCURACY
+        ):
+            _set_last_target(port, angle)
+    except Exception as e:
+        *_, exc_tb = sys.exc_info()
+        logging.warning(f"\t{e} -> Line {exc_tb.tb_lineno}")
+        raise
+    return current
+
+
+def start_route(port: object, route: Route) -> None:
+    """make the lead-in move of a route, if it has one.
+
+    Args:
+        port (object): stage connection
+        route (Route): planned route
+    """
+    if route.lead_in is not None:
+        move_to(port, route.lead_in)
+
+
+def finish_route(port: object, route: Route) -> None:
+    """park the stage where the route ends, if it has an end.
+
+    Args:
+        port (object): stage connection
+        route (Route): planned route
+    """
+    if route.end is not None:
+        move_to(port, route.end)
+
+
+def plan_from_stage(
+    port: object, points, end: float | None = None, direction: int | None = None
+) -> Route:
+    """plan_route starting from where the stage is.
+
+    Args:
+        port (object): stage connection
+        points (Iterable[float | tuple[float, str]]): angles, or (angle, test) pairs
+        end (float | None, optional): park angle afterwards. Defaults to None.
+        direction (int | None, optional): approach direction. Defaults to
+            STAGE_APPROACH_DIRECTION.
+
+    Returns:
+        Route: visits in measurement order.
+    """
+    start = _last_target(port)
+    if start is None:
+        start = stage_position(port)
+        if math.isnan(start):
+            start = 0.0
+    return plan_route(points, start, end, direction)
@@ -0,0 +1,96 @@
+import logging
+import queue
+import sys
+import threading
+
+from system import stage_configuration
+
+
+# pipelined point execution. the caller's thread does move, settle and read, the
+# work that only needs the readings (csv rows) is handed to one worker thread, so it
+# runs while the stage travels to the next point. work items run in the order they
+# were submitted. terminal output stays on the caller's thread so it does not
+# interleave with the move and settle lines.
+#
+# there is no per point analysis to overlap. the linearity fit in
+# jmx_calibration.test_linearity reads every Linearity row of the part's data file
+# back, rows of earlier runs included, so it still runs once after the pipeline is
+# drained. cycle_through_angles does no analysis.
+
+
+class PointPipeline:
+    """ordered background worker for the per point output of a calibration loop.
+
+    use as a context manager, leaving the block waits for everything submitted.
+    """
+
+    def __init__(self, depth: int | None = None, name: str = "point-pipeline") -> None:
+        """
+        Args:
+            depth (int | None, optional): work items queued before submit blocks,
+                0 runs them on the caller's thread. Defaults to POINT_PIPELINE_DEPTH.
+            name (str, optional): worker thread name.
+        """
+        self.depth = (
+            stage_configuration.POINT_PIPELINE_DEPTH if depth is None else depth
+        )
+        self.name = name
+        self.errors = 0
+        self._queue = queue.Queue(maxsize=self.depth) if self.depth > 0 else None
+        self._thread = None
+
+    def start(self) -> "PointPipeline":
+        if self._queue is not None and self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name=self.name, daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def submit(self, function, *args, **kwargs) -> None:
+        """queue function(*args, **kwargs) behind the work already submitted.
+
+        blocks while the queue is full, so the worker never falls more than depth
+        items behind the stage.
+        """
+        if self._thread is None:
+            self._call(function, args, kwargs)
+        else:
+            self._queue.put((function, args, kwargs))
+
+    def drain(self) -> None:
+        """wait until everything submitted so far has run."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """run what is queued and stop the worker."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> "PointPipeline":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _call(self, function, args, kwargs) -> None:
+        try:
+            function(*args, **kwargs)
+        except Exception as e:
+            self.errors += 1
+            *_, exc_tb = sys.exc_info()
+            logging.warning(f"\t{e} -> Line {exc_tb.tb_lineno}")
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._call(*item)
+            finally:
+                self._queue.task_done()
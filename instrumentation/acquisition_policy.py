@@ -0,0 +1,183 @@
+import logging
+import math
+from dataclasses import dataclass
+
+from system import stage_configuration
+
+
+# integration time policy for the DAQ. each channel group gets the shortest
+# integration (NPLC) and averaging count that brings the reading noise under what
+# the part's resolution and linearity specs need. the noise is measured once at
+# DAQ_DEFAULT_NPLC and scaled as white noise, 1 / sqrt(NPLC * count). a full scan
+# of every channel is kept within DAQ_MAX_SCAN_TIME.
+
+
+@dataclass
+class GroupSetting:
+    channels: list
+    nplc: float
+    count: int  # readings averaged by the meter's filter, 1 for no filter
+    target: float  # required noise, V
+    expected: float  # predicted noise, V
+
+    def reading_time(self) -> float:
+        return self.count * (
+            self.nplc / stage_configuration.DAQ_LINE_FREQUENCY
+            + stage_configuration.DAQ_READING_OVERHEAD
+        )
+
+    def commands(self) -> list:
+        """per channel SCPI setup of the group."""
+        channels = f"(@{','.join(self.channels)})"
+        commands = [f":SENS:VOLT:DC:NPLC {self.nplc}, {channels}"]
+        if self.count > 1:
+            commands += [
+                f":SENS:VOLT:DC:AVER:TCON REP, {channels}",
+                f":SENS:VOLT:DC:AVER:COUN {self.count}, {channels}",
+                f":SENS:VOLT:DC:AVER:STAT ON, {channels}",
+            ]
+        else:
+            commands.append(f":SENS:VOLT:DC:AVER:STAT OFF, {channels}")
+        return commands
+
+
+def _smallest(values) -> float | None:
+    # spec fields are per axis lists or a single number, zero means not specified.
+    if not isinstance(values, (list, tuple)):
+        values = [values]
+    found = [abs(float(value)) for value in values if value]
+    return min(found) if found else None
+
+
+def output_noise_target(specs) -> float | None:
+    """reading noise the outputs need to meet the part's specs, in V.
+
+    Args:
+        specs (get_specs.mems_specs): product definition
+
+    Returns:
+        float | None: noise target, None if the specs give nothing to go by.
+    """
+    scale_factor = _smallest(specs.scale_factor)
+    if scale_factor is None:
+        return None
+    limits = []
+    resolution = _smallest(specs.resolution)
+    if resolution is not None:
+        limits.append(resolution * scale_factor)
+    linearity = _smallest(specs.linearity)
+    full_range = _smallest(specs.range)
+    if linearity is not None and full_range is not None:
+        # linearity is in % of the full range output.
+        limits.append(linearity / 100 * 2 * full_range * scale_factor)
+    if not limits:
+        return None
+    return stage_configuration.DAQ_NOISE_FRACTION * min(limits)
+
+
+def choose_setting(
+    channels: list, noise: float, target: float, max_reading_time: float | None = None
+) -> GroupSetting:
+    """fastest NPLC and count that bring the noise under the target.
+
+    Args:
+        channels (list): channels of the group
+        noise (float): noise measured at DAQ_DEFAULT_NPLC, V
+        target (float): required noise, V
+        max_reading_time (float | None, optional): seconds one channel reading
+            may take. Defaults to None (DAQ_MAX_READING_TIME).
+
+    Returns:
+        GroupSetting: the setting. if nothing within max_reading_time meets the
+            target, the quietest setting that fits.
+    """
+    if max_reading_time is None:
+        max_reading_time = stage_configuration.DAQ_MAX_READING_TIME
+    best = None
+    quietest = None
+    for nplc in stage_configuration.DAQ_NPLC_STEPS:
+        expected = noise * math.sqrt(stage_configuration.DAQ_DEFAULT_NPLC / nplc)
+        count = max(1, math.ceil((expected / target) ** 2)) if target else 1
+        meets = count <= stage_configuration.DAQ_MAX_SAMPLES
+        count = min(count, stage_configuration.DAQ_MAX_SAMPLES)
+        setting = GroupSetting(
+            channels, nplc, count, target, expected / math.sqrt(count)
+        )
+        if setting.reading_time() > max_reading_time:
+            continue
+        if meets and (best is None or setting.reading_time() < best.reading_time()):
+            best = setting
+        if quietest is None or setting.expected < quietest.expected:
+            quietest = setting
+
+    if best is not None:
+        return best
+    if quietest is None:
+        return GroupSetting(channels, stage_configuration.DAQ_DEFAULT_NPLC, 1, target, noise)
+    logging.warning(
+        f"DAQ noise {quietest.expected:.2e} V is over the {target:.2e} V target "
+        f"on {','.join(channels)}"
+    )
+    return quietest
+
+
+def channel_groups(scan_list: list) -> dict:
+    """split a scan into sensor outputs (x, y) and temperature outputs (t).
+
+    Args:
+        scan_list (list): channels in the scan
+
+    Returns:
+        dict: "outputs" and "temperature" -> channels, empty groups left out.
+    """
+    temperature = {
+        chans[2] for chans in stage_configuration.DIFF_PORT_CONFIG.values()
+    }
+    groups = {
+        "outputs": [chan for chan in scan_list if chan not in temperature],
+        "temperature": [chan for chan in scan_list if chan in temperature],
+    }
+    return {name: chans for name, chans in groups.items() if chans}
+
+
+def build_policy(specs, statistics) -> list:
+    """settings for every channel group from a noise measurement.
+
+    Args:
+        specs (get_specs.mems_specs): product definition
+        statistics (data_aq_read.ScanStatistics): buffered scans taken at
+            DAQ_DEFAULT_NPLC with the filter off
+
+    Returns:
+        list: a GroupSetting per channel group, empty if the outputs have no target.
+    """
+    output_target = output_noise_target(specs)
+    if output_target is None:
+        return []
+    targets = {
+        "outputs": output_target,
+        "temperature": stage_configuration.DAQ_TEMP_NOISE_TARGET,
+    }
+    index = statistics.key()
+    # split the scan time evenly so the whole scan fits in DAQ_MAX_SCAN_TIME.
+    max_reading_time = min(
+        stage_configuration.DAQ_MAX_READING_TIME,
+        stage_configuration.DAQ_MAX_SCAN_TIME / len(statistics.channels),
+    )
+    settings = []
+    for name, channels in channel_groups(statistics.channels).items():
+        noise = max(statistics.std[index[chan]] for chan in channels)
+        setting = choose_setting(channels, noise, targets[name], max_reading_time)
+        logging.info(
+            f"DAQ {name}: NPLC {setting.nplc} x {setting.count}, noise "
+            f"{noise:.2e} -> {setting.expected:.2e} V (target {setting.target:.2e} V)"
+        )
+        settings.append(setting)
+    return settings
+
+
+def scan_time(settings: list) -> float:
+    """seconds one scan of every channel takes with these settings."""
+    return math.fsum(
+        setting.reading_time() * len(setting.channels) for setting in settings
+    )
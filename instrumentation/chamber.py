@@ -2,11 +2,14 @@ import random
 import time
 import logging
 
+from system import async_transport
 from system import countdown
 from system import serial_protocols
 from system import settings
+from system import stage_configuration
 
 from instrumentation import data_aq_read
+from instrumentation import thermometry
 
 
 def ramp_to_temp(
@@ -77,7 +80,33 @@ def soak_at_temp(
         print("We are out of temp tol")
         set_chamber_set_point(chamber_port, temp)
 
-    countdown.countdown(soak_time * 60)
+    # with the thermal monitor running the soak ends as soon as the plate has
+    # settled for SOAK_STABLE_HOLD, the soak time is the timeout.
+    stable_since = None
+
+    def settled() -> bool:
+        nonlocal stable_since
+        state = thermometry.get_thermal_state()
+        if state is None or not state.stable(temp, temp_tol):
+            stable_since = None
+            return False
+        if stable_since is None:
+            stable_since = state.timestamp
+        return state.timestamp - stable_since >= stage_configuration.SOAK_STABLE_HOLD
+
+    countdown.countdown(soak_time * 60, until=settled)
+
+    state = thermometry.get_thermal_state()
+    if state is not None:
+        logging.info(
+            f"Soak at {temp} C done. plate {state.plate:.2f} C, pilar {state.pilar:.2f} C, "
+            f"gradient {state.gradient:.2f} C, dT/dt {state.plate_rate:.3f} C/min"
+        )
+        if not state.stable(temp, temp_tol):
+            print(
+                f"Plate is not settled at {temp} C: {state.plate:.2f} C, "
+                f"dT/dt {state.plate_rate:.3f} C/min"
+            )
 
     return
 
@@ -162,6 +191,28 @@ def read_chamber_identification(chamber_port: serial_protocols.socket_open) -> s
     return data
 
 
+# awaitable chamber calls, run on the instrument i/o pool so they overlap the other
+# instruments (see async_transport). calls on the chamber socket stay in order.
+
+
+async def set_chamber_set_point_async(
+    chamber_port: serial_protocols.socket_open, set_point: float
+) -> None:
+    await async_transport.run_on_port(chamber_port, set_chamber_set_point, set_point)
+
+
+async def read_chamber_set_point_async(
+    chamber_port: serial_protocols.socket_open,
+) -> float:
+    return await async_transport.run_on_port(chamber_port, read_chamber_set_point)
+
+
+async def read_chamber_air_temp_async(
+    chamber_port: serial_protocols.socket_open,
+) -> float:
+    return await async_transport.run_on_port(chamber_port, read_chamber_air_temp)
+
+
 #############################################################
 """
 Old protocols used for the TUJR chambers.
@@ -1,10 +1,132 @@
 import logging
+import re
+import weakref
 
 from system import stage_configuration
 import system.serial_protocols as serial_protocols
 
+from instrumentation import acquisition_policy
+from instrumentation import data_aq_read
+
 from network import validate_asset_calibration
 
+# settings last applied to each DAQ. the meter is only reset (*RST) at the start
+# of a session, later configurations send just the settings that changed.
+
+# commands that act rather than set something, sent every time they are asked for.
+ACTION_COMMANDS = {"*CLS", "SYST:CLE", "ROUT:OPEN:ALL", "TRAC:CLE"}
+
+
+def setting_key(command: str) -> str:
+    """setting a command changes, its header plus the channel list it applies to.
+
+    FUNC 'VOLT', (@101:106) -> FUNC (@101:106), :ROUT:SCAN (@101:106) -> ROUT:SCAN
+
+    Args:
+        command (str): SCPI command
+
+    Returns:
+        str: setting key.
+    """
+    header, _, argument = command.strip().lstrip(":").partition(" ")
+    channels = re.search(r",\s*(\(@[^)]*\))", argument)
+    return f"{header.upper()} {channels.group(1)}" if channels else header.upper()
+
+
+class DaqState:
+    """settings applied to a DAQ in this session, by setting key."""
+
+    def __init__(self) -> None:
+        self.settings = {}
+        self.policies = {}  # (part no, scan list) -> integration settings
+
+    def delta(self, commands: list) -> list:
+        """commands that change something. actions are kept along with them,
+        but nothing is left if no setting changed.
+
+        Args:
+            commands (list): full configuration
+
+        Returns:
+            list: commands still to send, in order.
+        """
+        changed = []
+        settings = False
+        for command in commands:
+            key = setting_key(command)
+            if key == "*RST":
+                continue
+            if key in ACTION_COMMANDS:
+                changed.append(command)
+            elif self.settings.get(key) != command:
+                changed.append(command)
+                settings = True
+        return changed if settings else []
+
+    def update(self, commands: list) -> None:
+        for command in commands:
+            key = setting_key(command)
+            if key in ACTION_COMMANDS:
+                continue
+            header, _, channels = key.partition(" ")
+            if channels:
+                # channel lists can overlap. a new function drops every channel
+                # setting, anything else drops the same setting on other lists.
+                function = header == "FUNC" and self.settings.get(key) != command
+                for stale in [
+                    k
+                    for k in self.settings
+                    if " " in k and (function or k.partition(" ")[0] == header)
+                ]:
+                    del self.settings[stale]
+            self.settings[key] = command
+
+
+_daq_states = weakref.WeakKeyDictionary()
+
+
+def reset_daq_state(port: serial_protocols.serial_open) -> None:
+    """forget what was applied, the next configuration starts a new session.
+
+    called when the instruments are set up and closed, since the pooled handle
+    outlives a run and the meter may have been changed from its front panel.
+    """
+    _daq_states.pop(port, None)
+    data_aq_read.drop_scan_layout(port)
+
+
+def apply_configuration(port: serial_protocols.serial_open, commands: list) -> bool:
+    """send the part of a configuration that is not applied yet.
+
+    *RST in the commands is only sent at the start of a session. a batch that
+    reports errors leaves the state unknown and starts a new session next time.
+
+    Args:
+        port (serial_protocols.serial_open): connection to the DAQ
+        commands (list): full configuration
+
+    Returns:
+        bool: True if anything was sent.
+    """
+    state = _daq_states.get(port)
+    if state is None:
+        state = _daq_states[port] = DaqState()
+        reset = ["*RST"] if "*RST" in commands else []
+        changed = reset + state.delta(commands)
+    else:
+        changed = state.delta(commands)
+    if not changed:
+        logging.debug("DAQ already configured")
+        return False
+
+    errors = serial_protocols.serial_write_batch(port, changed)
+    if errors:
+        reset_daq_state(port)
+    else:
+        state.update(changed)
+    return True
+
+
 # ask the Data Aq system for its IDN string. use the make, model, serial number
 # to search in the calibration database for the asset number and calibration date.
 # returns 1 if meter is calibration. returns 0 if not.
@@ -69,61 +191,48 @@ def config_data_aq_for_temp(
         if stage_configuration.DAQ_IDN == "HEWLETT-PACKARD":
             pass
         elif stage_configuration.DAQ_IDN == "KEITHLEY":
+            # the temperature function and scan replace the voltage scan
+            data_aq_read.drop_scan_layout(port)
+            commands = []
             if full_setup:
-                serial_protocols.serial_write(port, "*RST\r")  # reset the dev
-                serial_protocols.serial_write(
-                    port, "SYST:BEEP 0\r"
-                )  # clear the error queue
-                # decrease integration speed
-                serial_protocols.serial_write(port, ":SENS:VOLT:DC:NPLC 0.05\r")
-                serial_protocols.serial_write(
-                    port, "SYST:CLE\r"
-                )  # clear the error queue
-                serial_protocols.serial_write(port, ":FORM:ELEM READ,CHAN\r")
-                serial_protocols.serial_write(
-                    port, ":ROUT:OPEN:ALL\r"
-                )  # open all Routes
-                # set continuous trigger to off
-                serial_protocols.serial_write(port, "INIT:CONT OFF\r")
-                serial_protocols.serial_write(port, "TRIG:SOUR IMM\r")  # set the source
-
-            serial_protocols.serial_write(
-                port, f"FUNC 'TEMP', (@{stage_configuration.TEMP_CHAN})\r"
-            )
-            serial_protocols.serial_write(
-                port, f"UNIT:TEMP {stage_configuration.TEMP_UNITS}\r"
-            )
-            serial_protocols.serial_write(
-                port, "TEMP:TC:ODET ON\r"
-            )  # set the temp probe type
+                commands += [
+                    "*RST",  # reset the dev
+                    "SYST:BEEP 0",  # turn off the beeper
+                    ":SENS:VOLT:DC:NPLC 0.05",  # decrease integration speed
+                    "SYST:CLE",  # clear the error queue
+                    ":FORM:ELEM READ,CHAN",
+                    ":ROUT:OPEN:ALL",  # open all Routes
+                    "INIT:CONT OFF",  # set continuous trigger to off
+                    "TRIG:SOUR IMM",  # set the source
+                ]
+
+            commands += [
+                f"FUNC 'TEMP', (@{stage_configuration.TEMP_CHAN})",
+                f"UNIT:TEMP {stage_configuration.TEMP_UNITS}",
+                "TEMP:TC:ODET ON",  # set the temp probe type
+            ]
             if not thermistor:
-                serial_protocols.serial_write(
-                    port,
-                    f"TEMP:TC:TYPE {stage_configuration.TEMP_PROBE}, (@{stage_configuration.TEMP_CHAN})\r",
-                )
-                serial_protocols.serial_write(
-                    port, f"TEMP:RJUN:RSEL SIM, (@{stage_configuration.TEMP_CHAN})\r"
-                )
-                serial_protocols.serial_write(
-                    port,
-                    f"TEMP:RJUN:SIM {stage_configuration.TEMP_CJC}, (@{stage_configuration.TEMP_CHAN})\r",
-                )
-            serial_protocols.serial_write(port, ":INITiate:CONTinuous OFF\r")
+                commands += [
+                    f"TEMP:TC:TYPE {stage_configuration.TEMP_PROBE}, (@{stage_configuration.TEMP_CHAN})",
+                    f"TEMP:RJUN:RSEL SIM, (@{stage_configuration.TEMP_CHAN})",
+                    f"TEMP:RJUN:SIM {stage_configuration.TEMP_CJC}, (@{stage_configuration.TEMP_CHAN})",
+                ]
+            commands.append(":INITiate:CONTinuous OFF")
 
             if full_setup:
-                serial_protocols.serial_write(
-                    port, "TRIG:COUN 1\r"
-                )  # set trigger count to 1
-                serial_protocols.serial_write(
-                    port, f":SAMP:COUN {stage_configuration.NUM_TEMP_CHANS}\r"
-                )
-                serial_protocols.serial_write(
-                    port, f":ROUT:SCAN (@{stage_configuration.TEMP_CHAN})\r"
-                )
-                # use this to toggle the display
-                serial_protocols.serial_write(port, "DISPLAY:ENABLE 1\r")
-                serial_protocols.serial_write(port, ":TRAC:CLE\r")  # clear the buffer
+                commands += [
+                    "TRIG:COUN 1",  # set trigger count to 1
+                    f":SAMP:COUN {stage_configuration.NUM_TEMP_CHANS}",
+                    f":ROUT:SCAN (@{stage_configuration.TEMP_CHAN})",
+                    "DISPLAY:ENABLE 1",  # use this to toggle the display
+                    ":TRAC:CLE",  # clear the buffer
+                ]
+
+            if apply_configuration(port, commands):
+                # the scan list changed, set it up once so each reading is one READ?
+                data_aq_read.arm_scan(port)
 
+            if full_setup:
                 return bool(check_data_aq_in_calibration(port))
         else:
             logging.warning("port not setup...")
@@ -181,6 +290,7 @@ def config_data_aq_for_voltage(
     channels: int = 0,
     differential: bool = False,
     ac_dc: str = "DC",
+    specs=None,
 ) -> bool:
     """_summary_
 
@@ -189,6 +299,8 @@ def config_data_aq_for_voltage(
         mode (str, optional): _description_. Defaults to "".
         channels (list, optional): _description_. Defaults to [].
         differential (bool, optional): _description_. Defaults to False.
+        specs (get_specs.mems_specs, optional): part under test, picks the DC
+            integration time per channel group. Defaults to None (DAQ_DEFAULT_NPLC).
 
     Returns:
         bool: _description_
@@ -202,14 +314,21 @@ def config_data_aq_for_voltage(
     )
 
     if stage_configuration.DAQ_IDN == "KEITHLEY":
-        return issue_commands_to_data_aq(port, mode, channels_to_scan, ac_dc)
-    elif stage_configuration.DAQ_IDN != "HEWLETT-PACKARD":
+        # readings are decoded by position from here on, see data_aq_read.ScanLayout.
+        data_aq_read.compile_scan_layout(port, channels_to_scan, channels)
+        return issue_commands_to_data_aq(port, mode, channels_to_scan, ac_dc, specs)
+    data_aq_read.drop_scan_layout(port)
+    if stage_configuration.DAQ_IDN != "HEWLETT-PACKARD":
         logging.warning("port not setup...")
         return False
 
 
 def issue_commands_to_data_aq(
-    port: serial_protocols.serial_open, mode: str, channels: list, ac_dc: str
+    port: serial_protocols.serial_open,
+    mode: str,
+    channels: list,
+    ac_dc: str,
+    specs=None,
 ) -> bool:
     """_summary_
 
@@ -223,29 +342,25 @@ def issue_commands_to_data_aq(
     """
     # sourcery skip: use-fstring-for-formatting
 
-    serial_protocols.serial_write(port, "*RST\r")  # reset the dev
-    serial_protocols.serial_write(port, "SYST:BEEP 0\r")  # clear the error queue
-    # decrease integration speed
-    serial_protocols.serial_write(port, ":SENS:VOLT:DC:NPLC 0.05\r")
-    serial_protocols.serial_write(port, ":SENS:VOLT:DC:RANG 1000 \r")
-    serial_protocols.serial_write(port, "SYST:CLE\r")  # clear the error queue
-    # setup the output (reading, channel)
-    serial_protocols.serial_write(port, ":FORM:ELEM READ,CHAN\r")
-    serial_protocols.serial_write(port, ":ROUT:OPEN:ALL\r")  # open all Routes
-    # set continous trigger to off
-    serial_protocols.serial_write(port, "INIT:CONT OFF\r")
-    serial_protocols.serial_write(port, "TRIG:SOUR IMM\r")  # set the source
-    # set the buffer to 55000 points, fixes the -363 error on port
-    serial_protocols.serial_write(port, "TRAC:POIN 55000\r")
+    scan_list = ",".join(channels)
+    commands = [
+        "*RST",  # reset the dev
+        "SYST:BEEP 0",  # turn off the beeper
+        f":SENS:VOLT:DC:NPLC {stage_configuration.DAQ_DEFAULT_NPLC}",
+        ":SENS:VOLT:DC:RANG 1000",
+        "SYST:CLE",  # clear the error queue
+        ":FORM:ELEM READ,CHAN",  # setup the output (reading, channel)
+        ":ROUT:OPEN:ALL",  # open all Routes
+        "INIT:CONT OFF",  # set continous trigger to off
+        "TRIG:SOUR IMM",  # set the source
+        # set the buffer to 55000 points, fixes the -363 error on port
+        f"TRAC:POIN {data_aq_read.TRACE_BUFFER_POINTS}",
+    ]
     if ac_dc == "DC":
-        serial_protocols.serial_write(port, f"FUNC 'VOLT', (@{','.join(channels)})\r")
+        commands.append(f"FUNC 'VOLT', (@{scan_list})")
     else:
-        serial_protocols.serial_write(
-            port, f"FUNC 'VOLT:AC', (@{','.join(channels)})\r"
-        )
-    serial_protocols.serial_write(
-        port, f":SENS:VOLT:RANG 10, (@{','.join(channels)})\r"
-    )
+        commands.append(f"FUNC 'VOLT:AC', (@{scan_list})")
+    commands.append(f":SENS:VOLT:RANG 10, (@{scan_list})")
 
     # channels.extend(
     #     (stage_configuration.TEMP_CHAN_AIR, stage_configuration.TEMP_CHAN_PLATE)
@@ -254,13 +369,25 @@ def issue_commands_to_data_aq(
     # config_data_aq_for_temp(port, full_setup=False)
     if mode == "Current":
         config_dataq_for_thermistor(port, channels)
-    serial_protocols.serial_write(port, "TRIG:COUN 1\r")  # set trigger count to 1
-    serial_protocols.serial_write(port, f":SAMP:COUN {N_scan_chans}\r")
-    serial_protocols.serial_write(port, ":ROUT:SCAN (@{})\r".format(",".join(channels)))
-    # use this to toggle the display
-    serial_protocols.serial_write(port, "DISPLAY:ENABLE 1\r")
-    # set the buffer to autoclear
-    serial_protocols.serial_write(port, ":TRAC:CLE\r")
+    commands += [
+        "TRIG:COUN 1",  # set trigger count to 1
+        f":SAMP:COUN {N_scan_chans}",
+        f":ROUT:SCAN (@{scan_list})",
+        "DISPLAY:ENABLE 1",  # use this to toggle the display
+        ":TRAC:CLE",  # set the buffer to autoclear
+    ]
+    if stage_configuration.DAQ_DATA_FORMAT != "ASCII":
+        # readings come back as raw floats, no text to parse.
+        commands += serial_protocols.binary_format_commands(
+            stage_configuration.DAQ_DATA_FORMAT
+        )
+
+    # one transfer plus one error query, only for the settings that changed.
+    if apply_configuration(port, commands):
+        data_aq_read.arm_scan(port)
+
+    if specs is not None and ac_dc == "DC":
+        tune_integration_time(port, specs, channels)
 
     print("\nDone configuring Data Acquisition System.")
     print("\nChecking the calibration of the Data Acquisition System")
@@ -274,6 +401,59 @@ def issue_commands_to_data_aq(
     return bool(calibrated_bool)
 
 
+def tune_integration_time(
+    port: serial_protocols.serial_open, specs, scan_list: list
+) -> list:
+    """set the shortest integration time per channel group that meets the part's
+    noise needs, see acquisition_policy. the noise floor is measured once per
+    part and scan list in a session.
+
+    Args:
+        port (serial_protocols.serial_open): connection to the configured DAQ
+        specs (get_specs.mems_specs): part under test
+        scan_list (list): channels in the scan
+
+    Returns:
+        list: the acquisition_policy.GroupSetting applied to each group.
+    """
+    key = (specs.part_no, tuple(scan_list))
+    state = _daq_states.get(port)
+    if state is not None and key in state.policies:
+        settings = state.policies[key]
+    else:
+        channels = f"(@{','.join(scan_list)})"
+        baseline = [
+            f":SENS:VOLT:DC:NPLC {stage_configuration.DAQ_DEFAULT_NPLC}, {channels}",
+            f":SENS:VOLT:DC:AVER:STAT OFF, {channels}",
+        ]
+        apply_configuration(port, baseline)
+        statistics = data_aq_read.read_buffered_scans(
+            port, stage_configuration.DAQ_NOISE_SCANS, len(scan_list)
+        )
+        if statistics is None:
+            logging.warning("could not measure the DAQ noise floor")
+            return []
+        settings = acquisition_policy.build_policy(specs, statistics)
+        state = _daq_states.get(port)
+        if state is not None:
+            state.policies[key] = settings
+
+    commands = [command for setting in settings for command in setting.commands()]
+    if commands and apply_configuration(port, commands):
+        # re-armed by the next reading, its first scan is discarded there.
+        data_aq_read.disarm_scan(port)
+    if settings:
+        # a READ? returns after the whole scan, the visa timeout is in ms.
+        port.timeout = int(
+            1000
+            * (
+                acquisition_policy.scan_time(settings)
+                + stage_configuration.DAQ_READ_TIMEOUT_MARGIN
+            )
+        )
+    return settings
+
+
 def config_dataq_for_thermistor(port, channels):
     """_summary_
 
@@ -1,11 +1,177 @@
 import sys
+import array
 import logging
+import threading
 import time
+import weakref
+from dataclasses import dataclass, field
 
 # import random
 
 from system import stage_configuration
 from system import serial_protocols
+from analytics import statistical_methods
+
+
+# scan setup that survives between readings, sent once when the scan is armed
+# instead of before every READ?. the buffer is not fed so it can not overrun.
+# *CLS goes first so the error check after the batch sees the arming errors.
+SCAN_ARM_COMMANDS = [
+    "*CLS",
+    ":TRAC:CLE",  # clear the buffer
+    "TRAC:FEED:CONT NEV",  # readings are not stored in the buffer
+    "ROUT:SCAN:TSO IMM",  # start the scan as soon as it is triggered
+    "ROUT:SCAN:LSEL INT",  # use the internal scan list
+]
+
+_armed_ports = weakref.WeakSet()
+
+TRACE_BUFFER_POINTS = 55000  # readings the trace buffer is sized for
+
+# poll interval while a buffered run fills the trace buffer.
+BUFFER_POLL_INTERVAL = 0.05  # seconds
+
+ACQUISITION_CAPACITY = 4096  # scans kept by a background acquisition
+
+
+class ScanLayout:
+    """scan list and port mapping compiled once per DAQ configuration.
+
+    decoding a (reading, channel) response is a fixed gather of the x, y and t
+    fields of every port into a preallocated array, no per read lookups.
+    """
+
+    def __init__(self, scan_list: list, ports: int) -> None:
+        keymap = stage_configuration.DIFF_PORT_CONFIG
+        index = {chan: j for j, chan in enumerate(scan_list)}
+        self.scan_list = list(scan_list)
+        self.ports = tuple(f"PORT_{n}" for n in range(1, ports + 1))
+        tags = [chan for name in self.ports for chan in keymap[name][:3]]
+        # position of each reading in the response, tags are the fields after them.
+        self.fields = array.array("I", (2 * index[chan] for chan in tags))
+        self.tags = tags
+        self.values = array.array("d", bytes(8 * len(tags)))
+        self.size = 2 * len(scan_list)
+
+    def gather(self, readings) -> array.array | None:
+        """pull the x, y and t readings of every port out of a scan response.
+
+        Args:
+            readings (str | memoryview | array.array): READ? response, ASCII text
+                or decoded binary values
+
+        Returns:
+            array.array | None: x, y, t of every port in port order, reused by
+                the next gather. None if the response is short or, with
+                DAQ_VERIFY_CHANNELS, does not match the scan list.
+        """
+        fields = readings.split(",") if isinstance(readings, str) else readings
+        if len(fields) < self.size:
+            return None
+        values = self.values
+        for i, position in enumerate(self.fields):
+            values[i] = float(fields[position])
+        if stage_configuration.DAQ_VERIFY_CHANNELS and not self.verify(fields):
+            return None
+        return values
+
+    def verify(self, fields) -> bool:
+        for position, tag in zip(self.fields, self.tags):
+            chan = fields[position + 1]
+            if (chan.strip() if isinstance(chan, str) else str(int(chan))) != tag:
+                logging.warning(f"\tchannel {chan} where {tag} was expected")
+                return False
+        return True
+
+
+_layouts = weakref.WeakKeyDictionary()
+
+
+def compile_scan_layout(
+    port: serial_protocols.serial_open, scan_list: list | None, ports: int
+) -> ScanLayout | None:
+    """compile the decode of the scan configured on a DAQ, see ScanLayout.
+
+    Args:
+        port (serial_protocols.serial_open): connection to the DAQ
+        scan_list (list | None): channels in scan order
+        ports (int): number of ports mapped by DIFF_PORT_CONFIG
+
+    Returns:
+        ScanLayout | None: the layout, None if the scan does not cover the ports.
+    """
+    drop_scan_layout(port)
+    if not scan_list or not ports:
+        return None
+    try:
+        layout = _layouts[port] = ScanLayout(scan_list, ports)
+    except KeyError as e:
+        logging.warning(f"\tchannel {e} is not in the scan list, no scan layout")
+        return None
+    return layout
+
+
+def drop_scan_layout(port: serial_protocols.serial_open) -> None:
+    """forget the compiled scan layout, readings are parsed by channel again.
+
+    call it whenever the scan list or a channel function changes.
+
+    Args:
+        port (serial_protocols.serial_open): connection to the DAQ
+    """
+    _layouts.pop(port, None)
+
+
+def arm_scan(port: serial_protocols.serial_open) -> bool:
+    """set up the configured scan list once so every reading is a single READ?.
+
+    the first scan after arming is discarded, the meter can return it before the
+    new setup has settled.
+
+    Args:
+        port (serial_protocols.serial_open): connection to the DAQ
+
+    Returns:
+        bool: True if the meter took the setup without errors.
+    """
+    errors = serial_protocols.serial_write_batch(port, SCAN_ARM_COMMANDS)
+    _query_scan(port)
+    _armed_ports.add(port)
+    return not errors
+
+
+def disarm_scan(port: serial_protocols.serial_open) -> None:
+    """force the scan to be armed again before the next reading."""
+    _armed_ports.discard(port)
+
+
+def read_scan(port: serial_protocols.serial_open, data_points: int | None = None):
+    """trigger one scan of the armed scan list and read it in one exchange.
+
+    Args:
+        port (serial_protocols.serial_open): connection to the DAQ
+        data_points (int | None, optional): values in a binary response. Defaults to None.
+
+    Returns:
+        str | memoryview | array.array | None: the ASCII response, or the decoded
+            readings when the DAQ sends binary data. None if nothing came back.
+    """
+    if port not in _armed_ports:
+        arm_scan(port)
+
+    readings = _query_scan(port, data_points)
+    if not readings:
+        disarm_scan(port)  # re-arm in case the meter lost its setup
+        return None
+    return readings
+
+
+def _query_scan(port: serial_protocols.serial_open, data_points: int | None = None):
+    if stage_configuration.DAQ_DATA_FORMAT != "ASCII":
+        return serial_protocols.serial_query_binary(
+            port, "READ?\r", stage_configuration.DAQ_DATA_FORMAT, data_points
+        )
+    return serial_protocols.serial_write_read(port, "READ?\r")
 
 
 def get_plate_temp(port):
@@ -13,17 +179,9 @@ def get_plate_temp(port):
         serial_protocols.serial_write(port, "FETCH?\n")  # request data FETCH?
         data_array = serial_protocols.serial_read(port)  # read the com port
     elif stage_configuration.DAQ_IDN == "KEITHLEY":
-        for _ in range(2):
-            serial_protocols.serial_write(port, ":TRAC:CLE\r")  # clear the buffer
-            serial_protocols.serial_write(
-                port, "ROUT:SCAN:TSO IMM\r"
-            )  # prepare the scan
-            serial_protocols.serial_write(
-                port, "ROUT:SCAN:LSEL INT\r"
-            )  # prepare the scan
-            serial_protocols.serial_write(port, "*CLS\r")
-            serial_protocols.serial_write(port, "READ?\r")  # record data
-            data_array = serial_protocols.serial_read(port)  # read the com port
+        data_array = read_scan(port)
+        if stage_configuration.DAQ_DATA_FORMAT != "ASCII":
+            return float(data_array[0])
 
     return float(data_array.replace("+", "").split(",")[0])
 
@@ -45,13 +203,77 @@ def read_data_from_data_aq(
     t0 = time.time()
     loop_time = 0
 
+    # reading and channel for x, y and t of every port, only used for binary reads.
+    data_points = 2 * 3 * channels
+    if port in _acquisitions:
+        # the port is scanned in the background, take the next scan from there.
+        return read_window_from_data_aq(port, mode, channels, time.time(), offset=offset)
+
+    layout = _layouts.get(port)
+    if layout is not None and len(layout.ports) == channels:
+        return read_ports_from_layout(port, layout, mode, offset)
+
     while loop_time < stage_configuration.DAQ_TIMEOUT:
-        data, key = get_data_from_data_aq(port)
+        data, key = get_data_from_data_aq(port, data_points)
         # logging.warning(data)
         loop_time = time.time() - t0
         if data != []:
             break
 
+    return map_port_readings(data, key, mode, channels, offset)
+
+
+def read_ports_from_layout(
+    port: serial_protocols.serial_open, layout: ScanLayout, mode: str, offset: float = 0
+) -> dict:
+    """read_data_from_data_aq through a compiled scan layout.
+
+    Args:
+        port (serial_protocols.serial_open): connection to the DAQ
+        layout (ScanLayout): layout compiled for the configured scan
+        mode (str): measurement mode, "Current" scales x and y
+        offset (float, optional): subtracted from the temperature. Defaults to 0.
+
+    Returns:
+        dict: PORT_n -> [x, y, t], empty if no valid scan came back in time.
+    """
+    t0 = time.time()
+    values = None
+    while values is None and time.time() - t0 < stage_configuration.DAQ_TIMEOUT:
+        raw = read_scan(port, layout.size)
+        if raw is not None:
+            values = layout.gather(raw)
+            if values is None:
+                disarm_scan(port)
+    if values is None:
+        return {}
+
+    xy_scalar = 1.0 * 1e1 if mode.upper() == "Current" else 1e0
+    return {
+        name: [
+            round(values[i] * xy_scalar, 6),
+            round(values[i + 1] * xy_scalar, 6),
+            round(values[i + 2] - offset, 3),
+        ]
+        for name, i in zip(layout.ports, range(0, len(values), 3))
+    }
+
+
+def map_port_readings(
+    data: list, key: dict, mode: str, channels: int, offset: float = 0
+) -> dict:
+    """sort scan readings into [x, y, t] per port using DIFF_PORT_CONFIG.
+
+    Args:
+        data (list): readings in scan order
+        key (dict): channel -> index of its reading in data
+        mode (str): measurement mode, "Current" scales x and y
+        channels (int): number of ports
+        offset (float, optional): subtracted from the temperature. Defaults to 0.
+
+    Returns:
+        dict: PORT_n -> [x, y, t].
+    """
     xy_scalar = 1.0 * 1e1 if mode.upper() == "Current" else 1e0
     temp_scalar = 1.0  # no scaling required
     keymap = stage_configuration.DIFF_PORT_CONFIG
@@ -84,7 +306,9 @@ def read_data_from_data_aq(
         return data_array
 
 
-def get_data_from_data_aq(port: serial_protocols.serial_open) -> tuple[list, dict]:
+def get_data_from_data_aq(
+    port: serial_protocols.serial_open, data_points: int | None = None
+) -> tuple[list, dict]:
     data_array = []
     key = {}
     j = 0
@@ -94,17 +318,12 @@ def get_data_from_data_aq(port: serial_protocols.serial_open) -> tuple[list, dic
         serial_protocols.serial_write(port, "FETCH?\n")  # request data FETCH?
         data_array = serial_protocols.serial_read(port)  # read the com port
     elif stage_configuration.DAQ_IDN == "KEITHLEY":
-        for _ in range(2):
-            serial_protocols.serial_write(port, ":TRAC:CLE\r")  # clear the buffer
-            serial_protocols.serial_write(
-                port, "ROUT:SCAN:TSO IMM\r"
-            )  # prepare the scan
-            serial_protocols.serial_write(
-                port, "ROUT:SCAN:LSEL INT\r"
-            )  # prepare the scan
-            serial_protocols.serial_write(port, "*CLS\r")
-            serial_protocols.serial_write(port, "READ?\r")  # record data
-            raw = serial_protocols.serial_read(port)  # read the com port
+        raw = read_scan(port, data_points)
+        if raw is None:
+            return NULL, key
+
+        if stage_configuration.DAQ_DATA_FORMAT != "ASCII":
+            return get_binary_data(port, raw)
 
         raw = raw.rstrip().split(",")
 
@@ -126,9 +345,401 @@ def get_data_from_data_aq(port: serial_protocols.serial_open) -> tuple[list, dic
         else:
             # reopen all channels
             serial_protocols.serial_write(port, ":ROUT:OPEN:ALL\r")
+            disarm_scan(port)
             logging.debug("\tDone scanning, returning values now...")
             return NULL, key
 
     else:
         logging.warning("DAQ not setup...")
         return NULL, key
+
+
+def get_binary_data(port: serial_protocols.serial_open, readings) -> tuple[list, dict]:
+    """split binary (reading, channel) pairs into readings and a channel index.
+
+    Args:
+        port (serial_protocols.serial_open): connection to the DAQ
+        readings (Union[memoryview, array.array]): decoded READ? response
+
+    Returns:
+        tuple[list, dict]: readings, and the index of each channel's reading.
+    """
+    if len(readings) < 2:
+        serial_protocols.serial_write(port, ":ROUT:OPEN:ALL\r")
+        return [], {}
+
+    data_array = list(readings[0::2])
+    key = {str(int(chan)): j for j, chan in enumerate(readings[1::2])}
+    logging.debug("\tDone scanning, returning values now...")
+    return data_array, key
+
+
+@dataclass
+class ScanStatistics:
+    """per channel statistics of a buffered run, in scan order."""
+
+    scans: int = 0
+    channels: list = field(default_factory=list)
+    mean: list = field(default_factory=list)
+    std: list = field(default_factory=list)
+    minimum: list = field(default_factory=list)
+    maximum: list = field(default_factory=list)
+
+    def key(self) -> dict:
+        """channel -> index of its statistics, like the key of get_data_from_data_aq."""
+        return {chan: j for j, chan in enumerate(self.channels)}
+
+
+def wait_for_buffer(port: serial_protocols.serial_open, readings: int) -> int:
+    """poll the trace buffer until it holds the expected number of readings.
+
+    Args:
+        port (serial_protocols.serial_open): connection to the DAQ
+        readings (int): readings the run stores
+
+    Returns:
+        int: readings in the buffer, less than expected on a timeout.
+    """
+    t0 = time.time()
+    stored = 0
+    while True:
+        try:
+            stored = int(
+                float(serial_protocols.serial_write_read(port, "TRAC:POIN:ACT?\r"))
+            )
+        except (TypeError, ValueError):
+            stored = 0
+        if stored >= readings or time.time() - t0 > stage_configuration.DAQ_TIMEOUT:
+            return stored
+        time.sleep(BUFFER_POLL_INTERVAL)
+
+
+def read_buffered_scans(
+    port: serial_protocols.serial_open, scans: int, scan_channels: int
+) -> ScanStatistics | None:
+    """run back to back scans into the trace buffer and reduce them per channel.
+
+    the meter stores every scan, all readings come back with a single TRAC:DATA?
+    and are reduced on the host, instead of one READ? round trip per scan.
+
+    Args:
+        port (serial_protocols.serial_open): connection to the DAQ
+        scans (int): number of scans of the configured scan list
+        scan_channels (int): channels in the scan list
+
+    Returns:
+        ScanStatistics | None: mean, std, min and max of every channel. None if
+            the buffer did not fill or the readings could not be read.
+    """
+    total = scans * scan_channels
+    if total > TRACE_BUFFER_POINTS:
+        raise ValueError(
+            f"{scans} scans of {scan_channels} channels do not fit the trace buffer"
+        )
+
+    # the whole run holds the exchange lock, a READ? from another thread between
+    # INIT and TRAC:DATA? would trigger the scan and corrupt the buffer.
+    with serial_protocols.exchange_lock(port):
+        try:
+            serial_protocols.serial_write_batch(
+                port,
+                [
+                    ":TRAC:CLE",
+                    "TRAC:FEED SENS",  # store the raw readings
+                    "TRAC:FEED:CONT NEXT",  # fill the buffer once, then stop
+                    f"TRIG:COUN {scans}",
+                ],
+            )
+            serial_protocols.serial_write(port, "INIT\r")
+            stored = wait_for_buffer(port, total)
+            if stored < total:
+                logging.warning(
+                    f"\tbuffered scan timed out with {stored}/{total} readings"
+                )
+                return None
+
+            if stage_configuration.DAQ_DATA_FORMAT != "ASCII":
+                raw = serial_protocols.serial_query_binary(
+                    port,
+                    "TRAC:DATA?\r",
+                    stage_configuration.DAQ_DATA_FORMAT,
+                    2 * total,
+                )
+                if raw is None or len(raw) < 2 * total:
+                    return None
+                readings = raw[0::2]
+                chans = [str(int(chan)) for chan in raw[1 : 2 * scan_channels : 2]]
+            else:
+                raw = serial_protocols.serial_write_read(port, "TRAC:DATA?\r")
+                if not raw:
+                    return None
+                raw = raw.rstrip().split(",")
+                if len(raw) < 2 * total:
+                    return None
+                readings = [float(value) for value in raw[0 : 2 * total : 2]]
+                chans = raw[1 : 2 * scan_channels : 2]
+
+            statistics = ScanStatistics(scans=scans, channels=chans)
+            for j in range(scan_channels):
+                mean, std, minimum, maximum = statistical_methods.sample_statistics(
+                    readings[j::scan_channels]
+                )
+                statistics.mean.append(mean)
+                statistics.std.append(std)
+                statistics.minimum.append(minimum)
+                statistics.maximum.append(maximum)
+            return statistics
+
+        except Exception as e:
+            *_, exc_tb = sys.exc_info()
+            logging.warning(f"\t{e} -> Line {exc_tb.tb_lineno}")
+            disarm_scan(port)
+            return None
+
+        finally:
+            # back to the armed single scan setup read_scan expects.
+            serial_protocols.serial_write_batch(
+                port, ["TRIG:COUN 1", "TRAC:FEED:CONT NEV", ":TRAC:CLE"]
+            )
+
+
+class ScanRing:
+    """fixed size ring of timestamped scans, one row of channel readings per scan.
+
+    rows are preallocated, appending a scan overwrites the oldest one.
+    """
+
+    def __init__(self, channels: list, capacity: int = ACQUISITION_CAPACITY) -> None:
+        self.channels = list(channels)
+        self.width = len(channels)
+        self.capacity = capacity
+        self.times = array.array("d", bytes(8 * capacity))
+        self.values = array.array("d", bytes(8 * capacity * self.width))
+        self.count = 0  # scans written since the ring was made
+
+    def append(self, timestamp: float, values) -> None:
+        slot = self.count % self.capacity
+        self.times[slot] = timestamp
+        self.values[slot * self.width : (slot + 1) * self.width] = array.array(
+            "d", values
+        )
+        self.count += 1
+
+    def slots(self, since: float, until: float | None = None) -> list:
+        """ring slots of the scans triggered in [since, until), oldest first."""
+        found = []
+        for n in range(self.count - 1, max(self.count - self.capacity, 0) - 1, -1):
+            slot = n % self.capacity
+            timestamp = self.times[slot]
+            if timestamp < since:
+                break
+            if until is None or timestamp < until:
+                found.append(slot)
+        found.reverse()
+        return found
+
+
+class ScanAcquisition:
+    """scan the DAQ continuously on a background thread into a ScanRing.
+
+    readings are decoded through the compiled ScanLayout when there is one. scans
+    are timestamped with time.time() when they are triggered.
+    """
+
+    def __init__(
+        self,
+        port: serial_protocols.serial_open,
+        capacity: int = ACQUISITION_CAPACITY,
+        interval: float = 0.0,
+    ) -> None:
+        self.port = port
+        self.capacity = capacity
+        self.interval = interval
+        self.ring = None
+        self._stop = threading.Event()
+        self._new_scan = threading.Condition()
+        self._thread = None
+        # pooled handles serialize exchanges with other users of the DAQ.
+        self._exchange_lock = getattr(port, "exchange_lock", None) or threading.RLock()
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="daq-acquisition", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _scan(self) -> tuple[float, list | None, list | None]:
+        with self._exchange_lock:
+            timestamp = time.time()
+            layout = _layouts.get(self.port)
+            if layout is not None:
+                raw = read_scan(self.port, layout.size)
+                values = layout.gather(raw) if raw is not None else None
+                return timestamp, values, layout.tags
+            data, key = get_data_from_data_aq(self.port)
+            return timestamp, data or None, sorted(key, key=key.get)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                timestamp, values, channels = self._scan()
+            except Exception as e:
+                *_, exc_tb = sys.exc_info()
+                logging.warning(f"\t{e} -> Line {exc_tb.tb_lineno}")
+                values = None
+            if values is not None:
+                with self._new_scan:
+                    if self.ring is None or self.ring.channels != channels:
+                        # first scan, or the DAQ was configured for another scan.
+                        self.ring = ScanRing(channels, self.capacity)
+                    self.ring.append(timestamp, values)
+                    self._new_scan.notify_all()
+            if self.interval:
+                self._stop.wait(self.interval)
+
+    def wait_for_scans(
+        self, since: float, scans: int = 1, timeout: float | None = None
+    ) -> bool:
+        """block until scans triggered at or after `since` are in the ring.
+
+        Args:
+            since (float): time.time() the scans have to start after
+            scans (int, optional): scans to wait for. Defaults to 1.
+            timeout (float | None, optional): seconds. Defaults to DAQ_TIMEOUT.
+
+        Returns:
+            bool: True if the scans came in, False on a timeout.
+        """
+        timeout = stage_configuration.DAQ_TIMEOUT if timeout is None else timeout
+        with self._new_scan:
+            return self._new_scan.wait_for(
+                lambda: self.ring is not None
+                and len(self.ring.slots(since)) >= scans,
+                timeout,
+            )
+
+    def statistics(
+        self, since: float, until: float | None = None
+    ) -> ScanStatistics | None:
+        """per channel statistics of the scans triggered in [since, until).
+
+        Args:
+            since (float): window start, time.time()
+            until (float | None, optional): window end. Defaults to None (now).
+
+        Returns:
+            ScanStatistics | None: None if no scan falls in the window.
+        """
+        with self._new_scan:
+            ring = self.ring
+            if ring is None:
+                return None
+            slots = ring.slots(since, until)
+            if not slots:
+                return None
+            width = ring.width
+            rows = [ring.values[slot * width : (slot + 1) * width] for slot in slots]
+
+        statistics = ScanStatistics(scans=len(rows), channels=list(ring.channels))
+        for j in range(width):
+            mean, std, minimum, maximum = statistical_methods.sample_statistics(
+                [row[j] for row in rows]
+            )
+            statistics.mean.append(mean)
+            statistics.std.append(std)
+            statistics.minimum.append(minimum)
+            statistics.maximum.append(maximum)
+        return statistics
+
+
+_acquisitions = weakref.WeakKeyDictionary()
+
+
+def start_acquisition(
+    port: serial_protocols.serial_open,
+    capacity: int = ACQUISITION_CAPACITY,
+    interval: float = 0.0,
+) -> ScanAcquisition:
+    """scan the DAQ in the background until stop_acquisition.
+
+    while it runs read_data_from_data_aq returns the next background scan.
+
+    Args:
+        port (serial_protocols.serial_open): connection to the configured DAQ
+        capacity (int, optional): scans kept. Defaults to ACQUISITION_CAPACITY.
+        interval (float, optional): seconds between scans, 0 to scan back to
+            back. Defaults to 0.0.
+
+    Returns:
+        ScanAcquisition: the running acquisition.
+    """
+    acquisition = _acquisitions.get(port)
+    if acquisition is None or not acquisition.running():
+        acquisition = _acquisitions[port] = ScanAcquisition(port, capacity, interval)
+        acquisition.start()
+    return acquisition
+
+
+def stop_acquisition(port: serial_protocols.serial_open) -> None:
+    acquisition = _acquisitions.pop(port, None)
+    if acquisition is not None:
+        acquisition.stop()
+
+
+def get_acquisition(port: serial_protocols.serial_open) -> ScanAcquisition | None:
+    return _acquisitions.get(port)
+
+
+def read_window_from_data_aq(
+    port: serial_protocols.serial_open,
+    mode: str,
+    channels: int,
+    since: float,
+    until: float | None = None,
+    offset: int = 0,
+) -> dict:
+    """average the background scans of a time window per port.
+
+    i.e. the last 2 s since the stage reported in-position:
+    read_window_from_data_aq(port, mode, channels, in_position, in_position + 2)
+
+    waits for the window to be covered (or for one scan when it is open ended).
+
+    Args:
+        port (serial_protocols.serial_open): DAQ with a running acquisition
+        mode (str): measurement mode, "Current" scales x and y
+        channels (int): number of ports
+        since (float): window start, time.time()
+        until (float | None, optional): window end. Defaults to None (open ended).
+        offset (int, optional): subtracted from the temperature. Defaults to 0.
+
+    Returns:
+        dict: PORT_n -> mean [x, y, t], empty if no scan falls in the window.
+    """
+    acquisition = _acquisitions.get(port)
+    if acquisition is None:
+        logging.warning("no background acquisition running on the DAQ")
+        return {}
+
+    if until is None:
+        acquisition.wait_for_scans(since)
+    else:
+        wait = until - time.time()
+        acquisition.wait_for_scans(
+            until, timeout=max(wait, 0) + stage_configuration.DAQ_TIMEOUT
+        )
+
+    statistics = acquisition.statistics(since, until)
+    if statistics is None:
+        return {}
+    return map_port_readings(statistics.mean, statistics.key(), mode, channels, offset)
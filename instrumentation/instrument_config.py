@@ -1,7 +1,13 @@
-from system import serial_protocols
+from system import command_pacing
+from system import connection_pool
+from system import io_metrics
 from system import stage_configuration
 
+from instrumentation import data_aq_init
 from instrumentation import motor_initialization
+from instrumentation import thermometry
+
+from network import validate_asset_calibration
 
 
 class mock_port:
@@ -15,36 +21,69 @@ class mock_port:
         print("reading data")
 
 
+def apply_pacing_profile(port: object, instrument: str) -> None:
+    """attach the configured pacing profile to an open instrument connection.
+
+    Args:
+        port (object): open serial, visa or socket connection
+        instrument (str): key into stage_configuration.PACING_PROFILES
+    """
+    if port is None:
+        return
+    io_metrics.set_instrument_name(port, instrument)
+    if instrument not in stage_configuration.PACING_PROFILES:
+        return
+    if command_pacing.get_pacer(port) is not None:
+        return  # keep what was learned on a pooled connection
+    profile = command_pacing.PacingProfile(
+        instrument, **stage_configuration.PACING_PROFILES[instrument]
+    )
+    command_pacing.set_pacing_profile(port, profile)
+
+
 def instrumentation_setup() -> dict:
-    """setup and initialize all instruments
+    """setup and initialize all instruments. serial, visa and socket instruments
+    come from the connection pool so repeat setups reuse the open sessions.
 
     Returns:
         dict: instruments serial port connections in a dict.
     """
+    # the calibration checks after configuration look up the downloaded list.
+    validate_asset_calibration.prefill_asset_cache()
+
+    if stage_configuration.THERMAL_MONITOR:
+        thermometry.start_thermal_monitor()
+
     if stage_configuration.CONTROLLER_TYPE == "Automation1":
         stage_port = motor_initialization.automation1_configure_stage()
     else:
-        stage_port = serial_protocols.serial_open(
+        stage_port = connection_pool.serial_connection(
             stage_configuration.STAGE_PORT,
             stage_configuration.STAGE_BAUD,
             use_visa=False,
         )
         stage_port.timeout = 30
+        apply_pacing_profile(stage_port, "ENSEMBLE")
 
-    data_aq_port = serial_protocols.serial_open(
+    data_aq_port = connection_pool.serial_connection(
         stage_configuration.DAQ_PORT, stage_configuration.DAQ_BAUD
     )
+    apply_pacing_profile(data_aq_port, "KEITHLEY 2750")
+    # every run starts with *RST and a full configuration.
+    data_aq_init.reset_daq_state(data_aq_port)
 
     if stage_configuration.CHAMBER_AVAILABLE is True:
-        chamber_port = serial_protocols.socket_open(
-            stage_configuration.CHAMBER_TCP_ADDR, stage_configuration.CHAMBER_TCP_ADDR
+        chamber_port = connection_pool.socket_connection(
+            stage_configuration.CHAMBER_TCP_ADDR, stage_configuration.CHAMBER_TCP_PORT
         )
+        apply_pacing_profile(chamber_port, "WATLOW F4T")
     else:
         chamber_port = None
 
-    power_supply_port = serial_protocols.serial_open(
+    power_supply_port = connection_pool.serial_connection(
         stage_configuration.DPS_PORT, stage_configuration.DPS_BAUD
     )
+    apply_pacing_profile(power_supply_port, stage_configuration.POWER_SUPPLY)
 
     return {
         "Stage": stage_port,
@@ -55,7 +94,8 @@ def instrumentation_setup() -> dict:
 
 
 def instrumentation_close_connections(instruments: dict) -> None:
-    """close connections to all instruments
+    """close connections to all instruments. the pooled handles reconnect on the
+    next instrumentation_setup().
 
     Args:
         instruments (dict): _description_
@@ -65,9 +105,12 @@ def instrumentation_close_connections(instruments: dict) -> None:
     else:
         instruments["Stage"].close()
 
+    data_aq_init.reset_daq_state(instruments["DataAq"])
     instruments["DataAq"].close()
     instruments["Supply"].close()
     if stage_configuration.CHAMBER_AVAILABLE:
         instruments["Chamber"].close()
 
+    thermometry.stop_thermal_monitor()
+
     return
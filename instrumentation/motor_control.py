@@ -2,6 +2,7 @@ import logging
 import math
 import sys
 import time
+import weakref
 
 from system import serial_protocols
 from system import stage_configuration
@@ -36,6 +37,9 @@ def move_stage_to_angle(port: serial_protocols.serial_open, angle: float) -> flo
 
     Returns:
             float: angle the stage moved and settled at in degrees.
+
+    Raises:
+            RuntimeError: the move timed out, faulted or settled out of tolerance.
     """  # noqa: E501
 
     current_angle = None
@@ -45,7 +49,8 @@ def move_stage_to_angle(port: serial_protocols.serial_open, angle: float) -> flo
     if stage_configuration.CONTROLLER_TYPE == "Automation1":
         current_angle, angle_uncertainty = automation1_move_to_angle(port, angle)
     elif stage_configuration.CONTROLLER_TYPE == "Ensemble":
-        current_angle = ensemble_move_to_angle(port, angle)
+        current_angle, result = ensemble_move_to_angle(port, angle)
+        check_move_result(angle, current_angle, result)
 
     return current_angle
 
@@ -59,6 +64,9 @@ def move_stage_incremental(port: serial_protocols.serial_open, angle: float) ->
 
     Returns:
             float: angle the stage moved and settled at in degrees.
+
+    Raises:
+            RuntimeError: the move timed out, faulted or settled out of tolerance.
     """  # noqa: E501
 
     current_angle = 0.0
@@ -70,12 +78,29 @@ def move_stage_incremental(port: serial_protocols.serial_open, angle: float) ->
             port, angle
         )
     elif stage_configuration.CONTROLLER_TYPE == "Ensemble":
-        current_angle = ensemble_move_incremental(port, angle)
-        current_angle = ensemble_read_position(port)
+        current_angle, result = ensemble_move_incremental_angle(port, angle)
+        check_move_result(angle, current_angle, result)
 
     return current_angle
 
 
+def check_move_result(angle: float, current_angle: float, result: str) -> None:
+    """raise if a move did not end in position, so no reading is taken there.
+
+    Args:
+        angle (float): commanded angle, or increment, in degrees
+        current_angle (float): where the stage ended up in degrees
+        result (str): move outcome, see ensemble_wait_for_move
+
+    Raises:
+        RuntimeError: the outcome is not MOVE_DONE.
+    """
+    if result != MOVE_DONE:
+        raise RuntimeError(
+            f"stage move to {angle} (deg) ended {result} at {current_angle} (deg)"
+        )
+
+
 def define_home(port: serial_protocols.serial_open) -> None:
     if stage_configuration.CONTROLLER_TYPE == "Automation1":
         automation1_define_home(port)
@@ -87,6 +112,36 @@ def define_home(port: serial_protocols.serial_open) -> None:
 
 # Ensemble functions and protocols
 
+# DRIVESTATUS bits, see DriveStatus in the Ensemble help.
+ENSEMBLE_ENABLED = 1 << 0
+ENSEMBLE_IN_POSITION = 1 << 25
+ENSEMBLE_MOVE_ACTIVE = 1 << 26
+
+# move outcomes
+MOVE_DONE = "done"
+MOVE_TIMEOUT = "timeout"
+MOVE_OUT_OF_TOLERANCE = "out of tolerance"
+MOVE_FAULT = "fault"
+
+
+def ensemble_command(port: serial_protocols.serial_open, command: str) -> bool:
+    """send a command and read its acknowledgement, so it does not run into the
+    answer of the next query.
+
+    Args:
+        port (serial_protocols.serial_open): open serial port connection to rotary stage
+        command (str): command with its terminator
+
+    Returns:
+        bool: True if the controller accepted it (%), False if it rejected it (!),
+            faulted (#) or did not answer.
+    """
+    ack = serial_protocols.serial_write_read(port, command, use_visa=False)
+    if ack is None or not ack.strip().startswith("%"):
+        logging.warning(f"Stage controller did not accept {command.strip()}: {ack}")
+        return False
+    return True
+
 
 def ensemble_move_absolute(port: serial_protocols.serial_open, angle: float) -> None:
     """command stage to angle in degrees.
@@ -97,9 +152,7 @@ def ensemble_move_absolute(port: serial_protocols.serial_open, angle: float) ->
     """
     speed = 20  # revs/sec
     # port.write(f"MOVEABS X {angle} XF {speed}\r\n".encode())
-    serial_protocols.serial_write(
-        port, f"MOVEABS X {angle} XF {speed}\r\n", use_visa=False
-    )
+    ensemble_command(port, f"MOVEABS X {angle} XF {speed}\r\n")
 
     return
 
@@ -113,16 +166,14 @@ def ensemble_move_incremental(port: serial_protocols.serial_open, angle: float)
     """
     speed = 20  # revs/sec
     # port.write(f"MOVEINC X {angle} XF {speed}\r\n".encode())
-    serial_protocols.serial_write(
-        port, f"MOVEINC X {angle} XF {speed}\r\n", use_visa=False
-    )
+    ensemble_command(port, f"MOVEINC X {angle} XF {speed}\r\n")
 
     return
 
 
 def ensemble_define_home(port: serial_protocols.serial_open) -> None:
     # port.write("HOME(X)".encode())
-    serial_protocols.serial_write(port, "HOME(X)\r\n", use_visa=False)
+    ensemble_command(port, "HOME(X)\r\n")
 
     return
 
@@ -153,53 +204,200 @@ def ensemble_read_position(port: serial_protocols.serial_open) -> float:
     return angle
 
 
-def ensemble_move_to_angle(port: serial_protocols.serial_open, angle: float) -> float:
+def ensemble_drive_status(port: serial_protocols.serial_open) -> int | None:
+    """query the drive status bits of the controller.
+
+    Args:
+        port (serial_protocols.serial_open): open serial port connection to rotary stage
+
+    Returns:
+        int | None: DRIVESTATUS bits, 0 if the controller rejected a command, None
+            if it did not answer.
+    """
     try:
-        drive_check = ensemble_move_absolute(port, angle)
+        resp = serial_protocols.serial_write_read(
+            port, "DRIVESTATUS(X)\r\n", use_visa=False
+        )
+        if not resp:
+            return None
+        resp = resp.strip()
+        if "!" in resp or "#" in resp:
+            logging.warning(f"Stage controller rejected a command: {resp}")
+            return 0
+        return int(resp.replace("%", ""))
+    except Exception as e:
+        exc_type, exc_obj, exc_tb = sys.exc_info()
+        logging.warning(f"\t{e} -> Line {exc_tb.tb_lineno}")
+        return None
 
-        current_angle = ensemble_read_position(port)
-        # curr_angle = -curr_angle
-        if drive_check == 0:
-            return current_angle
-
-        t0 = time.time()
-        loop_time = 0
-        while (
-            loop_time < stage_configuration.TIMEOUT
-            and abs(current_angle - angle) >= stage_configuration.STAGE_ACCURACY
-        ):  # noqa: E501
-            current_angle = ensemble_read_position(port)
-            # curr_angle = -curr_angle
-            loop_time = time.time() - t0
-            if abs(current_angle - angle) > stage_configuration.STAGE_ACCURACY:
-                logging.info("Target angle not reached")
-            if loop_time > stage_configuration.TIMEOUT:
-                logging.info("Timeout reached. ")
+
+def ensemble_wait_for_move(
+    port: serial_protocols.serial_open, angle: float, timeout: float | None = None
+) -> tuple[float, str]:
+    """wait for the axis to report in position, then read where it settled.
+
+    the status is polled starting every STAGE_STATUS_INTERVAL, doubling up to
+    STAGE_STATUS_MAX_INTERVAL so long moves do not flood the serial link. the
+    first in position sample after the move command can still be the one from
+    before the move started, so a position out of tolerance is only reported once
+    a second in position sample confirms it.
+
+    Args:
+        port (serial_protocols.serial_open): open serial port connection to rotary stage
+        angle (float): commanded angle in degrees
+        timeout (float | None, optional): seconds. Defaults to TIMEOUT.
+
+    Returns:
+        tuple[float, str]: settled angle in degrees and MOVE_DONE, MOVE_TIMEOUT,
+            MOVE_OUT_OF_TOLERANCE or MOVE_FAULT.
+    """
+    timeout = stage_configuration.TIMEOUT if timeout is None else timeout
+    interval = stage_configuration.STAGE_STATUS_INTERVAL
+    result = MOVE_TIMEOUT
+    current_angle = None
+    out_of_tolerance = 0  # in position samples in a row away from the angle
+    t0 = time.monotonic()
+
+    while time.monotonic() - t0 < timeout:
+        status = ensemble_drive_status(port)
+        if status is not None:
+            if not status & ENSEMBLE_ENABLED:
+                result = MOVE_FAULT
+                break
+            if status & ENSEMBLE_IN_POSITION and not status & ENSEMBLE_MOVE_ACTIVE:
+                current_angle = ensemble_read_position(port)
+                if abs(current_angle - angle) < stage_configuration.STAGE_ACCURACY:
+                    result = MOVE_DONE
+                    break
+                out_of_tolerance += 1
+                if out_of_tolerance > 1:
+                    result = MOVE_OUT_OF_TOLERANCE
+                    break
+                # re-poll right away, the move may not have started yet.
+                interval = stage_configuration.STAGE_STATUS_INTERVAL
             else:
-                logging.info("Timeout not reached, Stage is having trouble.")
+                out_of_tolerance = 0
+        time.sleep(interval)
+        interval = min(2 * interval, stage_configuration.STAGE_STATUS_MAX_INTERVAL)
+
+    if result in (MOVE_TIMEOUT, MOVE_FAULT):
+        current_angle = ensemble_read_position(port)
+
+    if result == MOVE_TIMEOUT:
+        logging.warning(
+            f"Stage did not finish the move to {angle} (deg) in {timeout} s, "
+            f"at {current_angle} (deg)"
+        )
+    elif result == MOVE_OUT_OF_TOLERANCE:
+        logging.warning(
+            f"Stage settled at {current_angle} (deg), outside "
+            f"{stage_configuration.STAGE_ACCURACY} (deg) of {angle} (deg)"
+        )
+    elif result == MOVE_FAULT:
+        logging.warning(f"Stage faulted moving to {angle} (deg), at {current_angle}")
+
+    return current_angle, result
+
 
+def ensemble_move_to_angle(
+    port: serial_protocols.serial_open, angle: float
+) -> tuple[float, str]:
+    """move to an angle and wait for the axis to settle there.
+
+    Args:
+        port (serial_protocols.serial_open): open serial port connection to rotary stage
+        angle (float): angle in degrees to move to.
+
+    Returns:
+        tuple[float, str]: settled angle in degrees and the move outcome, see
+            ensemble_wait_for_move.
+    """
+    current_angle, result = math.nan, MOVE_FAULT
+    try:
+        ensemble_move_absolute(port, angle)
+        current_angle, result = ensemble_wait_for_move(port, angle)
     except Exception as e:
         exc_type, exc_obj, exc_tb = sys.exc_info()
         logging.warning(f"\t{e} -> Line {exc_tb.tb_lineno}")
 
-    return current_angle
+    return current_angle, result
+
+
+def ensemble_move_incremental_angle(
+    port: serial_protocols.serial_open, angle: float
+) -> tuple[float, str]:
+    """move by an angle and wait for the axis to settle.
+
+    Args:
+        port (serial_protocols.serial_open): open serial port connection to rotary stage
+        angle (float): angle in degrees to move by.
+
+    Returns:
+        tuple[float, str]: settled angle in degrees and the move outcome, see
+            ensemble_wait_for_move.
+    """
+    current_angle, result = math.nan, MOVE_FAULT
+    try:
+        target_angle = ensemble_read_position(port) + angle
+        ensemble_move_incremental(port, angle)
+        current_angle, result = ensemble_wait_for_move(port, target_angle)
+    except Exception as e:
+        exc_type, exc_obj, exc_tb = sys.exc_info()
+        logging.warning(f"\t{e} -> Line {exc_tb.tb_lineno}")
+
+    return current_angle, result
 
 
 # Automation1 functions and protocols
 
 
-def automation1_read_position(controller: automation1.Controller) -> float:
+# data collection configurations, built once per controller session. a reconnect
+# makes a new controller object and so a new configuration.
+_data_configs = weakref.WeakKeyDictionary()
+
+
+def automation1_data_config(
+    controller: automation1.Controller,
+) -> automation1.DataCollectionConfiguration:
+    """snapshot configuration for position reads, built on first use and reused.
+
+    only PositionFeedback is collected unless STAGE_DIAGNOSTICS is set.
+
+    Args:
+        controller (automation1.Controller): connected controller
+
+    Returns:
+        automation1.DataCollectionConfiguration: the configuration.
+    """
+    try:
+        data_config = _data_configs.get(controller)
+    except TypeError:
+        data_config = None
+    if data_config is not None:
+        return data_config
+
     num_points = stage_configuration.STAGE_POINTS_TO_READ
     axis = stage_configuration.STAGE_AXIS
 
     frequency = automation1.DataCollectionFrequency.Frequency1kHz
     data_config = automation1.DataCollectionConfiguration(num_points, frequency)
-    # Adding the following signals to be collected on the x-axis
-    data_config.axis.add(automation1.AxisDataSignal.PositionCommand, axis)
     data_config.axis.add(automation1.AxisDataSignal.PositionFeedback, axis)
-    data_config.axis.add(automation1.AxisDataSignal.PositionError, axis)
-    # Adding the time signal from the controller.
-    data_config.system.add(automation1.SystemDataSignal.DataCollectionSampleTime)
+    if stage_configuration.STAGE_DIAGNOSTICS:
+        data_config.axis.add(automation1.AxisDataSignal.PositionCommand, axis)
+        data_config.axis.add(automation1.AxisDataSignal.PositionError, axis)
+        # Adding the time signal from the controller.
+        data_config.system.add(automation1.SystemDataSignal.DataCollectionSampleTime)
+
+    try:
+        _data_configs[controller] = data_config
+    except TypeError:
+        pass  # controller can not be weakly referenced, build it every time.
+    return data_config
+
+
+def automation1_read_position(controller: automation1.Controller) -> float:
+    num_points = stage_configuration.STAGE_POINTS_TO_READ
+    data_config = automation1_data_config(controller)
 
     controller.runtime.data_collection.start(
         automation1.DataCollectionMode.Snapshot, data_config
@@ -207,7 +405,9 @@ def automation1_read_position(controller: automation1.Controller) -> float:
 
     results = controller.runtime.data_collection.get_results(data_config, num_points)
 
-    return results.axis.get(automation1.AxisDataSignal.PositionFeedback, axis).points
+    return results.axis.get(
+        automation1.AxisDataSignal.PositionFeedback, stage_configuration.STAGE_AXIS
+    ).points
 
 
 def automation1_move_absolute(controller: automation1.Controller, value: float):
@@ -230,45 +430,96 @@ def automation1_move_to_angle(
     controller: automation1.Controller, value: float
 ) -> list[float, float]:
     automation1_move_absolute(controller, value)
+    return automation1_wait_for_move(controller, value)
+
 
+def automation1_move_incremental_angle(
+    controller: automation1.Controller, value: float
+) -> list[float, float]:
     pos_fbk = automation1_read_position(controller)
-    current_position = statistical_methods.mean(pos_fbk)
+    target_position = statistical_methods.mean(pos_fbk) + value
+
+    automation1_move_incremental(controller, value)
+    return automation1_wait_for_move(controller, target_position)
+
+
+_status_configs = weakref.WeakKeyDictionary()
+
 
-    while abs(value - current_position) > stage_configuration.STAGE_ACCURACY:
+def automation1_in_position(controller: automation1.Controller) -> bool:
+    """read the axis status and check its in position bit.
+
+    Args:
+        controller (automation1.Controller): connected controller
+
+    Returns:
+        bool: True if the axis is in position.
+    """
+    axis = stage_configuration.STAGE_AXIS
+    try:
+        status_config = _status_configs.get(controller)
+    except TypeError:
+        status_config = None
+    if status_config is None:
+        status_config = automation1.StatusItemConfiguration()
+        status_config.axis.add(automation1.AxisStatusItem.AxisStatus, axis)
         try:
-            pos_fbk = automation1_read_position(controller)
-            current_position = statistical_methods.mean(pos_fbk)
-            time.sleep(0.5)
-        except KeyboardInterrupt:
-            break
+            _status_configs[controller] = status_config
+        except TypeError:
+            pass
 
-    print(f"Current Motor Position is: {current_position:.6f} (deg)")
-    return statistical_methods.mean(
-        pos_fbk
-    ), statistical_methods.standard_deviation_from_mean(pos_fbk)
+    results = controller.runtime.status.get_status_items(status_config)
+    status = int(results.axis.get(automation1.AxisStatusItem.AxisStatus, axis).value)
+    return bool(status & automation1.AxisStatus.InPosition)
 
 
-def automation1_move_incremental_angle(
-    controller: automation1.Controller, value: float
+def automation1_wait_for_move(
+    controller: automation1.Controller,
+    target: float | None = None,
+    timeout: float | None = None,
 ) -> list[float, float]:
-    pos_fbk = automation1_read_position(controller)
-    current_position = statistical_methods.mean(pos_fbk)
-    target_position = current_position + value
+    """block until the axis reports in position, then read where it settled.
 
-    automation1_move_incremental(controller, value)
+    the status is polled every STAGE_STATUS_INTERVAL, the position is only
+    collected once the axis is in position.
 
-    while abs(current_position - target_position) > stage_configuration.STAGE_ACCURACY:
+    Args:
+        controller (automation1.Controller): connected controller
+        target (float | None, optional): commanded position, also has to be within
+            STAGE_ACCURACY. Defaults to None (in position is enough).
+        timeout (float | None, optional): seconds. Defaults to TIMEOUT.
+
+    Returns:
+        list[float, float]: settled position and its uncertainty in degrees.
+    """
+    timeout = stage_configuration.TIMEOUT if timeout is None else timeout
+    t0 = time.monotonic()
+    pos_fbk = None
+
+    while True:
         try:
-            pos_fbk = automation1_read_position(controller)
-            current_position = statistical_methods.mean(pos_fbk)
-            time.sleep(0.5)
+            if automation1_in_position(controller):
+                pos_fbk = automation1_read_position(controller)
+                current_position = statistical_methods.mean(pos_fbk)
+                if (
+                    target is None
+                    or abs(target - current_position)
+                    <= stage_configuration.STAGE_ACCURACY
+                ):
+                    break
+            if time.monotonic() - t0 > timeout:
+                logging.warning(f"Stage did not reach {target} (deg) in {timeout} s")
+                break
+            time.sleep(stage_configuration.STAGE_STATUS_INTERVAL)
         except KeyboardInterrupt:
             break
 
+    if pos_fbk is None:
+        pos_fbk = automation1_read_position(controller)
+    current_position = statistical_methods.mean(pos_fbk)
+
     print(f"Current Motor Position is: {current_position:.6f} (deg)")
-    return statistical_methods.mean(
-        pos_fbk
-    ), statistical_methods.standard_deviation_from_mean(pos_fbk)
+    return current_position, statistical_methods.standard_deviation_from_mean(pos_fbk)
 
 
 def automation1_define_home(controller):
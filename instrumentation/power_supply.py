@@ -29,7 +29,18 @@ def set_power_supply_state(
 
     print(f"Turning Power Supply {state}")
 
-    if state.upper() == "ON":
+    if stage_configuration.POWER_SUPPLY == "KEYSEIGHT":
+        # scpi supply, the levels and output state go in one batch checked once.
+        if state.upper() == "ON":
+            check_supply_calibration_date(supply_port)
+            commands = keysight_commands(
+                1, abs(pwr_pos), abs(pwr_neg), abs(current_pos), abs(current_neg)
+            )
+        else:
+            commands = keysight_commands(0)
+        serial_protocols.serial_write_batch(supply_port, commands)
+
+    elif state.upper() == "ON":
         check_supply_calibration_date(supply_port)
 
         set_voltage_output(
@@ -51,6 +62,38 @@ def set_power_supply_state(
     return
 
 
+def keysight_commands(
+    status: int,
+    pwr_pos: float = None,
+    pwr_neg: float = None,
+    current_pos: float = None,
+    current_neg: float = None,
+) -> list:
+    """build the KEYSEIGHT command list to set both channels and the output state.
+
+    the GW INSTEK and Sorensen are not batched, they read back every setting.
+
+    Args:
+        status (int): 1 to turn the output on, 0 for off
+        pwr_pos (float, optional): channel 1 voltage. Defaults to None (leave as is).
+        pwr_neg (float, optional): channel 2 voltage. Defaults to None (leave as is).
+        current_pos (float, optional): channel 1 current limit. Defaults to None.
+        current_neg (float, optional): channel 2 current limit. Defaults to None.
+
+    Returns:
+        list: commands in order.
+    """
+    levels = [(1, pwr_pos, current_pos), (2, pwr_neg, current_neg)]
+
+    commands = []
+    for chan, volt, curr in levels:
+        if volt is None:
+            continue
+        commands += [f"INST OUT{chan}", f"VOLT {volt}", f"CURR {curr}"]
+    commands.append(f"OUTPUT {'ON' if status == 1 else 'OFF'}")
+    return commands
+
+
 def check_supply_calibration_date(supply_port: serial_protocols.serial_open) -> bool:
     """_summary_
 
@@ -86,7 +129,7 @@ def set_voltage_output(
         serial_protocols.serial_write(supply_port, f"VOUT{chan}?\r")
     elif dev_id == "KEYSEIGHT":
         serial_protocols.serial_write(supply_port, f"INST OUT{chan}\r")
-        serial_protocols.serial_write(supply_port, f"VOLT {chan}\r")
+        serial_protocols.serial_write(supply_port, f"VOLT {val}\r")
     elif dev_id == "SORENSEN":  # SORENSEN, XPF 60-20DP, J00439813, 2.00-4.06
         serial_protocols.serial_write(supply_port, f"V{chan} {val}\r")
         serial_protocols.serial_write(supply_port, f"V{chan}?\r")
@@ -116,7 +159,7 @@ def set_current_limit(
         logging.info(out)
     elif dev_id == "KEYSEIGHT":
         serial_protocols.serial_write(supply_port, f"INST OUT{chan}\r")
-        serial_protocols.serial_write(supply_port, f"CURR {chan}\r")
+        serial_protocols.serial_write(supply_port, f"CURR {val}\r")
     elif dev_id == "SORENSEN":  # SORENSEN, XPF 60-20DP, J00439813, 2.00-4.06
         serial_protocols.serial_write(supply_port, f"I{chan} {val}\r")
         serial_protocols.serial_write(supply_port, f"I{chan}?\r")
@@ -0,0 +1,734 @@
+import argparse
+import array
+import importlib.util
+import logging
+import math
+import os
+import random
+import re
+import socketserver
+import sys
+import threading
+import time
+import types
+from dataclasses import dataclass
+
+
+# stand-in instruments for running the atp and RUBY sequences without hardware.
+# each simulated instrument speaks the command dialect the real one is driven
+# with in this program and is served either over a TCP socket (visa SOCKET and raw
+# socket instruments) or a pseudo terminal (pyserial instruments, posix only, so
+# on windows only the TCP instruments are simulated).
+#
+# start a whole bench and point the stage configuration at it with
+#     bench = simulated_instruments.SimulatedBench()
+#     bench.start()
+#     simulated_instruments.install_simulated_modules(bench)
+#     simulated_instruments.configure_stage_for_simulation(bench)
+# install_simulated_modules has to run before stage_configuration or thermometry
+# are imported. run this module to serve a bench until ctrl-c, or with --run jmx
+# or --run jdx to run that atp against the bench. the atp still gets its part
+# specs and unit ids from the api, only the instruments and the stage
+# configuration are simulated.
+
+HOST = "127.0.0.1"
+
+
+@dataclass
+class NoiseModel:
+    latency: float = 0.002  # seconds before every response
+    jitter: float = 0.001  # seconds, uniform spread added to the latency
+    per_reading: float = 0.0005  # seconds per channel in a scan
+    noise: float = 1e-5  # standard deviation of analog readings (V)
+    angle_noise: float = 1e-4  # standard deviation of digital angle readings (deg)
+    temp_noise: float = 0.01  # standard deviation of temperature readings (C)
+
+    def delay(self, readings: int = 0) -> float:
+        return self.latency + random.uniform(0, self.jitter) + readings * self.per_reading
+
+
+class SimulatedInstrument:
+    """one simulated instrument. subclasses answer commands in respond()."""
+
+    terminator = b"\n"
+
+    def __init__(self, name: str, noise: NoiseModel | None = None) -> None:
+        self.name = name
+        self.noise = noise or NoiseModel()
+        self.address = None  # filled in by the transport serving the instrument
+        self._lock = threading.Lock()
+
+    def commands(self, line: str) -> list:
+        return [line]
+
+    def respond(self, command: str) -> str | bytes | None:
+        return None
+
+    def handle_line(self, line: str) -> bytes | None:
+        """answer one received line.
+
+        Args:
+            line (str): line from the client without its terminator
+
+        Returns:
+            bytes | None: framed response, None if the line had no query.
+        """
+        with self._lock:
+            responses = [self.respond(command.strip()) for command in self.commands(line)]
+        responses = [resp for resp in responses if resp is not None]
+        if not responses:
+            return None
+        if len(responses) == 1 and isinstance(responses[0], bytes):
+            return responses[0] + self.terminator
+        return ";".join(responses).encode() + self.terminator
+
+    def response_delay(self, line: str) -> float:
+        return self.noise.delay()
+
+
+class ScpiInstrument(SimulatedInstrument):
+    idn = "SIMULATED,INSTRUMENT,0,0"
+
+    def commands(self, line: str) -> list:
+        return [command for command in line.split(";") if command.strip()]
+
+    def respond(self, command: str) -> str | bytes | None:
+        header = command.lstrip(":").upper()
+        if header == "*IDN?":
+            return self.idn
+        if header == "*OPC?":
+            return "1"
+        if header in ("*ESR?", "*STB?"):
+            return "0"
+        if header.startswith(("SYST:ERR?", "SYSTEM:ERROR?")):
+            return '0,"No error"'
+        return self.respond_scpi(header, command)
+
+    def respond_scpi(self, header: str, command: str) -> str | bytes | None:
+        return None
+
+
+def parse_channels(command: str) -> list:
+    """channels from a SCPI channel list, i.e. (@101,102) or (@101:108).
+
+    Args:
+        command (str): command containing the channel list
+
+    Returns:
+        list: channel numbers as strings, in order.
+    """
+    match = re.search(r"\(@([^)]*)\)", command)
+    if match is None:
+        return []
+    channels = []
+    for item in match.group(1).split(","):
+        if ":" in item:
+            start, end = item.split(":")
+            channels += [str(chan) for chan in range(int(start), int(end) + 1)]
+        elif item.strip():
+            channels.append(item.strip())
+    return channels
+
+
+class KeithleyDMM(ScpiInstrument):
+    """Keithley 2750 / DAQ6510 scanning DMM.
+
+    covers the scan setup used by data_aq_init, READ? scans with reading/channel
+    output, buffered scans read back with :TRAC:DATA?, and SREAL/DREAL transfers.
+    """
+
+    def __init__(
+        self,
+        name: str = "KEITHLEY",
+        noise: NoiseModel | None = None,
+        idn: str = "KEITHLEY INSTRUMENTS INC.,MODEL 2750,1234567,A13",
+        signal=None,
+    ) -> None:
+        super().__init__(name, noise)
+        self.idn = idn
+        self.signal = signal or (lambda chan, function: 0.0)
+        self.reset()
+
+    def reset(self) -> None:
+        self.functions = {}
+        self.scan = []
+        self.scan_count = 1
+        self.elements = ("READ",)
+        self.data_format = "ASC"
+        self.little_endian = False
+        self.buffer = []
+        self.feed = True
+
+    def reading(self, chan: str) -> float:
+        function = self.functions.get(chan, "VOLT")
+        value = self.signal(chan, function)
+        if function == "TEMP":
+            return value + random.gauss(0, self.noise.temp_noise)
+        return value + random.gauss(0, self.noise.noise)
+
+    def run_scan(self) -> list:
+        return [(self.reading(chan), chan) for chan in self.scan or ["101"]]
+
+    def format_readings(self, readings: list) -> str | bytes:
+        with_chan = "CHAN" in self.elements
+        if self.data_format in ("SREAL", "DREAL"):
+            values = array.array("f" if self.data_format == "SREAL" else "d")
+            for value, chan in readings:
+                values.append(value)
+                if with_chan:
+                    values.append(float(chan))
+            if self.little_endian != (sys.byteorder == "little"):
+                values.byteswap()
+            payload = values.tobytes()
+            length = str(len(payload))
+            return f"#{len(length)}{length}".encode() + payload
+        fields = []
+        for value, chan in readings:
+            fields.append(f"{value:+.9E}")
+            if with_chan:
+                fields.append(chan)
+        return ",".join(fields)
+
+    def respond_scpi(self, header: str, command: str) -> str | bytes | None:
+        if header == "*RST":
+            self.reset()
+        elif header.startswith(("FUNC", "SENS:FUNC")):
+            function = re.search(r"'([^']*)'", command).group(1).upper()
+            function = "RES" if function.startswith("RES") else function.split(":")[0]
+            for chan in parse_channels(command):
+                self.functions[chan] = function
+        elif header.startswith(("ROUT:SCAN:COUN:SCAN", "TRIG:COUN")):
+            self.scan_count = int(header.split()[-1])
+        elif header.startswith(("ROUT:SCAN:CRE", "ROUT:SCAN ", "ROUT:SCAN(")):
+            self.scan = parse_channels(command)
+        elif header.startswith("FORM:ELEM"):
+            self.elements = tuple(
+                element.strip() for element in header.split(None, 1)[1].split(",")
+            )
+        elif header.startswith("FORM:DATA"):
+            self.data_format = header.split()[-1][:5]
+        elif header.startswith("FORM:BORD"):
+            self.little_endian = header.split()[-1].startswith("SWAP")
+        elif header.startswith(("TRAC:CLE", "TRACE:CLEAR")):
+            self.buffer = []
+        elif header.startswith("TRAC:FEED:CONT"):
+            self.feed = not header.split()[-1].startswith("NEV")
+        elif header == "INIT" or header == "INITIATE":
+            for _ in range(self.scan_count):
+                self.buffer += self.run_scan()
+        elif header.startswith(("READ?", "MEAS", "FETC?")):
+            readings = self.run_scan()
+            if self.feed:
+                self.buffer += readings
+            return self.format_readings(readings)
+        elif header.startswith("TRAC:ACT:STAR?"):
+            return "1" if self.buffer else "0"
+        elif header.startswith("TRAC:ACT:END?"):
+            return str(len(self.buffer))
+        elif header.startswith("TRAC:ACT?") or header.startswith("TRAC:POIN:ACT?"):
+            return str(len(self.buffer))
+        elif header.startswith("TRAC:DATA?"):
+            bounds = re.findall(r"\d+", header.split("?", 1)[1].split('"')[0])
+            start, end = (int(bounds[0]), int(bounds[1])) if bounds else (1, len(self.buffer))
+            return self.format_readings(self.buffer[start - 1 : end])
+        elif re.match(r"SYST:CARD\d:SNUM\?", header):
+            return "1234567"
+        return None
+
+    def response_delay(self, line: str) -> float:
+        scans = "READ?" in line.upper() or "INIT" in line.upper()
+        return self.noise.delay(len(self.scan) * self.scan_count if scans else 0)
+
+
+class EnsembleStage(SimulatedInstrument):
+    """Aerotech Ensemble rotary stage, ASCII command interface.
+
+    moves run at the commanded speed in deg/s. commands are acknowledged with "%",
+    queries answer "%<value>", both followed by a newline.
+    """
+
+    def __init__(self, name: str = "ENSEMBLE", noise: NoiseModel | None = None):
+        super().__init__(name, noise)
+        self.start = 0.0
+        self.target = 0.0
+        self.speed = 20.0
+        self.t0 = time.perf_counter()
+
+    def position(self) -> float:
+        travelled = self.speed * (time.perf_counter() - self.t0)
+        delta = self.target - self.start
+        if abs(delta) <= travelled:
+            return self.target
+        return self.start + math.copysign(travelled, delta)
+
+    def in_position(self) -> bool:
+        return self.position() == self.target
+
+    def move_to(self, target: float, speed: float | None = None) -> None:
+        self.start = self.position()
+        self.target = target
+        if speed:
+            self.speed = abs(speed)
+        self.t0 = time.perf_counter()
+
+    def handle_line(self, line: str) -> bytes | None:
+        with self._lock:
+            resp = self.respond(line.strip())
+        if resp is None:
+            return b"%" + self.terminator
+        return f"%{resp}".encode() + self.terminator
+
+    def respond(self, command: str) -> str | None:
+        words = command.upper().replace("(", " ").replace(")", " ").split()
+        if not words:
+            return None
+        if words[0] in ("MOVEABS", "MOVEINC") and len(words) >= 3:
+            target = float(words[2])
+            if words[0] == "MOVEINC":
+                target += self.target
+            speed = float(words[4]) if len(words) >= 5 else None
+            self.move_to(target, speed)
+        elif words[0] == "HOME":
+            self.move_to(0.0)
+        elif words[0] in ("PCMD", "PFBK"):
+            return f"{self.position():.6f}"
+        elif words[0] == "DRIVESTATUS":
+            # Enabled (bit 0), InPosition (bit 25), MoveActive (bit 26).
+            in_position = self.in_position()
+            return str(1 | in_position << 25 | (not in_position) << 26)
+        return None
+
+
+class WatlowF4T(ScpiInstrument):
+    """Watlow F4T chamber controller. the air temperature follows the set point
+    as a first order lag with time constant tau."""
+
+    idn = '"Watlow Electric","F4T1L4EAA1H1AAA",38505,"4.08"'
+
+    def __init__(
+        self,
+        name: str = "WATLOW F4T",
+        noise: NoiseModel | None = None,
+        room_temp: float = 22.5,
+        tau: float = 60.0,
+    ) -> None:
+        super().__init__(name, noise)
+        self.tau = tau
+        self.set_point = room_temp
+        self.start_temp = room_temp
+        self.t0 = time.perf_counter()
+
+    def temperature(self) -> float:
+        elapsed = time.perf_counter() - self.t0
+        return self.set_point + (self.start_temp - self.set_point) * math.exp(
+            -elapsed / self.tau
+        )
+
+    def respond_scpi(self, header: str, command: str) -> str | None:
+        if re.match(r"SOUR(CE)?:CLO(OP)?1:SPO(INT)?\?", header):
+            return f"{self.set_point:.2f}"
+        if re.match(r"SOUR(CE)?:CLO(OP)?1:SPO(INT)? ", header):
+            self.start_temp = self.temperature()
+            self.set_point = float(header.split()[-1])
+            self.t0 = time.perf_counter()
+        elif re.match(r"SOUR(CE)?:CLO(OP)?1:PVAL(UE)?\?", header):
+            return f"{self.temperature() + random.gauss(0, self.noise.temp_noise):.2f}"
+        return None
+
+
+class PowerSupply(ScpiInstrument):
+    """dual channel supply. takes the Sorensen XPF (TTi) commands used by the atp
+    and the APPL/OUTP commands used by the RUBY station."""
+
+    idn = "SORENSEN, XPF 60-20DP, J00439813, 2.00-4.06"
+
+    def __init__(self, name: str = "SORENSEN", noise: NoiseModel | None = None):
+        super().__init__(name, noise)
+        self.voltage = {1: 0.0, 2: 0.0}
+        self.current = {1: 0.0, 2: 0.0}
+        self.output = {1: False, 2: False}
+
+    def respond_scpi(self, header: str, command: str) -> str | None:
+        if header == "EER?":
+            return "0"
+        if match := re.match(r"([VI])(\d)O?\?", header):
+            kind, chan = match.group(1), int(match.group(2))
+            level = self.voltage if kind == "V" else self.current
+            return f"{kind}{chan} {level[chan]:.3f}"
+        if match := re.match(r"([VI])(\d) ([-+.\dE]+)", header):
+            level = self.voltage if match.group(1) == "V" else self.current
+            level[int(match.group(2))] = float(match.group(3))
+        elif match := re.match(r"OP(\d) (\d)", header):
+            self.output[int(match.group(1))] = match.group(2) == "1"
+        elif match := re.match(r"APPL CH(\d),([-+.\dE]+),([-+.\dE]+)", header):
+            chan = int(match.group(1))
+            self.voltage[chan] = float(match.group(2))
+            self.current[chan] = float(match.group(3))
+        elif match := re.match(r"OUTP CH(\d), ?(ON|OFF)", header):
+            self.output[int(match.group(1))] = match.group(2) == "ON"
+        return None
+
+
+class JDxSensor(SimulatedInstrument):
+    """JDx digital inclinometer, ';000,...' protocol. the x output follows the
+    stage angle and the temperature follows the chamber."""
+
+    def __init__(
+        self,
+        name: str = "JDX",
+        noise: NoiseModel | None = None,
+        sensor_type: str = "52",
+        angle=None,
+        temperature=None,
+    ) -> None:
+        super().__init__(name, noise)
+        self.sensor_type = sensor_type
+        self.angle = angle or (lambda: 0.0)
+        self.temperature = temperature or (lambda: 22.5)
+
+    def respond(self, command: str) -> str:
+        fields = command.split(",")
+        if fields[1:3] != ["v", "v"]:
+            return command  # settings are echoed back
+        x = self.angle() + random.gauss(0, self.noise.angle_noise)
+        y = random.gauss(0, self.noise.angle_noise)
+        t = self.temperature() + random.gauss(0, self.noise.temp_noise)
+        if self.sensor_type == "52":
+            return f";000,v,52,{x:+.4f},{y:+.4f},{t:+.2f}"
+        return f";000,v,{self.sensor_type},{x:+.4f},{y:+.4f},{0.0:+.4f},{t:+.2f}"
+
+
+def split_lines(data: bytes) -> tuple[list, bytes]:
+    # commands end with CR, LF or CRLF depending on the instrument driver.
+    *lines, rest = re.split(rb"[\r\n]", data)
+    return [line.decode(errors="replace") for line in lines if line], rest
+
+
+class _LineHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        instrument = self.server.instrument
+        pending = b""
+        while data := self.request.recv(65536):
+            lines, pending = split_lines(pending + data)
+            for line in lines:
+                resp = instrument.handle_line(line)
+                if resp is not None:
+                    time.sleep(instrument.response_delay(line))
+                    self.request.sendall(resp)
+
+
+class _TcpServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class TcpTransport:
+    """serve a simulated instrument on a local TCP port."""
+
+    def __init__(self, instrument: SimulatedInstrument, port: int = 0) -> None:
+        self.instrument = instrument
+        self.server = _TcpServer((HOST, port), _LineHandler)
+        self.server.instrument = instrument
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, name=instrument.name, daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+        logging.info(f"simulated {self.instrument.name} on {HOST}:{self.port}")
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class PtyTransport:
+    """serve a simulated instrument on a pseudo terminal, opened like a COM port."""
+
+    def __init__(self, instrument: SimulatedInstrument) -> None:
+        self.instrument = instrument
+        import tty  # posix only
+
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)  # no echo or line editing, like a real serial line
+        self.path = os.ttyname(self.slave)
+        self._running = False
+        self._thread = threading.Thread(
+            target=self._serve, name=instrument.name, daemon=True
+        )
+
+    def _serve(self) -> None:
+        pending = b""
+        while self._running:
+            try:
+                data = os.read(self.master, 65536)
+            except OSError:
+                break
+            lines, pending = split_lines(pending + data)
+            for line in lines:
+                resp = self.instrument.handle_line(line)
+                if resp is not None:
+                    time.sleep(self.instrument.response_delay(line))
+                    os.write(self.master, resp)
+
+    def start(self) -> None:
+        self._running = True
+        self._thread.start()
+        logging.info(f"simulated {self.instrument.name} on {self.path}")
+
+    def stop(self) -> None:
+        self._running = False
+        os.close(self.slave)
+        os.close(self.master)
+
+
+class SimulatedBench:
+    """a full calibration stand: DAQ, stage, chamber, supply and JDx sensors.
+
+    the DAQ analog channels and the JDx outputs follow the simulated stage angle
+    and chamber temperature, so a calibration run sees a consistent system.
+    """
+
+    def __init__(
+        self,
+        noise: NoiseModel | None = None,
+        jdx_ports: int = 8,
+        ruby_daq_port: int = 0,
+        ruby_supply_port: int = 0,
+    ) -> None:
+        self.noise = noise or NoiseModel()
+        self.stage = EnsembleStage(noise=self.noise)
+        self.chamber = WatlowF4T(noise=self.noise)
+        self.daq = KeithleyDMM(noise=self.noise, signal=self.daq_signal)
+        self.supply = PowerSupply(noise=self.noise)
+        self.ruby_daq = KeithleyDMM(
+            "DAQ6510",
+            self.noise,
+            "KEITHLEY INSTRUMENTS,MODEL DAQ6510,04500000,1.7.12b",
+            self.ruby_signal,
+        )
+        self.ruby_supply = PowerSupply("RUBY SUPPLY", self.noise)
+        self.jdx = [
+            JDxSensor(
+                f"JDX {index + 1}",
+                self.noise,
+                angle=self.stage.position,
+                temperature=self.chamber.temperature,
+            )
+            for index in range(jdx_ports)
+        ]
+
+        self.transports = {
+            "daq": TcpTransport(self.daq),
+            "chamber": TcpTransport(self.chamber),
+            "supply": TcpTransport(self.supply),
+            "ruby_daq": TcpTransport(self.ruby_daq, ruby_daq_port),
+            "ruby_supply": TcpTransport(self.ruby_supply, ruby_supply_port),
+        }
+        if hasattr(os, "openpty"):
+            self.transports["stage"] = PtyTransport(self.stage)
+            for index, sensor in enumerate(self.jdx):
+                self.transports[f"PORT_{index + 1}"] = PtyTransport(sensor)
+        else:
+            logging.warning("no pseudo terminals, the stage and JDx are not simulated")
+
+    def daq_signal(self, chan: str, function: str) -> float:
+        if function == "TEMP":
+            return self.chamber.temperature()
+        # analog ports are wired x, y, t on consecutive channels from 101.
+        output = (int(chan) - 101) % 3
+        if output == 0:
+            return math.sin(math.radians(self.stage.position()))
+        if output == 1:
+            return 0.0
+        return 2.5 + 0.01 * (self.chamber.temperature() - 25.0)  # 10 mV/C
+
+    def ruby_signal(self, chan: str, function: str) -> float:
+        if function == "RES":
+            return 10e3 * (1 + 0.01 * (int(chan) % 10))
+        return {101: 0.0, 106: 15.0, 107: 5.0, 108: -15.0}.get(int(chan), 2.5)
+
+    def address(self, name: str) -> str:
+        """address a program should open an instrument with.
+
+        Args:
+            name (str): key in self.transports, i.e. "daq" or "PORT_1"
+
+        Returns:
+            str: pty path for serial instruments, visa SOCKET resource for TCP ones.
+        """
+        transport = self.transports[name]
+        if isinstance(transport, PtyTransport):
+            return transport.path
+        return f"TCPIP::{HOST}::{transport.port}::SOCKET"
+
+    def start(self) -> None:
+        for transport in self.transports.values():
+            transport.start()
+
+    def stop(self) -> None:
+        for transport in self.transports.values():
+            transport.stop()
+
+
+def configure_stage_for_simulation(bench: SimulatedBench) -> None:
+    """point the stage configuration at a running simulated bench.
+
+    Args:
+        bench (SimulatedBench): started bench
+    """
+    from system import stage_configuration
+
+    if "stage" in bench.transports:
+        stage_configuration.CONTROLLER_TYPE = "Ensemble"
+        stage_configuration.STAGE_PORT = bench.address("stage")
+    stage_configuration.DAQ_IDN = "KEITHLEY"
+    stage_configuration.DAQ_PORT = bench.address("daq")
+    stage_configuration.POWER_SUPPLY = "SORENSEN"
+    stage_configuration.DPS_PORT = bench.address("supply")
+    stage_configuration.CHAMBER_TCP_ADDR = HOST
+    stage_configuration.CHAMBER_TCP_PORT = bench.transports["chamber"].port
+    for mapper in (
+        stage_configuration.SERIAL_PORT_MAPPER_RS232,
+        stage_configuration.SERIAL_PORT_MAPPER_RS422,
+        stage_configuration.SERIAL_PORT_MAPPER_RS485,
+    ):
+        for port in mapper:
+            if port in bench.transports:
+                mapper[port] = bench.address(port)
+
+
+class SimulatedThermocouples:
+    """stand-in for the mcculw ul module. every thermocouple reads the chamber
+    temperature plus noise."""
+
+    def __init__(self, bench: SimulatedBench) -> None:
+        self.bench = bench
+
+    def t_in(self, board_num: int, channel: int, scale: object) -> float:
+        return self.bench.chamber.temperature() + random.gauss(
+            0, self.bench.noise.temp_noise
+        )
+
+    def t_in_scan(
+        self, board_num: int, low_chan: int, high_chan: int, scale: object
+    ) -> list:
+        return [
+            self.t_in(board_num, channel, scale)
+            for channel in range(low_chan, high_chan + 1)
+        ]
+
+
+def simulated_stage_data(bench: SimulatedBench) -> dict:
+    """stage configuration record, as the api would return it, for a bench."""
+    return {
+        "stage_name": "SIMULATED",
+        "stage_type": "Ensemble",
+        "stage_com": bench.address("stage") if "stage" in bench.transports else "",
+        "stage_accuracy": 0.001,
+        "data_aq_com": bench.address("daq"),
+        "chamber_installed": True,
+        "chamber_com": HOST,
+        "supply_com": bench.address("supply"),
+        "supply_type": "SORENSEN",
+    }
+
+
+def install_simulated_modules(bench: SimulatedBench) -> None:
+    """put stand-ins for the hardware and stage api modules in sys.modules.
+
+    mcculw reads the bench's thermocouples. network.api_calls answers the three
+    stage configuration calls made when stage_configuration is imported and
+    passes every other call to the real module.
+
+    Args:
+        bench (SimulatedBench): bench to simulate
+    """
+    thermocouples = SimulatedThermocouples(bench)
+    mcculw = types.ModuleType("mcculw")
+    mcculw.ul = types.ModuleType("mcculw.ul")
+    mcculw.ul.t_in = thermocouples.t_in
+    mcculw.ul.t_in_scan = thermocouples.t_in_scan
+    mcculw.enums = types.ModuleType("mcculw.enums")
+    mcculw.enums.TempScale = types.SimpleNamespace(CELSIUS=0, FAHRENHEIT=1, KELVIN=2)
+    sys.modules.update(
+        {"mcculw": mcculw, "mcculw.ul": mcculw.ul, "mcculw.enums": mcculw.enums}
+    )
+
+    stage_data = simulated_stage_data(bench)
+    api_calls = types.ModuleType("network.api_calls")
+    api_calls.get_stage_name = lambda: stage_data["stage_name"]
+    api_calls.get_stage_configuration = lambda: dict(stage_data)
+    api_calls.get_equipment_on_stage = lambda stage_name: []
+
+    spec = importlib.util.find_spec("network.api_calls")
+    real_api_calls = None
+
+    def real_attribute(name: str) -> object:
+        nonlocal real_api_calls
+        if real_api_calls is None:
+            real_api_calls = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(real_api_calls)
+        return getattr(real_api_calls, name)
+
+    api_calls.__getattr__ = real_attribute
+    sys.modules["network.api_calls"] = api_calls
+
+
+def run_atp(sequence: str, bench: SimulatedBench | None = None) -> None:
+    """run the jmx or jdx atp against a simulated bench.
+
+    only the instruments are simulated. the part specs, test index and unit ids
+    are still fetched from the network API by calibration_setup, and the results
+    are published to it, so the API has to be reachable. the SOCKET resources of
+    the simulated TCP instruments need a visa backend that opens them, NI-VISA or
+    pyvisa-py (see requirements.txt).
+
+    Args:
+        sequence (str): "jmx" or "jdx"
+        bench (SimulatedBench | None, optional): bench to use. Defaults to a new one.
+    """
+    bench = bench or SimulatedBench()
+    bench.start()
+    install_simulated_modules(bench)
+    configure_stage_for_simulation(bench)
+
+    from control import calibration_setup
+    from control import jdx_atp
+    from control import jmx_atp
+    from instrumentation import instrument_config
+
+    atp = {"jmx": jmx_atp.jmx_atp, "jdx": jdx_atp.jdx_atp}[sequence]
+    specs, unit_id_dict, *_ = calibration_setup.calibration_setup()
+    instrumentation = instrument_config.instrumentation_setup()
+    try:
+        atp(specs, unit_id_dict, instrumentation)
+    finally:
+        instrument_config.instrumentation_close_connections(instrumentation)
+        bench.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="serve a simulated test bench")
+    parser.add_argument(
+        "--run",
+        choices=("jmx", "jdx"),
+        help="atp to run on it, specs and unit ids still come from the network API",
+    )
+    args = parser.parse_args()
+
+    bench = SimulatedBench(ruby_daq_port=5025, ruby_supply_port=5555)
+    if args.run:
+        run_atp(args.run, bench)
+        sys.exit()
+
+    bench.start()
+    for name in bench.transports:
+        print(f"{name:12s} {bench.address(name)}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        bench.stop()
@@ -1,11 +1,29 @@
 import sys
+import array
 import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
 
 from mcculw import ul
 from mcculw.enums import TempScale
 
 from analytics import statistical_methods
 
+from system import stage_configuration
+
+
+BOARD_NUM = 0
+PLATE_CHANNELS = (0, 1, 2)
+PILAR_CHANNELS = (3, 4, 5)
+ERROR_TEMP = -999.0
+
+# last block read, (time.monotonic(), temps by channel), shared by all callers.
+_snapshot = None
+# held for every ul call, the module does not take overlapping reads.
+_snapshot_lock = threading.RLock()
+
 
 def read_temp_from_channel(channel: int) -> float:
     """read the temp from a single channel. if that doesn't work, leave temp as -999.
@@ -16,9 +34,10 @@ def read_temp_from_channel(channel: int) -> float:
     Returns:
         float: _description_
     """
-    temp = -999.0
+    temp = ERROR_TEMP
     try:
-        temp = ul.t_in(0, channel, TempScale.CELSIUS)
+        with _snapshot_lock:
+            temp = ul.t_in(BOARD_NUM, channel, TempScale.CELSIUS)
     except Exception as e:
         exc_type, exc_obj, exc_tb = sys.exc_info()
         err = f"Error occurred at {exc_tb.tb_lineno} - {e}"
@@ -27,23 +46,251 @@ def read_temp_from_channel(channel: int) -> float:
     return temp
 
 
-def get_system_temperatures() -> list[float, float]:
+def read_temps_from_channels(low_chan: int = 0, high_chan: int = 5) -> list[float]:
+    """read a block of channels in one call, one channel at a time if that fails.
+
+    Args:
+        low_chan (int, optional): first channel. Defaults to 0.
+        high_chan (int, optional): last channel. Defaults to 5.
+
+    Returns:
+        list[float]: temps from low_chan to high_chan, -999 for failed channels.
+    """
+    with _snapshot_lock:
+        try:
+            return list(
+                ul.t_in_scan(BOARD_NUM, low_chan, high_chan, TempScale.CELSIUS)
+            )
+        except Exception as e:
+            exc_type, exc_obj, exc_tb = sys.exc_info()
+            err = f"Error occurred at {exc_tb.tb_lineno} - {e}"
+            print(err)
+            logging.warning(err)
+        return [
+            read_temp_from_channel(channel)
+            for channel in range(low_chan, high_chan + 1)
+        ]
+
+
+def get_temperature_snapshot(max_age: float | None = None) -> list[float]:
+    """temps of all thermocouple channels, reused while younger than max_age.
+
+    concurrent callers wait for one block read instead of each reading the module.
+
+    Args:
+        max_age (float | None, optional): seconds a snapshot may be reused, 0 for a
+            fresh read. Defaults to None (THERMOMETRY_TTL).
+
+    Returns:
+        list[float]: temps by channel.
+    """
+    global _snapshot
+    if max_age is None:
+        max_age = stage_configuration.THERMOMETRY_TTL
+    if _monitor is not None and max_age > 0:
+        # the monitor keeps a recent sample, no need to wait on the module.
+        sample = _monitor.latest_sample()
+        if sample is not None and time.monotonic() - sample[0] <= max(
+            max_age, 2 * _monitor.period
+        ):
+            return sample[1]
+    with _snapshot_lock:
+        if _snapshot is None or time.monotonic() - _snapshot[0] > max_age:
+            temps = read_temps_from_channels(0, max(PILAR_CHANNELS))
+            _snapshot = (time.monotonic(), temps)
+        return _snapshot[1]
+
+
+def invalidate_snapshot() -> None:
+    """make the next reading a fresh block read."""
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
+
+
+def get_system_temperatures(max_age: float | None = None) -> list[float, float]:
     """Get all the thermometry from Digilent thermometry module.
 
     Args:
+        max_age (float | None, optional): seconds a snapshot may be reused.
+            Defaults to None (THERMOMETRY_TTL).
 
     Returns:
         list: plate temp and pilar temp
     """
-    temp_1 = read_temp_from_channel(0)
-    temp_2 = read_temp_from_channel(1)
-    temp_3 = read_temp_from_channel(2)
-    temp_4 = read_temp_from_channel(3)
-    temp_5 = read_temp_from_channel(4)
-    temp_6 = read_temp_from_channel(5)
+    temps = get_temperature_snapshot(max_age)
 
-    plate_temp = statistical_methods.mean([temp_1, temp_2, temp_3])
+    plate_temp = statistical_methods.mean([temps[chan] for chan in PLATE_CHANNELS])
 
-    pilar_temp = statistical_methods.mean([temp_4, temp_5, temp_6])
+    pilar_temp = statistical_methods.mean([temps[chan] for chan in PILAR_CHANNELS])
 
     return plate_temp, pilar_temp
+
+
+@dataclass(frozen=True)
+class ThermalState:
+    timestamp: float  # time.monotonic() of the last sample
+    plate: float  # EWMA filtered, C
+    pilar: float  # EWMA filtered, C
+    gradient: float  # plate - pilar, C
+    plate_rate: float  # dT/dt of the filtered plate temp, C/min
+    pilar_rate: float  # dT/dt of the filtered pilar temp, C/min
+
+    def stable(
+        self,
+        temp: float,
+        temp_tol: float,
+        max_rate: float = 0.1,
+        max_gradient: float | None = None,
+    ) -> bool:
+        """True if the plate is at temperature and no longer drifting.
+
+        Args:
+            temp (float): target, C
+            temp_tol (float): allowed plate error, C
+            max_rate (float, optional): allowed plate and pilar drift, C/min.
+                Defaults to 0.1.
+            max_gradient (float | None, optional): allowed plate to pilar
+                difference, C. Defaults to None (not checked).
+
+        Returns:
+            bool: soak done.
+        """
+        if abs(self.plate - temp) > temp_tol:
+            return False
+        if max(abs(self.plate_rate), abs(self.pilar_rate)) > max_rate:
+            return False
+        return max_gradient is None or abs(self.gradient) <= max_gradient
+
+
+class ThermalMonitor:
+    """sample every thermocouple at a fixed rate on a background thread.
+
+    keeps a ring of raw samples and publishes an EWMA filtered ThermalState,
+    readers get the latest values without waiting on the module.
+    """
+
+    def __init__(
+        self,
+        period: float | None = None,
+        tau: float | None = None,
+        history: int | None = None,
+    ) -> None:
+        self.period = period or stage_configuration.THERMAL_MONITOR_PERIOD
+        self.tau = tau or stage_configuration.THERMAL_MONITOR_TAU
+        self.history = history or stage_configuration.THERMAL_MONITOR_HISTORY
+        self.channels = max(PILAR_CHANNELS) + 1
+        self.times = array.array("d", bytes(8 * self.history))
+        self.temps = array.array("d", bytes(8 * self.history * self.channels))
+        self.count = 0
+        self.state = None
+        self._sample = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="thermal-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def latest(self) -> ThermalState | None:
+        """filtered temps, gradient and rates of the last sample."""
+        return self.state
+
+    def latest_sample(self) -> tuple[float, list] | None:
+        """(time.monotonic(), temps by channel) of the last sample."""
+        return self._sample
+
+    def samples(self, seconds: float) -> list[tuple[float, list]]:
+        """raw samples of the last `seconds`, oldest first."""
+        since = time.monotonic() - seconds
+        found = []
+        for n in range(self.count - 1, max(self.count - self.history, 0) - 1, -1):
+            slot = n % self.history
+            if self.times[slot] < since:
+                break
+            found.append(
+                (
+                    self.times[slot],
+                    list(self.temps[slot * self.channels : (slot + 1) * self.channels]),
+                )
+            )
+        found.reverse()
+        return found
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            started = time.monotonic()
+            temps = read_temps_from_channels(0, self.channels - 1)
+            self.add(time.monotonic(), temps)
+            self._stop.wait(max(0.0, self.period - (time.monotonic() - started)))
+
+    def add(self, timestamp: float, temps: list) -> None:
+        if ERROR_TEMP in temps:
+            # a channel failed to read, keep the last good sample and state.
+            return
+        slot = self.count % self.history
+        self.times[slot] = timestamp
+        self.temps[slot * self.channels : (slot + 1) * self.channels] = array.array(
+            "d", temps
+        )
+        self.count += 1
+        self._sample = (timestamp, list(temps))
+
+        plate = statistical_methods.mean([temps[chan] for chan in PLATE_CHANNELS])
+        pilar = statistical_methods.mean([temps[chan] for chan in PILAR_CHANNELS])
+        state = self.state
+        if state is None:
+            self.state = ThermalState(timestamp, plate, pilar, plate - pilar, 0.0, 0.0)
+            return
+
+        dt = timestamp - state.timestamp
+        if dt <= 0:
+            return
+        alpha = 1 - math.exp(-dt / self.tau)
+        plate_f = state.plate + alpha * (plate - state.plate)
+        pilar_f = state.pilar + alpha * (pilar - state.pilar)
+        # rates of the filtered temps, filtered again so one noisy sample does
+        # not swing them.
+        plate_rate = 60 * (plate_f - state.plate) / dt
+        pilar_rate = 60 * (pilar_f - state.pilar) / dt
+        self.state = ThermalState(
+            timestamp,
+            plate_f,
+            pilar_f,
+            plate_f - pilar_f,
+            state.plate_rate + alpha * (plate_rate - state.plate_rate),
+            state.pilar_rate + alpha * (pilar_rate - state.pilar_rate),
+        )
+
+
+_monitor = None
+
+
+def start_thermal_monitor() -> ThermalMonitor:
+    """start the background monitor, once per session."""
+    global _monitor
+    if _monitor is None:
+        _monitor = ThermalMonitor()
+        _monitor.start()
+    return _monitor
+
+
+def stop_thermal_monitor() -> None:
+    global _monitor
+    if _monitor is not None:
+        _monitor.stop()
+        _monitor = None
+
+
+def get_thermal_state() -> ThermalState | None:
+    """latest filtered thermal state, None if the monitor is not running."""
+    return _monitor.latest() if _monitor is not None else None
@@ -1,10 +1,134 @@
 import datetime
+import logging
+import sys
+import threading
+import time
 
 from network import api_calls
 
 from system import stage_configuration
 
 
+# the stage's asset list, downloaded once per session and indexed by
+# (manufacturer, serial number). it is reloaded when it is older than the TTL or
+# when one of its due dates has passed.
+
+ASSET_CACHE_TTL = 3600  # seconds
+
+
+class AssetCache:
+    """asset records of one location, indexed by (manufacturer, serial number)."""
+
+    def __init__(self, location: str, ttl: float = ASSET_CACHE_TTL) -> None:
+        self.location = location
+        self.ttl = ttl
+        self.records = {}
+        self.by_manufacturer = {}
+        self.loaded_at = None
+        self.next_due = None  # first due date still ahead when loaded
+        self._lock = threading.Lock()
+        self._prefill = None
+
+    def expired(self) -> bool:
+        if self.loaded_at is None:
+            return True
+        if time.monotonic() - self.loaded_at > self.ttl:
+            return True
+        return self.next_due is not None and datetime.datetime.today() > self.next_due
+
+    def load(self) -> None:
+        """download the asset list and rebuild the index."""
+        assets = api_calls.get_assets_by_location(self.location)
+        today = datetime.datetime.today()
+        records = {}
+        by_manufacturer = {}
+        next_due = None
+        for record in assets:
+            key = (record["manufacturer"], record["serial_number"])
+            records.setdefault(key, record)
+            by_manufacturer.setdefault(record["manufacturer"], record)
+            try:
+                due = datetime.datetime.strptime(record["due_date"], "%Y-%m-%d")
+            except (TypeError, ValueError):
+                continue
+            if due >= today and (next_due is None or due < next_due):
+                next_due = due
+        with self._lock:
+            self.records = records
+            self.by_manufacturer = by_manufacturer
+            self.next_due = next_due
+            self.loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.loaded_at = None
+
+    def prefill(self) -> threading.Thread:
+        """load in the background, lookups wait for it instead of downloading again.
+
+        Returns:
+            threading.Thread: the loader thread.
+        """
+        self._prefill = threading.Thread(
+            target=self._load_quietly, name="asset-cache", daemon=True
+        )
+        self._prefill.start()
+        return self._prefill
+
+    def _load_quietly(self) -> None:
+        try:
+            self.load()
+        except Exception as e:
+            *_, exc_tb = sys.exc_info()
+            logging.warning(f"\t{e} -> Line {exc_tb.tb_lineno}")
+
+    def lookup(self, manufacturer: str, serial_no: str) -> dict | None:
+        """asset record of an instrument, loading the list if it is stale.
+
+        Args:
+            manufacturer (str): i.e. KEITHLEY
+            serial_no (str): instrument serial number
+
+        Returns:
+            dict | None: the asset record, None if the stage has no such asset.
+        """
+        prefill = self._prefill
+        if prefill is not None:
+            prefill.join()
+            self._prefill = None
+        if self.expired():
+            self.load()
+        if manufacturer == "KEYSIGHT":
+            return self.by_manufacturer.get(manufacturer)
+        return self.records.get((manufacturer, serial_no))
+
+
+_cache = None
+
+
+def asset_cache() -> AssetCache:
+    """the session's asset cache for this stage."""
+    global _cache
+    location = stage_configuration.__STAGE_NAME__
+    if _cache is None or _cache.location != location:
+        _cache = AssetCache(location)
+    return _cache
+
+
+def prefill_asset_cache() -> threading.Thread:
+    """start downloading the stage's asset list, i.e. while instruments connect.
+
+    Returns:
+        threading.Thread: the loader thread.
+    """
+    return asset_cache().prefill()
+
+
+def invalidate_asset_cache() -> None:
+    """download the asset list again on the next check, i.e. after a recalibration."""
+    asset_cache().invalidate()
+
+
 def check_asset_calibration_data(string: str) -> bool:
     # sourcery skip: use-datetime-now-not-today
 
@@ -26,20 +150,8 @@ def check_asset_calibration_data(string: str) -> bool:
         print("\033[91mInstrument not recognized.\033[00m")
         return 0
 
-    asset_found = False
-
-    assets = api_calls.get_assets_by_location(stage_configuration.__STAGE_NAME__)
-
-    for record in assets:
-        if manufacturer == "KEYSIGHT":
-            serial_match = True
-        else:
-            serial_match = record["serial_number"] == serial_no
-        manufacturer_match = record["manufacturer"] == manufacturer
-
-        if serial_match and manufacturer_match:
-            asset_found = True
-            break
+    record = asset_cache().lookup(manufacturer, serial_no)
+    asset_found = record is not None
 
     if asset_found is True:
         asset_due_date = datetime.datetime.strptime(record["due_date"], "%Y-%m-%d")
@@ -0,0 +1,167 @@
+import asyncio
+import atexit
+import concurrent.futures
+import functools
+import threading
+import weakref
+from typing import Any, Awaitable, Callable
+
+from system import serial_protocols
+
+
+# asyncio front end for the blocking serial, visa and socket protocols. each call
+# runs on the instrument i/o thread pool so different instruments are awaited
+# concurrently, while calls on the same port are kept in order by a per-port lock.
+
+MAX_WORKERS = 16
+
+_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=MAX_WORKERS, thread_name_prefix="instrument_io"
+)
+
+# asyncio locks belong to one event loop, so keep a lock table per loop.
+_port_locks = weakref.WeakKeyDictionary()
+
+
+def _port_lock(port: object) -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    locks = _port_locks.setdefault(loop, weakref.WeakKeyDictionary())
+    try:
+        lock = locks.get(port)
+        if lock is None:
+            lock = locks[port] = asyncio.Lock()
+    except TypeError:
+        # port can not be weak referenced, calls on it are not ordered.
+        lock = asyncio.Lock()
+    return lock
+
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """run a blocking instrument call on the i/o thread pool.
+
+    Args:
+        func (Callable): blocking function, i.e. motor_control.get_position_from_stage
+
+    Returns:
+        Any: whatever func returns.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executor, functools.partial(func, *args, **kwargs)
+    )
+
+
+async def run_on_port(port: object, func: Callable, *args, **kwargs) -> Any:
+    """run a blocking call that talks to one port, in order with other calls on it.
+
+    Args:
+        port (object): open connection the call talks to
+        func (Callable): blocking function taking the port as its first argument
+
+    Returns:
+        Any: whatever func returns.
+    """
+    async with _port_lock(port):
+        return await run_blocking(func, port, *args, **kwargs)
+
+
+async def serial_write(port: object, text: str, use_visa: bool = True) -> None:
+    await run_on_port(port, serial_protocols.serial_write, text, use_visa=use_visa)
+
+
+async def serial_read(port: object, use_visa: bool = True) -> Any:
+    return await run_on_port(port, serial_protocols.serial_read, use_visa=use_visa)
+
+
+async def serial_write_read(port: object, text: str, use_visa: bool = True) -> Any:
+    """awaitable serial_protocols.serial_write_read.
+
+    Args:
+        port (object): connection to instrument
+        text (str): data packet to send to instrument
+        use_visa (bool, optional): use the pyvisa module. Defaults to True.
+
+    Returns:
+        Any: data returned from instrument
+    """
+    return await run_on_port(
+        port, serial_protocols.serial_write_read, text, use_visa=use_visa
+    )
+
+
+async def socket_write(device: object, packet: str) -> None:
+    await run_on_port(device, serial_protocols.socket_write, packet)
+
+
+async def socket_read(device: object) -> str:
+    return await run_on_port(device, serial_protocols.socket_read)
+
+
+async def socket_write_read(device: object, packet: str) -> str:
+    """write a query over a socket and read the response as one ordered exchange.
+
+    Args:
+        device (object): open socket connection to instrument
+        packet (str): query to send to instrument
+
+    Returns:
+        str: data returned from instrument.
+    """
+
+    def exchange(device: object, packet: str) -> str:
+        with serial_protocols.exchange_lock(device):
+            serial_protocols.socket_write(device, packet)
+            return serial_protocols.socket_read(device)
+
+    return await run_on_port(device, exchange, packet)
+
+
+async def gather(**calls: Awaitable) -> dict:
+    """await several instrument calls at once.
+
+    Returns:
+        dict: results keyed by the keyword each call was passed under.
+    """
+    results = await asyncio.gather(*calls.values())
+    return dict(zip(calls.keys(), results))
+
+
+# one event loop per calling thread, kept for the session. asyncio.run would make
+# and tear down a loop (and its port locks) for every reading.
+_local = threading.local()
+_runners = []
+_runners_lock = threading.Lock()
+
+
+def _runner() -> asyncio.Runner:
+    runner = getattr(_local, "runner", None)
+    if runner is None:
+        runner = _local.runner = asyncio.Runner()
+        with _runners_lock:
+            _runners.append(runner)
+    return runner
+
+
+def run(coroutine: Awaitable) -> Any:
+    """run a coroutine from blocking code, i.e. inside a calibration loop.
+
+    Args:
+        coroutine (Awaitable): coroutine to run to completion
+
+    Returns:
+        Any: whatever the coroutine returns.
+    """
+    return _runner().run(coroutine)
+
+
+def close() -> None:
+    """close the event loops run has made."""
+    with _runners_lock:
+        runners = _runners[:]
+        _runners.clear()
+    for runner in runners:
+        runner.close()
+    _local.__dict__.pop("runner", None)
+
+
+atexit.register(close)
@@ -0,0 +1,115 @@
+import logging
+import time
+import weakref
+from dataclasses import dataclass
+
+
+# per-instrument command pacing. replaces the blind sleep after every write with
+# either an *OPC?/status byte handshake or a minimum gap between commands that is
+# learned from how the instrument responds. the gap only shrinks after a handshake
+# or a clear error queue, missing or empty responses grow it.
+
+COMPLETION_NONE = "none"  # rely on the learned gap only
+COMPLETION_OPC = "opc"  # query *OPC? and wait for the "1"
+COMPLETION_STB = "stb"  # send *OPC and serial poll the ESB bit (VISA/GPIB only)
+
+ESB_BIT = 0x20  # event summary bit of the status byte
+
+LEGACY_GAP = 0.125  # seconds, sleep used before pacing profiles existed
+
+
+@dataclass
+class PacingProfile:
+    name: str
+    min_gap: float = LEGACY_GAP  # starting gap between commands in seconds
+    floor: float = 0.0  # smallest gap the pacer is allowed to learn down to
+    ceiling: float = 0.5  # largest gap the pacer will back off to
+    completion: str = COMPLETION_NONE
+    opc_commands: tuple = ()  # command prefixes that are followed by a handshake
+    opc_timeout: float = 10.0  # seconds to wait for a handshake to complete
+    shrink: float = 0.9  # gap multiplier after a confirmed exchange
+    grow: float = 2.0  # gap multiplier after a missing/bad response
+
+
+class CommandPacer:
+    def __init__(self, profile: PacingProfile) -> None:
+        self.profile = profile
+        self.gap = profile.min_gap
+        self.last_io = 0.0
+
+    def wait_for_gap(self) -> None:
+        """sleep only for whatever is left of the learned gap since the last command."""
+        remaining = self.last_io + self.gap - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def mark_io(self) -> None:
+        self.last_io = time.perf_counter()
+
+    def needs_completion(self, text: str) -> bool:
+        """check if a command must be followed by an operation complete handshake.
+
+        Args:
+            text (str): command that was just written
+
+        Returns:
+            bool: True if the profile asks for a handshake after this command.
+        """
+        if self.profile.completion == COMPLETION_NONE:
+            return False
+        command = text.strip().upper()
+        return any(command.startswith(prefix) for prefix in self.profile.opc_commands)
+
+    def learn(self, success: bool) -> None:
+        """tighten the gap after a confirmed exchange, back off after a bad one.
+
+        only pass success=True when the instrument confirmed it took every command,
+        i.e. *OPC? returned 1 or the error queue was clear. a read that merely
+        returned something says nothing about the commands before it.
+
+        Args:
+            success (bool): whether the instrument answered as expected.
+        """
+        if success:
+            self.gap = max(self.profile.floor, self.gap * self.profile.shrink)
+        else:
+            self.gap = min(
+                self.profile.ceiling, max(self.gap, 0.01) * self.profile.grow
+            )
+            logging.debug(f"{self.profile.name}: backing off to {self.gap:.3f} s")
+
+
+_pacers = weakref.WeakKeyDictionary()
+
+
+def set_pacing_profile(port: object, profile: PacingProfile) -> CommandPacer:
+    """attach a pacing profile to an open instrument connection.
+
+    Args:
+        port (object): open serial, visa or socket connection
+        profile (PacingProfile): pacing settings for the instrument
+
+    Returns:
+        CommandPacer: pacer used for every write/read on this connection.
+    """
+    pacer = CommandPacer(profile)
+    try:
+        _pacers[port] = pacer
+    except TypeError:
+        logging.warning(f"{profile.name}: connection does not support pacing.")
+    return pacer
+
+
+def get_pacer(port: object) -> CommandPacer | None:
+    """get the pacer for a connection. None means use the legacy fixed sleep.
+
+    Args:
+        port (object): open serial, visa or socket connection
+
+    Returns:
+        CommandPacer | None: pacer attached to the connection.
+    """
+    try:
+        return _pacers.get(port)
+    except TypeError:
+        return None
@@ -0,0 +1,248 @@
+import atexit
+import logging
+import select
+import socket
+import sys
+import threading
+from typing import Callable
+
+from system import io_trace
+from system import serial_protocols
+from system import socket_reader
+
+
+# process wide registry of instrument connections. one live session is kept per
+# resource address and handed out as a shared, lock protected handle. the handle
+# checks the session before reuse and reconnects when the instrument dropped it.
+
+CONNECT_ATTEMPTS = 3
+
+
+def device_alive(device: object) -> bool:
+    """check if an open serial, visa or socket session is still usable.
+
+    Args:
+        device (object): open connection to instrument
+
+    Returns:
+        bool: True if the session can be reused.
+    """
+    device = io_trace.unwrap(device)
+    try:
+        if isinstance(device, socket.socket):
+            if device.fileno() == -1:
+                return False
+            readable, *_ = select.select([device], [], [], 0)
+            # a readable socket with nothing to peek at was closed by the instrument.
+            return not readable or device.recv(1, socket.MSG_PEEK) != b""
+        if hasattr(device, "is_open"):
+            return bool(device.is_open)
+        return device.session is not None
+    except Exception:
+        return False
+
+
+class PooledConnection:
+    """shared handle to one instrument session.
+
+    attribute access is forwarded to the live session so the handle can be passed
+    anywhere a port object is expected. attributes set on the handle, i.e. a
+    timeout, are set on the session and again on every reconnect. use the handle
+    as a context manager to hold the lock across a write/read exchange.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        opener: Callable[[], object],
+        on_connect: Callable[[object], None] | None = None,
+    ) -> None:
+        self._key = key
+        self._opener = opener
+        self._on_connect = on_connect
+        self._device = None
+        self._attributes = {}  # set on every new session
+        self.exchange_lock = threading.RLock()
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    def connect(self) -> object:
+        """open a new session, closing the old one if there is one.
+
+        Returns:
+            object: the new session.
+        """
+        with self.exchange_lock:
+            self._drop()
+            error = None
+            for _ in range(CONNECT_ATTEMPTS):
+                try:
+                    self._device = self._opener()
+                    break
+                except Exception as e:
+                    error = e
+                    logging.warning(f"{self._key}: connect failed - {e}")
+            else:
+                raise ConnectionError(f"could not connect to {self._key}") from error
+
+            logging.info(f"{self._key}: connected")
+            socket_reader.reset_reader(self)
+            if self._on_connect is not None:
+                self._on_connect(self._device)
+            for name, value in self._attributes.items():
+                setattr(self._device, name, value)
+            return self._device
+
+    def acquire(self) -> object:
+        """get the live session, reconnecting if the health check fails.
+
+        Returns:
+            object: open connection to instrument.
+        """
+        with self.exchange_lock:
+            if self._device is None or not device_alive(self._device):
+                return self.connect()
+            return self._device
+
+    def close(self) -> None:
+        """close the underlying session. the handle stays registered and opens a
+        new session the next time it is used."""
+        with self.exchange_lock:
+            self._drop()
+
+    def _drop(self) -> None:
+        if self._device is None:
+            return
+        try:
+            self._device.close()
+        except Exception as e:
+            *_, exc_tb = sys.exc_info()
+            logging.warning(f"\t{e} -> Line {exc_tb.tb_lineno}")
+        self._device = None
+
+    def __enter__(self) -> object:
+        self.exchange_lock.acquire()
+        try:
+            return self.acquire()
+        except Exception:
+            self.exchange_lock.release()
+            raise
+
+    def __exit__(self, *args) -> None:
+        self.exchange_lock.release()
+
+    def __setattr__(self, name: str, value) -> None:
+        if name.startswith("_") or name == "exchange_lock":
+            object.__setattr__(self, name, value)
+            return
+        with self.exchange_lock:
+            self._attributes[name] = value
+            setattr(self.acquire(), name, value)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.acquire(), name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            with self.exchange_lock:
+                try:
+                    return getattr(self.acquire(), name)(*args, **kwargs)
+                except TimeoutError:
+                    raise
+                except OSError as e:
+                    # the session died under us, reconnect once and retry.
+                    logging.warning(f"{self._key}: {e}, reconnecting")
+                    return getattr(self.connect(), name)(*args, **kwargs)
+
+        return call
+
+
+_pool = {}
+_pool_lock = threading.Lock()
+
+
+def get_connection(
+    key: str,
+    opener: Callable[[], object],
+    on_connect: Callable[[object], None] | None = None,
+) -> PooledConnection:
+    """get the shared handle for a resource address, creating it on first use.
+
+    Args:
+        key (str): resource address the session is registered under
+        opener (Callable[[], object]): opens a new session to the instrument
+        on_connect (Callable[[object], None] | None, optional): run once per new
+            session, i.e. a reset or timeout setup. Defaults to None.
+
+    Returns:
+        PooledConnection: shared handle, already connected.
+    """
+    with _pool_lock:
+        handle = _pool.get(key)
+        if handle is None:
+            handle = PooledConnection(key, opener, on_connect)
+            _pool[key] = handle
+    handle.acquire()
+    return handle
+
+
+def serial_connection(
+    port: str,
+    PortBaud: int = 9600,
+    on_connect: Callable[[object], None] | None = None,
+    **kwargs,
+) -> PooledConnection:
+    """shared handle for a serial/visa instrument. see serial_protocols.serial_open.
+
+    Args:
+        port (str): COMxx, GPIB0::xx::INSTR, or ip address
+        PortBaud (int, optional): only used with pyserial. Defaults to 9600.
+        on_connect (Callable[[object], None] | None, optional): run once per new
+            session. Defaults to None.
+
+    Returns:
+        PooledConnection: shared handle to the instrument.
+    """
+    return get_connection(
+        port,
+        lambda: serial_protocols.serial_open(port, PortBaud, **kwargs),
+        on_connect,
+    )
+
+
+def socket_connection(
+    ip_address: str,
+    port: int,
+    on_connect: Callable[[object], None] | None = None,
+) -> PooledConnection:
+    """shared handle for a raw socket instrument. see serial_protocols.socket_open.
+
+    Args:
+        ip_address (str): static ip address of instrument
+        port (int): port for socket connection
+        on_connect (Callable[[object], None] | None, optional): run once per new
+            session. Defaults to None.
+
+    Returns:
+        PooledConnection: shared handle to the instrument.
+    """
+    return get_connection(
+        f"TCPIP::{ip_address}::{port}::SOCKET",
+        lambda: serial_protocols.socket_open(ip_address, port),
+        on_connect,
+    )
+
+
+def close_all() -> None:
+    """close every pooled session."""
+    with _pool_lock:
+        handles = list(_pool.values())
+        _pool.clear()
+    for handle in handles:
+        handle.close()
+
+
+atexit.register(close_all)
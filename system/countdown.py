@@ -1,15 +1,22 @@
 import time
 
 
-def countdown(time_sec: float) -> None:
+def countdown(time_sec: float, until=None) -> bool:
     """display a countdown timer in the form of HH:MM:SS.
 
     Args:
         time_sec (float): time in seconds.
+        until (callable, optional): checked every second, the countdown ends
+            early once it returns True. Defaults to None.
+
+    Returns:
+        bool: True if it ended early on until.
     """
 
-    while time_sec:
+    while time_sec > 0:
         try:
+            if until is not None and until():
+                return True
             mins, secs = divmod(time_sec, 60)
             hours, mins = divmod(mins, 60)
             timer = f"{int(hours):02d}:{int(mins):02d}:{int(secs):02d}"
@@ -18,3 +25,4 @@ def countdown(time_sec: float) -> None:
             time_sec -= 1
         except KeyboardInterrupt:
             break
+    return False
@@ -0,0 +1,315 @@
+import bisect
+import contextlib
+import functools
+import json
+import logging
+import re
+import socket
+import threading
+import weakref
+
+
+# latency histograms for every instrument exchange, keyed by instrument, operation
+# (write, read or query) and command mnemonic. buckets are fixed and preallocated,
+# so recording a call is a bisect and a few integer adds. a query is recorded once,
+# the write and read it is made of are not recorded on their own (see exchange).
+
+ENABLED = True
+
+# 4 log spaced buckets per decade from 10 us to 100 s, plus an overflow bucket.
+BUCKET_BOUNDS = tuple(10 ** (exponent / 4) for exponent in range(-20, 9))
+
+OP_WRITE = "write"
+OP_READ = "read"
+OP_QUERY = "query"
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "count", "total", "minimum", "maximum")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.minimum:
+            self.minimum = seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """upper bound of the bucket holding the requested fraction of calls.
+
+        Args:
+            fraction (float): 0.5 for the median, 0.95, 0.99...
+
+        Returns:
+            float: latency in seconds.
+        """
+        if self.count == 0:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                if index == len(BUCKET_BOUNDS):
+                    return self.maximum
+                return min(BUCKET_BOUNDS[index], self.maximum)
+        return self.maximum
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class _PortState:
+    __slots__ = ("instrument", "last_command", "histograms", "__weakref__")
+
+    def __init__(self, instrument: str) -> None:
+        self.instrument = instrument
+        self.last_command = "?"
+        self.histograms = {OP_WRITE: {}, OP_READ: {}, OP_QUERY: {}}
+
+    def histogram(self, op: str, name: str) -> LatencyHistogram:
+        """histogram of one command on this connection, found once per command."""
+        histogram = self.histograms[op].get(name)
+        if histogram is None:
+            key = (self.instrument, op, name)
+            with _lock:
+                histogram = _histograms.get(key)
+                if histogram is None:
+                    histogram = _histograms[key] = LatencyHistogram()
+            self.histograms[op][name] = histogram
+        return histogram
+
+    def forget(self) -> None:
+        for histograms in self.histograms.values():
+            histograms.clear()
+
+
+_histograms = {}
+_ports = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+_local = threading.local()
+
+
+@contextlib.contextmanager
+def exchange():
+    """time a write and its read as one query. writes and reads inside the block
+    are not recorded, so the report does not count the exchange twice."""
+    depth = getattr(_local, "depth", 0)
+    _local.depth = depth + 1
+    try:
+        yield
+    finally:
+        _local.depth = depth
+
+
+def instrument_address(port: object) -> str:
+    """readable address of a connection, i.e. COM5 or 192.168.1.10:5025.
+
+    Args:
+        port (object): open serial, visa or socket connection, or pooled handle
+
+    Returns:
+        str: address the connection talks to.
+    """
+    for attribute in ("key", "instrument", "resource_name", "port"):
+        try:
+            value = getattr(port, attribute, None)
+        except Exception:
+            value = None
+        if isinstance(value, str) and value:
+            return value
+    if isinstance(port, socket.socket):
+        try:
+            host, number = port.getpeername()[:2]
+            return f"{host}:{number}"
+        except (OSError, ValueError):
+            pass
+    return type(port).__name__
+
+
+def _port_state(port: object) -> _PortState:
+    try:
+        state = _ports.get(port)
+        if state is None:
+            state = _ports[port] = _PortState(instrument_address(port))
+    except TypeError:
+        state = _PortState(instrument_address(port))
+    return state
+
+
+def instrument_name(port: object) -> str:
+    """name a connection is reported under, i.e. KEITHLEY 2750 (COM5).
+
+    Args:
+        port (object): open connection or pooled handle
+
+    Returns:
+        str: instrument name.
+    """
+    return _port_state(port).instrument
+
+
+def set_instrument_name(port: object, name: str) -> None:
+    """label a connection in the report, i.e. with its pacing profile name.
+
+    Args:
+        port (object): open connection or pooled handle
+        name (str): instrument name
+    """
+    state = _port_state(port)
+    address = instrument_address(port)
+    state.instrument = f"{name} ({address})" if address != name else name
+    state.forget()
+
+
+@functools.lru_cache(maxsize=1024)
+def mnemonic(text) -> str:
+    """command header used to group latencies, without its arguments.
+
+    MOVEABS X 10 XF 20 -> MOVEABS, :TRAC:DATA? 1, 9 -> TRAC:DATA?,
+    ;000,d,25 -> ;000,d and a ';' joined SCPI batch -> BATCH.
+
+    Args:
+        text (str | bytes): command as written to the instrument
+
+    Returns:
+        str: mnemonic.
+    """
+    if isinstance(text, (bytes, bytearray)):
+        text = bytes(text).decode("utf-8", errors="replace")
+    text = text.strip()
+    if text.startswith(";"):
+        # jdx protocol, keep the letter fields and drop the values.
+        fields = text.split(",")
+        keep = [fields[0]]
+        for field in fields[1:]:
+            if not re.fullmatch(r"[A-Za-z|!<>-]+", field):
+                break
+            keep.append(field)
+        return ",".join(keep)
+    if ";" in text:
+        return "BATCH"
+    header = text.split(None, 1)[0] if text else ""
+    return header.lstrip(":").upper()
+
+
+def record(port: object, op: str, command, seconds: float) -> None:
+    """add one timed call to its histogram.
+
+    Args:
+        port (object): connection the call was made on
+        op (str): OP_WRITE, OP_READ or OP_QUERY
+        command (str | bytes | None): command written, None for a read, which
+            is filed under the last command written on the port
+        seconds (float): time the call took
+    """
+    if not ENABLED:
+        return
+    if op != OP_QUERY and getattr(_local, "depth", 0):
+        return
+    state = _port_state(port)
+    if command is None:
+        name = state.last_command
+    else:
+        name = mnemonic(command)
+        state.last_command = name
+    # calls on one connection do not overlap (see serial_protocols.exchange_lock),
+    # so the add needs no lock.
+    state.histogram(op, name).add(seconds)
+
+
+def reset() -> None:
+    with _lock:
+        _histograms.clear()
+        for state in list(_ports.values()):
+            state.forget()
+
+
+def snapshot() -> dict:
+    """copy of the histograms, keyed by (instrument, op, mnemonic)."""
+    with _lock:
+        return dict(_histograms)
+
+
+def report(top: int | None = 25) -> str:
+    """table of where the instrument i/o time went, largest total first.
+
+    Args:
+        top (int | None, optional): rows to show, None for all. Defaults to 25.
+
+    Returns:
+        str: report text.
+    """
+    rows = sorted(snapshot().items(), key=lambda item: item[1].total, reverse=True)
+    grand_total = sum(histogram.total for _, histogram in rows) or 1.0
+
+    lines = [
+        f"{'instrument':32s} {'op':5s} {'command':16s} {'count':>8s} {'total s':>9s} "
+        f"{'share':>6s} {'mean ms':>8s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} "
+        f"{'max ms':>8s}"
+    ]
+    for (instrument, op, name), histogram in rows[:top]:
+        lines.append(
+            f"{instrument[:32]:32s} {op:5s} {name[:16]:16s} {histogram.count:8d} "
+            f"{histogram.total:9.2f} {histogram.total / grand_total:6.1%} "
+            f"{1e3 * histogram.mean():8.2f} {1e3 * histogram.percentile(0.5):8.2f} "
+            f"{1e3 * histogram.percentile(0.95):8.2f} "
+            f"{1e3 * histogram.percentile(0.99):8.2f} {1e3 * histogram.maximum:8.2f}"
+        )
+
+    per_instrument = {}
+    for (instrument, *_), histogram in rows:
+        per_instrument[instrument] = per_instrument.get(instrument, 0.0) + histogram.total
+    lines.append("")
+    for instrument, total in sorted(
+        per_instrument.items(), key=lambda item: item[1], reverse=True
+    ):
+        lines.append(f"{instrument[:32]:32s} {total:9.2f} s {total / grand_total:6.1%}")
+    lines.append("")
+    lines.append(
+        "write and query times include the pacing gap before the write and any "
+        "completion wait after it."
+    )
+    return "\n".join(lines)
+
+
+def dump(path: str) -> None:
+    """write the histograms as json for later analysis.
+
+    Args:
+        path (str): file to write
+    """
+    data = {
+        "bucket_bounds": list(BUCKET_BOUNDS),
+        "histograms": [
+            {
+                "instrument": instrument,
+                "op": op,
+                "command": name,
+                "count": histogram.count,
+                "total": histogram.total,
+                "min": histogram.minimum if histogram.count else 0.0,
+                "max": histogram.maximum,
+                "counts": histogram.counts,
+            }
+            for (instrument, op, name), histogram in snapshot().items()
+        ],
+    }
+    with open(path, "w") as file:
+        json.dump(data, file, indent=1)
+
+
+def log_report() -> None:
+    """log the report at the end of a run, if anything was recorded. called by
+    log_queue.stop_queue_logging, while the log writer is still running."""
+    if _histograms:
+        logging.info("instrument i/o latency\n" + report())
@@ -0,0 +1,473 @@
+import array
+import atexit
+import collections
+import difflib
+import logging
+import os
+import socket
+import struct
+import threading
+import time
+from dataclasses import dataclass
+
+
+# instrument i/o trace recorder and replay backend. while recording, every
+# connection opened through serial_protocols is wrapped so each write and read is
+# logged with a timestamp and the instrument it went to. a recorded trace can be
+# served back by replay devices so a full atp run can be reproduced offline with
+# the production command stream and, optionally, the instrument response timing.
+#
+# set IO_TRACE_RECORD or IO_TRACE_REPLAY to a trace file path to turn either mode
+# on for a whole run, or call start_recording/start_replay.
+
+TRACE_MAGIC = b"IOTRACE\x01"
+RECORD_HEADER = struct.Struct("<dHBI")  # seconds, instrument, op, payload length
+
+OP_NAME = 0  # payload is the instrument id registered under the index
+OP_WRITE = 1  # command sent to the instrument
+OP_READ = 2  # response received from the instrument
+OP_STB = 3  # status byte from a visa serial poll
+OP_VALUES = 4  # binary values, stored as doubles
+TEXT_FLAG = 0x80  # payload was a str, not bytes
+
+_OP_NAMES = {OP_WRITE: "W", OP_READ: "R", OP_STB: "S", OP_VALUES: "V"}
+
+
+@dataclass
+class TraceEvent:
+    time: float  # seconds since recording started
+    instrument: str
+    op: int
+    payload: bytes | str
+
+    def __str__(self) -> str:
+        payload = self.payload
+        if isinstance(payload, str):
+            payload = payload.rstrip()
+        return f"{self.time:12.6f} {self.instrument} {_OP_NAMES[self.op]} {payload!r}"
+
+
+def _encode(payload) -> tuple[int, bytes]:
+    if isinstance(payload, str):
+        return TEXT_FLAG, payload.encode("utf-8")
+    return 0, bytes(payload)
+
+
+class TraceRecorder:
+    """append only binary log of instrument traffic, shared by every connection."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, "wb")
+        self._file.write(TRACE_MAGIC)
+        self._lock = threading.Lock()
+        self._instruments = {}
+        self._t0 = time.perf_counter()
+
+    def _instrument_index(self, instrument: str) -> int:
+        index = self._instruments.get(instrument)
+        if index is None:
+            index = self._instruments[instrument] = len(self._instruments)
+            self._write_record(index, OP_NAME, instrument)
+        return index
+
+    def _write_record(self, index: int, op: int, payload) -> None:
+        flag, data = _encode(payload)
+        t = time.perf_counter() - self._t0
+        self._file.write(RECORD_HEADER.pack(t, index, op | flag, len(data)))
+        self._file.write(data)
+
+    def record(self, instrument: str, op: int, payload) -> None:
+        """log one write or read.
+
+        Args:
+            instrument (str): id the connection was opened with, i.e. COM5
+            op (int): OP_WRITE, OP_READ, OP_STB or OP_VALUES
+            payload (bytes | str): data as it was passed to or returned by the device
+        """
+        with self._lock:
+            if self._file.closed:
+                return
+            self._write_record(self._instrument_index(instrument), op, payload)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def read_trace(path: str) -> list:
+    """load a trace file.
+
+    Args:
+        path (str): trace file written by a TraceRecorder
+
+    Returns:
+        list: TraceEvent for every write and read, in the order they happened.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    if not data.startswith(TRACE_MAGIC):
+        raise ValueError(f"{path} is not an instrument i/o trace")
+
+    events = []
+    instruments = {}
+    offset = len(TRACE_MAGIC)
+    while offset + RECORD_HEADER.size <= len(data):
+        t, index, op, length = RECORD_HEADER.unpack_from(data, offset)
+        offset += RECORD_HEADER.size
+        payload = data[offset : offset + length]
+        offset += length
+        if op & TEXT_FLAG:
+            payload = payload.decode("utf-8")
+        op &= ~TEXT_FLAG
+        if op == OP_NAME:
+            instruments[index] = payload
+        else:
+            events.append(TraceEvent(t, instruments[index], op, payload))
+    return events
+
+
+def command_stream(path: str, instrument: str | None = None) -> list:
+    """commands written during a recorded run, i.e. to compare software versions.
+
+    Args:
+        path (str): trace file
+        instrument (str | None, optional): only this instrument. Defaults to None.
+
+    Returns:
+        list: "instrument: command" lines in the order they were sent.
+    """
+    lines = []
+    for event in read_trace(path):
+        if event.op != OP_WRITE:
+            continue
+        if instrument is not None and event.instrument != instrument:
+            continue
+        payload = event.payload
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8", errors="replace")
+        lines.append(f"{event.instrument}: {payload.rstrip()}")
+    return lines
+
+
+def diff_commands(path_a: str, path_b: str, instrument: str | None = None) -> list:
+    """unified diff of the command streams of two recorded runs.
+
+    Args:
+        path_a (str): trace from the reference run
+        path_b (str): trace from the run to compare
+        instrument (str | None, optional): only this instrument. Defaults to None.
+
+    Returns:
+        list: diff lines, empty if both runs sent the same commands.
+    """
+    return list(
+        difflib.unified_diff(
+            command_stream(path_a, instrument),
+            command_stream(path_b, instrument),
+            fromfile=path_a,
+            tofile=path_b,
+            lineterm="",
+        )
+    )
+
+
+class TracedDevice:
+    """wraps an open serial, visa or socket connection and records its traffic.
+
+    everything not intercepted here is forwarded to the real connection.
+    """
+
+    def __init__(self, device: object, instrument: str, recorder: TraceRecorder):
+        object.__setattr__(self, "_device", device)
+        object.__setattr__(self, "_instrument", instrument)
+        object.__setattr__(self, "_recorder", recorder)
+
+    @property
+    def traced_device(self) -> object:
+        return self._device
+
+    def _record(self, op: int, payload) -> None:
+        self._recorder.record(self._instrument, op, payload)
+
+    def write(self, data, *args, **kwargs):
+        self._record(OP_WRITE, data)
+        return self._device.write(data, *args, **kwargs)
+
+    def send(self, data, *args):
+        sent = self._device.send(data, *args)
+        self._record(OP_WRITE, data[:sent])
+        return sent
+
+    def sendall(self, data, *args):
+        self._record(OP_WRITE, data)
+        return self._device.sendall(data, *args)
+
+    def read(self, *args, **kwargs):
+        data = self._device.read(*args, **kwargs)
+        self._record(OP_READ, data)
+        return data
+
+    def readline(self, *args, **kwargs):
+        data = self._device.readline(*args, **kwargs)
+        self._record(OP_READ, data)
+        return data
+
+    def read_until(self, *args, **kwargs):
+        data = self._device.read_until(*args, **kwargs)
+        self._record(OP_READ, data)
+        return data
+
+    def query(self, message: str, *args, **kwargs):
+        self._record(OP_WRITE, message)
+        data = self._device.query(message, *args, **kwargs)
+        self._record(OP_READ, data)
+        return data
+
+    def read_stb(self) -> int:
+        stb = self._device.read_stb()
+        self._record(OP_STB, str(stb))
+        return stb
+
+    def read_binary_values(self, *args, **kwargs):
+        values = self._device.read_binary_values(*args, **kwargs)
+        self._record(OP_VALUES, array.array("d", values).tobytes())
+        return values
+
+    def recv(self, *args):
+        data = self._device.recv(*args)
+        self._record(OP_READ, data)
+        return data
+
+    def recv_into(self, buffer, *args):
+        received = self._device.recv_into(buffer, *args)
+        self._record(OP_READ, memoryview(buffer)[:received])
+        return received
+
+    def __getattr__(self, name: str):
+        return getattr(self._device, name)
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(self._device, name, value)
+
+
+class ReplayDevice:
+    """stands in for one instrument connection, serving its recorded responses.
+
+    writes are checked against the recorded command stream, and a mismatch is
+    logged rather than raised so a changed run can still be followed to the end.
+    """
+
+    def __init__(
+        self, instrument: str, events: list, realtime: bool = False
+    ) -> None:
+        self.instrument = instrument
+        self.realtime = realtime
+        self.timeout = None
+        self.is_open = True
+        self.mismatches = 0
+        self._writes = collections.deque()
+        self._reads = collections.deque()
+        self._pending = b""
+        self._last_write = time.perf_counter()
+        self._lock = threading.RLock()
+
+        # each response waits as long after the preceding command as it did live.
+        last_write_time = 0.0
+        for event in events:
+            if event.op == OP_WRITE:
+                last_write_time = event.time
+                self._writes.append(event.payload)
+            else:
+                latency = max(0.0, event.time - last_write_time)
+                self._reads.append((event.op, event.payload, latency))
+
+    # --- commands ---------------------------------------------------------------
+
+    def _check_write(self, data) -> None:
+        with self._lock:
+            self._last_write = time.perf_counter()
+            expected = self._writes.popleft() if self._writes else None
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        if expected != data:
+            self.mismatches += 1
+            logging.warning(
+                f"replay {self.instrument}: sent {data!r}, recorded {expected!r}"
+            )
+
+    def write(self, data, *args, **kwargs):
+        self._check_write(data)
+        return len(data)
+
+    def send(self, data, *args):
+        self._check_write(data)
+        return len(data)
+
+    def sendall(self, data, *args):
+        self._check_write(data)
+
+    # --- responses --------------------------------------------------------------
+
+    def _next_read(self, op: int = OP_READ):
+        with self._lock:
+            if not self._reads:
+                raise socket.timeout(f"replay {self.instrument}: no recorded response")
+            recorded_op, payload, latency = self._reads.popleft()
+            last_write = self._last_write
+        if recorded_op != op:
+            self.mismatches += 1
+            logging.warning(f"replay {self.instrument}: read out of recorded order")
+        if self.realtime:
+            remaining = last_write + latency - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+        return payload
+
+    def read(self, *args, **kwargs):
+        return self._next_read()
+
+    def readline(self, *args, **kwargs):
+        return self._next_read()
+
+    def read_until(self, *args, **kwargs):
+        return self._next_read()
+
+    def query(self, message: str, *args, **kwargs):
+        self._check_write(message)
+        return self._next_read()
+
+    def read_stb(self) -> int:
+        return int(self._next_read(OP_STB))
+
+    def read_binary_values(self, *args, container=list, **kwargs):
+        return container(array.array("d", self._next_read(OP_VALUES)))
+
+    def recv_into(self, buffer, nbytes: int = 0, *args) -> int:
+        with self._lock:
+            if not self._pending:
+                self._pending = bytes(self._next_read())
+            size = min(nbytes or len(buffer), len(buffer), len(self._pending))
+            memoryview(buffer)[:size] = self._pending[:size]
+            self._pending = self._pending[size:]
+        return size
+
+    def recv(self, bufsize: int, *args) -> bytes:
+        buffer = bytearray(bufsize)
+        return bytes(buffer[: self.recv_into(buffer)])
+
+    # --- connection housekeeping -------------------------------------------------
+
+    def isOpen(self) -> bool:
+        return self.is_open
+
+    def close(self) -> None:
+        self.is_open = False
+
+    def settimeout(self, timeout) -> None:
+        self.timeout = timeout
+
+    def flushInput(self) -> None:
+        return
+
+    def flushOutput(self) -> None:
+        return
+
+
+_recorder = None
+_replay = None  # instrument -> events
+_replay_realtime = False
+
+
+def start_recording(path: str) -> TraceRecorder:
+    """record the traffic of every connection opened from now on.
+
+    Args:
+        path (str): trace file to write
+
+    Returns:
+        TraceRecorder: the active recorder.
+    """
+    global _recorder
+    stop_recording()
+    _recorder = TraceRecorder(path)
+    logging.info(f"recording instrument i/o to {path}")
+    return _recorder
+
+
+def stop_recording() -> None:
+    global _recorder
+    if _recorder is not None:
+        _recorder.close()
+        _recorder = None
+
+
+def start_replay(path: str, realtime: bool = False) -> None:
+    """serve connections opened from now on from a recorded trace.
+
+    Args:
+        path (str): trace file to replay
+        realtime (bool, optional): wait the recorded response time before each
+            read, for benchmarking against production timing. Defaults to False.
+    """
+    global _replay, _replay_realtime
+    _replay = collections.defaultdict(list)
+    for event in read_trace(path):
+        _replay[event.instrument].append(event)
+    _replay_realtime = realtime
+    logging.info(f"replaying instrument i/o from {path}")
+
+
+def stop_replay() -> None:
+    global _replay
+    _replay = None
+
+
+def replaying() -> bool:
+    return _replay is not None
+
+
+def replay_device(instrument: str) -> ReplayDevice:
+    """replay connection for an instrument, in place of opening the real one.
+
+    Args:
+        instrument (str): id the connection is opened with, i.e. COM5
+
+    Returns:
+        ReplayDevice: connection serving the recorded responses.
+    """
+    return ReplayDevice(instrument, _replay.get(instrument, []), _replay_realtime)
+
+
+def trace(device: object, instrument: str) -> object:
+    """wrap a newly opened connection if recording is on.
+
+    Args:
+        device (object): open serial, visa or socket connection
+        instrument (str): id the connection was opened with, i.e. COM5
+
+    Returns:
+        object: the connection, wrapped in a TracedDevice while recording.
+    """
+    if _recorder is None:
+        return device
+    return TracedDevice(device, instrument, _recorder)
+
+
+def unwrap(device: object) -> object:
+    """the real connection behind a TracedDevice, or the device itself."""
+    if isinstance(device, TracedDevice):
+        return device.traced_device
+    return device
+
+
+if os.environ.get("IO_TRACE_REPLAY"):
+    start_replay(
+        os.environ["IO_TRACE_REPLAY"],
+        realtime=os.environ.get("IO_TRACE_REALTIME", "") == "1",
+    )
+elif os.environ.get("IO_TRACE_RECORD"):
+    start_recording(os.environ["IO_TRACE_RECORD"])
+
+atexit.register(stop_recording)
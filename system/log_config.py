@@ -5,6 +5,7 @@ import datetime
 
 from network import filesystem
 
+from system import log_queue
 from system import settings
 
 
@@ -21,6 +22,12 @@ def configure_logging(log_file_path: str) -> None:
 
     _log_format = "%(asctime)s (%(filename)s).%(funcName)s(%(lineno)d) - %(message)s"
 
-    logging.basicConfig(filename=log_file, level=settings.LOG_LEVEL, format=_log_format)
+    log_queue.configure_queue_logging(
+        log_file,
+        level=settings.LOG_LEVEL,
+        log_format=_log_format,
+        queue_size=settings.LOG_QUEUE_SIZE,
+        sample_every=settings.COMMAND_LOG_SAMPLING,
+    )
 
     logging.getLogger(__name__).addHandler(logging.StreamHandler(sys.stdout))
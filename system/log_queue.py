@@ -0,0 +1,154 @@
+import atexit
+import collections
+import logging
+import logging.handlers
+import queue
+import threading
+
+from system import io_metrics
+
+
+# non-blocking logging. callers only put records on a bounded ring buffer, a
+# background listener thread does the formatting and the file writes. when the
+# buffer is full the oldest records are dropped, so logging never blocks i/o.
+#
+# instrument commands are logged on the "instrument_io" logger, which can sample
+# or suppress repeats of the same command per instrument.
+
+IO_LOGGER = "instrument_io"
+QUEUE_SIZE = 10000  # records held before the oldest are dropped
+
+
+class RingQueue(queue.Queue):
+    """queue that never blocks a put. a full queue drops its oldest item."""
+
+    def __init__(self, capacity: int = QUEUE_SIZE) -> None:
+        self.capacity = capacity
+        self.dropped = 0
+        super().__init__()
+
+    def _init(self, maxsize: int) -> None:
+        self.queue = collections.deque(maxlen=self.capacity)
+
+    def _put(self, item) -> None:
+        if len(self.queue) == self.capacity:
+            self.dropped += 1
+        self.queue.append(item)
+
+
+class CommandLogSampler(logging.Filter):
+    """log the first of a run of identical commands to an instrument and then
+    only every Nth one. N is looked up by instrument name prefix, 0 suppresses
+    the command logs of that instrument entirely.
+
+    records need `instrument` and `command` attributes (pass them in extra=).
+    """
+
+    def __init__(self, sample_every: dict | None = None, default: int = 1) -> None:
+        super().__init__()
+        self.sample_every = sample_every or {}
+        self.default = default
+        self._every = {}
+        self._runs = {}  # instrument -> [command, repeats so far]
+        self._lock = threading.Lock()
+
+    def every(self, instrument: str) -> int:
+        every = self._every.get(instrument)
+        if every is None:
+            every = self.default
+            for prefix, value in self.sample_every.items():
+                if instrument.startswith(prefix):
+                    every = value
+                    break
+            self._every[instrument] = every
+        return every
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        instrument = getattr(record, "instrument", None)
+        if instrument is None:
+            return True
+        every = self.every(instrument)
+        if every == 1:
+            return True
+        if every == 0:
+            return False
+        command = getattr(record, "command", record.msg)
+        with self._lock:
+            run = self._runs.get(instrument)
+            if run is None or run[0] != command:
+                # a different command ends the run, the next one is logged
+                run = self._runs[instrument] = [command, 0]
+            run[1] += 1
+            count = run[1]
+        if count % every != 1:
+            return False
+        if count > 1:
+            record.msg = f"{record.msg} (x{count})"
+        return True
+
+
+_listener = None
+
+
+def configure_queue_logging(
+    filename: str,
+    level: int = logging.DEBUG,
+    log_format: str = "%(asctime)s (%(filename)s).%(funcName)s(%(lineno)d) - %(message)s",
+    queue_size: int = QUEUE_SIZE,
+    sample_every: dict | None = None,
+) -> logging.handlers.QueueListener:
+    """send the root logger through a ring buffer to a background file writer.
+
+    like logging.basicConfig, nothing is changed if the root logger already has
+    handlers.
+
+    Args:
+        filename (str): log file to write
+        level (int, optional): root logger level. Defaults to logging.DEBUG.
+        log_format (str, optional): record format.
+        queue_size (int, optional): records buffered before the oldest are dropped.
+            Defaults to QUEUE_SIZE.
+        sample_every (dict | None, optional): instrument name prefix -> log every
+            Nth repeat of a command, 0 to suppress. Defaults to None (log all).
+
+    Returns:
+        logging.handlers.QueueListener: the running listener.
+    """
+    global _listener
+    root = logging.getLogger()
+    if root.handlers:
+        return _listener
+
+    file_handler = logging.FileHandler(filename)
+    file_handler.setFormatter(logging.Formatter(log_format))
+
+    log_queue = RingQueue(queue_size)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+
+    io_logger = logging.getLogger(IO_LOGGER)
+    io_logger.addFilter(CommandLogSampler(sample_every))
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, file_handler, respect_handler_level=True
+    )
+    _listener.start()
+    return _listener
+
+
+def stop_queue_logging() -> None:
+    """log the i/o latency report, flush what is buffered and stop the writer
+    thread. runs at exit."""
+    global _listener
+    io_metrics.log_report()
+    if _listener is None:
+        return
+    if _listener.queue.dropped:
+        logging.getLogger(__name__).warning(
+            f"{_listener.queue.dropped} log records were dropped"
+        )
+    _listener.stop()
+    _listener = None
+
+
+atexit.register(stop_queue_logging)
@@ -1,4 +1,7 @@
 import sys
+import array
+import contextlib
+import functools
 import logging
 import socket
 import time
@@ -10,6 +13,59 @@ import pyvisa
 import minimalmodbus
 from typing import Union
 
+from system import command_pacing
+from system import io_metrics
+from system import io_trace
+from system import log_queue
+from system import socket_reader
+
+
+_resource_manager = None
+
+_io_log = logging.getLogger(log_queue.IO_LOGGER)
+
+
+def log_command(port: object, text: str, level: int = logging.INFO) -> None:
+    """log a command on the instrument i/o logger, where repeats can be sampled.
+
+    Args:
+        port (object): connection the command is written to
+        text (str): command
+        level (int, optional): log level. Defaults to logging.INFO.
+    """
+    if _io_log.isEnabledFor(level):
+        instrument = io_metrics.instrument_name(port)
+        _io_log.log(
+            level,
+            f"{instrument}: {text.rstrip()}",
+            extra={"instrument": instrument, "command": text},
+            stacklevel=2,
+        )
+
+
+def get_resource_manager() -> pyvisa.ResourceManager:
+    """get the process wide pyvisa resource manager, creating it on first use.
+
+    Returns:
+        pyvisa.ResourceManager: shared resource manager.
+    """
+    global _resource_manager
+    if _resource_manager is None:
+        _resource_manager = pyvisa.ResourceManager()
+    return _resource_manager
+
+
+def exchange_lock(port: object) -> contextlib.AbstractContextManager:
+    """lock that keeps a write/read exchange together on a shared connection.
+
+    Args:
+        port (object): open connection or pooled handle
+
+    Returns:
+        contextlib.AbstractContextManager: the handle's lock, or a no-op for plain ports.
+    """
+    return getattr(port, "exchange_lock", None) or contextlib.nullcontext()
+
 
 def is_port_open(port):
     try:
@@ -50,14 +106,23 @@ def serial_open(
         device.serial.timeout = 10
         device.mode = minimalmodbus.MODE_RTU
 
+    elif io_trace.replaying():
+        device = io_trace.replay_device(port)
     else:
         if use_visa is True:
-            rm = pyvisa.ResourceManager()
-            port = f"TCPIP::{port}::INSTR"
-            if "COM" in port:
-                com_id = port[3:]
-                port = f"ASRL{com_id}::INSTR"
-            device = rm.open_resource(port)
+            rm = get_resource_manager()
+            if "::" in port:
+                resource = port  # full resource name, i.e. TCPIP::host::5025::SOCKET
+            else:
+                resource = f"TCPIP::{port}::INSTR"
+                if "COM" in resource:
+                    com_id = resource[3:]
+                    resource = f"ASRL{com_id}::INSTR"
+            device = rm.open_resource(resource)
+            if resource.endswith("::SOCKET"):
+                # raw sockets have no end of message signal, frame on newlines.
+                device.read_termination = "\n"
+                device.write_termination = "\n"
         else:
             device = serial.Serial(
                 port=port,
@@ -67,6 +132,7 @@ def serial_open(
                 stopbits=1,
                 timeout=5,
             )
+        device = io_trace.trace(device, port)
 
     return device
 
@@ -99,6 +165,9 @@ def serial_read(
     # SerialPort_FlushInput(port)
     resp = None
 
+    pacer = command_pacing.get_pacer(port)
+    t0 = time.perf_counter()
+
     try:
         if use_visa is True:
             resp = port.read().rstrip()
@@ -109,6 +178,11 @@ def serial_read(
         *_, exc_tb = sys.exc_info()
         logging.warning(f"\t{e} -> Line {exc_tb.tb_lineno}")
     # print(resp)
+    io_metrics.record(port, io_metrics.OP_READ, None, time.perf_counter() - t0)
+    if pacer is not None:
+        pacer.mark_io()
+        if not resp:
+            pacer.learn(False)
     return resp
 
 
@@ -127,13 +201,63 @@ def serial_write(
     # SerialPort_FlushInput(port)
     # print("{} - {}".format(port.port, text))
     # print(text)
-    logging.info(text)
+    log_command(port, text)
+    t0 = time.perf_counter()
+    pacer = command_pacing.get_pacer(port)
+    if pacer is not None:
+        pacer.wait_for_gap()
     if use_visa is True:
         # print(text)
         port.write(text.rstrip())
     else:
         port.write(text.encode())
-    time.sleep(0.125)
+    if pacer is None:
+        time.sleep(command_pacing.LEGACY_GAP)
+    else:
+        pacer.mark_io()
+        if pacer.needs_completion(text):
+            wait_for_operation_complete(port, pacer, use_visa=use_visa)
+    io_metrics.record(port, io_metrics.OP_WRITE, text, time.perf_counter() - t0)
+
+
+def wait_for_operation_complete(
+    port: Union[serial_open, pyvisa.ResourceManager.open_resource],
+    pacer: command_pacing.CommandPacer,
+    use_visa: bool = True,
+) -> bool:
+    """block until the instrument reports all pending operations are complete.
+
+    Args:
+        port (Union[serial_open, pyvisa.ResourceManager.open_resource]): connection to instrument
+        pacer (command_pacing.CommandPacer): pacer attached to the connection
+        use_visa (bool, optional): use the pyvisa module. Defaults to True.
+
+    Returns:
+        bool: True if the instrument reported completion before the timeout.
+    """
+    complete = False
+    t0 = time.perf_counter()
+    try:
+        if pacer.profile.completion == command_pacing.COMPLETION_STB and use_visa:
+            port.write("*ESE 1;*OPC")
+            while time.perf_counter() - t0 < pacer.profile.opc_timeout:
+                if port.read_stb() & command_pacing.ESB_BIT:
+                    complete = True
+                    break
+                time.sleep(0.005)
+            port.query("*ESR?")  # clear the event status register
+        elif use_visa is True:
+            complete = port.query("*OPC?").strip() == "1"
+        else:
+            port.write("*OPC?\r".encode())
+            complete = port.readline().decode("utf-8").strip() == "1"
+    except Exception as e:
+        *_, exc_tb = sys.exc_info()
+        logging.warning(f"\t{e} -> Line {exc_tb.tb_lineno}")
+
+    pacer.mark_io()
+    pacer.learn(complete)
+    return complete
 
 
 def serial_write_read(
@@ -151,8 +275,247 @@ def serial_write_read(
     Returns:
         _type_: _description_
     """
-    serial_write(port, text, use_visa=use_visa)
-    return serial_read(port, use_visa=use_visa)
+    t0 = time.perf_counter()
+    with exchange_lock(port), io_metrics.exchange():
+        serial_write(port, text, use_visa=use_visa)
+        resp = serial_read(port, use_visa=use_visa)
+    io_metrics.record(port, io_metrics.OP_QUERY, text, time.perf_counter() - t0)
+    return resp
+
+
+BATCH_MAX_LENGTH = 1024  # characters per batched transfer
+
+
+def pack_commands(
+    commands: list, scpi: bool = True, max_length: int = BATCH_MAX_LENGTH
+) -> list:
+    """join commands into as few ';' separated packets as possible.
+
+    SCPI headers after a ';' are relative to the previous command's path, so each
+    non-common command is anchored to the root with a leading ':'.
+
+    Args:
+        commands (list): commands to send, terminators are stripped.
+        scpi (bool, optional): anchor each command to the SCPI root. Defaults to True.
+        max_length (int, optional): longest packet to send. Defaults to BATCH_MAX_LENGTH.
+
+    Returns:
+        list: packets to write, without terminators.
+    """
+    packets = []
+    packet = ""
+    for command in commands:
+        command = command.strip()
+        if not command:
+            continue
+        if scpi and not command.startswith((":", "*")):
+            command = f":{command}"
+        if packet and len(packet) + len(command) + 1 > max_length:
+            packets.append(packet)
+            packet = ""
+        packet = f"{packet};{command}" if packet else command
+    if packet:
+        packets.append(packet)
+    return packets
+
+
+def error_code(response: str) -> int:
+    """get the numeric code from an error query response, i.e. '0,"No error"'.
+
+    Args:
+        response (str): raw response from the error query
+
+    Returns:
+        int: error code, -1 if the response could not be parsed.
+    """
+    try:
+        return int(response.strip().split(",")[0])
+    except (AttributeError, ValueError):
+        return -1
+
+
+def read_error_queue(
+    port: Union[serial_open, pyvisa.ResourceManager.open_resource],
+    error_query: str = "SYST:ERR?",
+    use_visa: bool = True,
+    max_errors: int = 20,
+) -> list:
+    """drain the instrument error queue.
+
+    Args:
+        port (Union[serial_open, pyvisa.ResourceManager.open_resource]): connection to instrument
+        error_query (str, optional): query that pops one error. Defaults to "SYST:ERR?".
+        use_visa (bool, optional): use the pyvisa module. Defaults to True.
+        max_errors (int, optional): stop after this many errors. Defaults to 20.
+
+    Returns:
+        list: error strings, empty if the queue was clear.
+    """
+    errors = []
+    for _ in range(max_errors):
+        resp = serial_write_read(port, f"{error_query}\r", use_visa=use_visa)
+        if error_code(resp) == 0:
+            _confirm_pacing(port, errors)
+            break
+        errors.append(str(resp).strip())
+        if resp is None:
+            break
+    return errors
+
+
+def _confirm_pacing(port: object, errors: list) -> None:
+    # a clear error queue confirms every command before it was taken at the
+    # current gap, the only time the pacer is allowed to tighten it.
+    pacer = command_pacing.get_pacer(port)
+    if pacer is not None and not errors:
+        pacer.learn(True)
+
+
+def serial_write_batch(
+    port: Union[serial_open, pyvisa.ResourceManager.open_resource],
+    commands: list,
+    use_visa: bool = True,
+    error_query: str | None = "SYST:ERR?",
+    scpi: bool = True,
+) -> list:
+    """write many commands as one ';' joined transfer and check errors once.
+
+    Args:
+        port (Union[serial_open, pyvisa.ResourceManager.open_resource]): connection to instrument
+        commands (list): commands to send in order
+        use_visa (bool, optional): use the pyvisa module. Defaults to True.
+        error_query (str | None, optional): error query to run after the batch,
+            None to skip the check. Defaults to "SYST:ERR?".
+        scpi (bool, optional): anchor each command to the SCPI root. Defaults to True.
+
+    Returns:
+        list: errors reported by the instrument after the batch.
+    """
+    for packet in pack_commands(commands, scpi=scpi):
+        serial_write(port, f"{packet}\r", use_visa=use_visa)
+
+    if error_query is None:
+        return []
+
+    errors = read_error_queue(port, error_query, use_visa=use_visa)
+    for err in errors:
+        logging.warning(f"Batched command error: {err}")
+    return errors
+
+
+# binary reading formats, SCPI name -> array typecode. ASCII is the *RST default.
+BINARY_FORMATS = {"SREAL": "f", "DREAL": "d"}
+
+
+def binary_format_commands(data_format: str = "SREAL") -> list:
+    """commands that switch reading transfers to a binary format.
+
+    readings are sent little endian (FORM:BORD SWAP) so they can be used in place
+    on the PC without swapping bytes.
+
+    Args:
+        data_format (str, optional): ASCII, SREAL or DREAL. Defaults to "SREAL".
+
+    Returns:
+        list: commands to add to the instrument configuration.
+    """
+    if data_format not in BINARY_FORMATS:
+        return ["FORM:DATA ASC"]
+    return [f"FORM:DATA {data_format}", "FORM:BORD SWAP"]
+
+
+def decode_binary(
+    payload: Union[bytes, memoryview], data_format: str = "SREAL"
+) -> Union[memoryview, array.array]:
+    """decode a little endian binary block into floats without parsing text.
+
+    on a little endian PC the result is a float view onto the payload itself.
+
+    Args:
+        payload (Union[bytes, memoryview]): block payload, header removed
+        data_format (str, optional): SREAL or DREAL. Defaults to "SREAL".
+
+    Returns:
+        Union[memoryview, array.array]: readings, use tolist() for a list of floats.
+    """
+    typecode = BINARY_FORMATS[data_format]
+    payload = memoryview(payload).cast("B")
+    size = array.array(typecode).itemsize
+    payload = payload[: len(payload) - len(payload) % size]
+    if sys.byteorder == "little":
+        return payload.cast(typecode)
+    values = array.array(typecode, payload)
+    values.byteswap()
+    return values
+
+
+def read_binary_block(
+    port: serial.Serial, size: int = 4, data_points: int | None = None
+) -> bytes:
+    """read an IEEE 488.2 block from a pyserial port.
+
+    Args:
+        port (serial.Serial): open pyserial connection
+        size (int, optional): bytes per reading. Defaults to 4.
+        data_points (int | None, optional): readings in an indefinite length (#0)
+            block. Defaults to None.
+
+    Returns:
+        bytes: block payload.
+    """
+    header = port.read(2)
+    if header[:1] != b"#":
+        raise ValueError(f"response is not an IEEE 488.2 block: {header}")
+    digits = header[1] - ord("0")
+    if digits:
+        length = int(port.read(digits))
+    elif data_points is not None:
+        length = data_points * size
+    else:
+        return port.readline().rstrip(b"\r\n")
+    payload = port.read(length)
+    port.readline()  # terminator
+    return payload
+
+
+def serial_query_binary(
+    port: Union[serial_open, pyvisa.ResourceManager.open_resource],
+    text: str,
+    data_format: str = "SREAL",
+    data_points: int | None = None,
+    use_visa: bool = True,
+) -> Union[memoryview, array.array]:
+    """send a reading query and decode the binary block it returns.
+
+    Args:
+        port (Union[serial_open, pyvisa.ResourceManager.open_resource]): connection to instrument
+        text (str): query, i.e. READ? or :TRAC:DATA?
+        data_format (str, optional): SREAL or DREAL. Defaults to "SREAL".
+        data_points (int | None, optional): readings expected, needed for
+            indefinite length (#0) blocks. Defaults to None.
+        use_visa (bool, optional): use the pyvisa module. Defaults to True.
+
+    Returns:
+        Union[memoryview, array.array]: readings.
+    """
+    typecode = BINARY_FORMATS[data_format]
+    with exchange_lock(port):
+        serial_write(port, text, use_visa=use_visa)
+        t0 = time.perf_counter()
+        if use_visa is True:
+            kwargs = {} if data_points is None else {"data_points": data_points}
+            values = port.read_binary_values(
+                datatype=typecode,
+                is_big_endian=False,
+                container=functools.partial(array.array, typecode),
+                **kwargs,
+            )
+        else:
+            size = array.array(typecode).itemsize
+            payload = read_binary_block(port, size, data_points)
+            values = decode_binary(payload, data_format)
+        io_metrics.record(port, io_metrics.OP_READ, None, time.perf_counter() - t0)
+        return values
 
 
 def close_out(*args):
@@ -178,10 +541,12 @@ def socket_open(ip_address: str, port: int) -> socket.socket:
     Returns:
         socket.socket: open connection.
     """
+    if io_trace.replaying():
+        return io_trace.replay_device(f"{ip_address}:{port}")
     device = socket.socket()
     device.connect((ip_address, port))
     device.settimeout(5)
-    return device
+    return io_trace.trace(device, f"{ip_address}:{port}")
 
 
 def socket_write(device: socket.socket, packet: str) -> None:
@@ -191,18 +556,149 @@ def socket_write(device: socket.socket, packet: str) -> None:
         device (socket.socket): open socket connection to instrument
         packet (str): data packet to send to instrument
     """
-    logging.debug(packet)
+    log_command(device, packet, logging.DEBUG)
+    t0 = time.perf_counter()
+    pacer = command_pacing.get_pacer(device)
+    if pacer is not None:
+        pacer.wait_for_gap()
     device.send(f"{packet}\n".encode())
-    time.sleep(0.125)
+    if pacer is None:
+        time.sleep(command_pacing.LEGACY_GAP)
+    elif pacer.needs_completion(packet):
+        pacer.mark_io()
+        complete = False
+        try:
+            device.send(b"*OPC?\n")
+            complete = bytes(socket_reader.get_reader(device).read_until()) == b"1"
+        except socket.timeout:
+            logging.warning(f"{pacer.profile.name}: *OPC? timed out")
+        pacer.mark_io()
+        pacer.learn(complete)
+    else:
+        pacer.mark_io()
+    io_metrics.record(device, io_metrics.OP_WRITE, packet, time.perf_counter() - t0)
 
 
 def socket_read(device: socket.socket) -> str:
-    """read data from instrument over socket connection
+    """read one response from instrument over socket connection
+
+    Args:
+        device (socket.socket): open socket connection to instrument
+
+    Returns:
+        str: data returned from instrument, without the terminator.
+    """
+    return str(socket_read_view(device), "utf-8")
+
+
+def socket_read_view(device: socket.socket) -> memoryview:
+    """read one framed response without copying it out of the socket buffer.
+
+    reads up to the terminator, or by length for IEEE 488.2 definite length
+    blocks (i.e. binary :TRAC:DATA?), so large responses are not truncated.
+    the view is only valid until the next read on the same socket.
+
+    Args:
+        device (socket.socket): open socket connection to instrument
+
+    Returns:
+        memoryview: response payload.
+    """
+    pacer = command_pacing.get_pacer(device)
+    reader = socket_reader.get_reader(device)
+    t0 = time.perf_counter()
+    try:
+        data = reader.read_response()
+    except socket.timeout:
+        if pacer is not None:
+            pacer.mark_io()
+            pacer.learn(False)
+        raise
+    finally:
+        io_metrics.record(device, io_metrics.OP_READ, None, time.perf_counter() - t0)
+    if pacer is not None:
+        pacer.mark_io()
+        if len(data) == 0:
+            pacer.learn(False)
+    return data
+
+
+def socket_write_batch(
+    device: socket.socket,
+    commands: list,
+    error_query: str | None = "SYST:ERR?",
+    scpi: bool = True,
+    max_errors: int = 20,
+) -> list:
+    """write many commands over a socket as one ';' joined transfer and check errors once.
+
+    Args:
+        device (socket.socket): open socket connection to instrument
+        commands (list): commands to send in order
+        error_query (str | None, optional): error query to run after the batch,
+            None to skip the check. Defaults to "SYST:ERR?".
+        scpi (bool, optional): anchor each command to the SCPI root. Defaults to True.
+        max_errors (int, optional): stop draining after this many errors. Defaults to 20.
+
+    Returns:
+        list: errors reported by the instrument after the batch.
+    """
+    errors = []
+    # hold the connection for the whole batch so no other exchange lands
+    # between the commands and the error drain
+    with exchange_lock(device):
+        for packet in pack_commands(commands, scpi=scpi):
+            socket_write(device, packet)
+
+        if error_query is None:
+            return errors
+
+        for _ in range(max_errors):
+            try:
+                socket_write(device, error_query)
+                resp = socket_read(device).strip()
+            except socket.timeout:
+                logging.warning(f"{error_query} timed out, error queue not drained")
+                break
+            code = error_code(resp)
+            if code == 0:
+                _confirm_pacing(device, errors)
+                break
+            if resp:
+                errors.append(resp)
+            if code == -1:
+                # empty or unparseable reply, the queue can not be walked further
+                break
+    for err in errors:
+        logging.warning(f"Batched command error: {err}")
+    return errors
+
+
+def socket_query_binary(
+    device: socket.socket,
+    packet: str,
+    data_format: str = "SREAL",
+    data_points: int | None = None,
+) -> memoryview:
+    """send a reading query over a socket and decode the binary block in place.
+
+    the readings are a view into the socket buffer, only valid until the next read.
 
     Args:
         device (socket.socket): open socket connection to instrument
+        packet (str): query, i.e. :TRAC:DATA?
+        data_format (str, optional): SREAL or DREAL. Defaults to "SREAL".
+        data_points (int | None, optional): readings expected, needed for
+            indefinite length (#0) blocks. Defaults to None.
 
     Returns:
-        str: data returned from instrument.
+        memoryview: readings.
     """
-    return device.recv(2048).decode("utf-8")
+    size = array.array(BINARY_FORMATS[data_format]).itemsize
+    expected_length = None if data_points is None else data_points * size
+    with exchange_lock(device):
+        socket_write(device, packet)
+        t0 = time.perf_counter()
+        payload = socket_reader.get_reader(device).read_block(expected_length)
+        io_metrics.record(device, io_metrics.OP_READ, None, time.perf_counter() - t0)
+    return decode_binary(payload, data_format)
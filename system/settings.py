@@ -6,6 +6,7 @@ import sys
 import socket
 
 
+from system import log_queue
 from system import version
 
 # from system import log_config
@@ -31,6 +32,9 @@ LOG_LEVEL = logging.DEBUG
 LOG_DATE_TIME = "%Y%m%d%H%M%S"
 HOME_PATH = os.path.expanduser("~")
 LOG_ID = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+LOG_QUEUE_SIZE = 10000  # records buffered for the log writer thread
+# log every Nth repeat of the same command per instrument, 0 to drop them.
+COMMAND_LOG_SAMPLING = {"JDX": 100, "ENSEMBLE": 10, "KEITHLEY 2750": 10}
 
 
 filesystem.init_directory(f"{HOME_PATH}\\{HOST_NAME}\\log_{LOG_ID}")
@@ -40,8 +44,14 @@ log_file = os.path.join(f"{HOME_PATH}\\{HOST_NAME}\\log_{LOG_ID}", f"log_{date_t
 
 log_format = "%(asctime)s (%(filename)s).%(funcName)s(%(lineno)d) - %(message)s"
 
-logging.basicConfig(
-    filename=os.path.join(log_file, "error.log"), level=LOG_LEVEL, format=log_format
+# records go through a ring buffer to a background writer, so no disk write happens
+# inside an instrument round trip.
+log_queue.configure_queue_logging(
+    os.path.join(log_file, "error.log"),
+    level=LOG_LEVEL,
+    log_format=log_format,
+    queue_size=LOG_QUEUE_SIZE,
+    sample_every=COMMAND_LOG_SAMPLING,
 )
 
 logging.getLogger(__name__).addHandler(logging.StreamHandler(sys.stdout))
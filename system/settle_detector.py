@@ -0,0 +1,113 @@
+import collections
+import logging
+import math
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+
+# settle detection after a stage move. the sensor outputs are sampled while the
+# stage settles and the wait ends as soon as a rolling window of samples is flat
+# and quiet, instead of always sitting out the full settle time.
+
+
+@dataclass
+class SettleCriteria:
+    window: float = 2.0  # seconds of samples judged together
+    max_std: float = 1e-4  # standard deviation limit of every output
+    max_slope: float = 2e-5  # drift limit of every output, per second
+    min_time: float = 1.0  # seconds to wait before the outputs are judged
+    interval: float = 0.1  # seconds between samples, slower sampling sets its own pace
+
+
+class SettleDetector:
+    """rolling window of timestamped samples, see SettleCriteria."""
+
+    def __init__(self, criteria: SettleCriteria | None = None) -> None:
+        self.criteria = criteria or SettleCriteria()
+        self.samples = collections.deque()
+
+    def add(self, timestamp: float, values) -> None:
+        self.samples.append((timestamp, tuple(values)))
+        # keep one sample older than the window so it is fully covered.
+        while (
+            len(self.samples) > 2
+            and timestamp - self.samples[1][0] >= self.criteria.window
+        ):
+            self.samples.popleft()
+
+    def settled(self) -> bool:
+        """True if the window is covered and every output is within the limits."""
+        if len(self.samples) < 3:
+            return False
+        t_first = self.samples[0][0]
+        if self.samples[-1][0] - t_first < self.criteria.window:
+            return False
+
+        n = len(self.samples)
+        times = [t - t_first for t, _ in self.samples]
+        t_bar = math.fsum(times) / n
+        s_tt = math.fsum((t - t_bar) ** 2 for t in times)
+        for column in zip(*(values for _, values in self.samples)):
+            v_bar = math.fsum(column) / n
+            s_vv = math.fsum((v - v_bar) ** 2 for v in column)
+            if (s_vv / (n - 1)) ** 0.5 > self.criteria.max_std:
+                return False
+            slope = math.fsum((t - t_bar) * (v - v_bar) for t, v in zip(times, column))
+            if s_tt and abs(slope / s_tt) > self.criteria.max_slope:
+                return False
+        return True
+
+
+def wait_for_settle(
+    sample: Callable[[], list | None],
+    settle_time: float,
+    criteria: SettleCriteria | None = None,
+    label: str = "",
+) -> float:
+    """sample the outputs until they settle, for at most the settle time.
+
+    Args:
+        sample (Callable[[], list | None]): returns the current outputs, None or
+            an empty list if the read failed
+        settle_time (float): spec'd settle time in seconds, the longest wait
+        criteria (SettleCriteria | None, optional): stability limits. Defaults to None.
+        label (str, optional): what is settling, for the log. Defaults to "".
+
+    Returns:
+        float: seconds it took to settle, settle_time if it never did.
+    """
+    detector = SettleDetector(criteria)
+    interval = detector.criteria.interval
+    t0 = time.monotonic()
+    elapsed = 0.0
+    settled = False
+
+    while elapsed < settle_time:
+        try:
+            values = sample()
+        except KeyboardInterrupt:
+            break
+        except Exception as e:
+            *_, exc_tb = sys.exc_info()
+            logging.warning(f"\t{e} -> Line {exc_tb.tb_lineno}")
+            values = None
+        now = time.monotonic()
+        elapsed = now - t0
+        if values:
+            detector.add(now, values)
+        if elapsed >= detector.criteria.min_time and detector.settled():
+            settled = True
+            break
+        print(f"settling {elapsed:5.1f}/{settle_time} s", end="\r")
+        pause = min(interval - (time.monotonic() - now), settle_time - elapsed)
+        time.sleep(max(0.0, pause))
+        elapsed = time.monotonic() - t0
+
+    elapsed = min(elapsed, settle_time)
+    if settled:
+        logging.info(f"{label} settled in {elapsed:.1f} s of {settle_time} s")
+    else:
+        logging.info(f"{label} did not settle, waited the full {settle_time} s")
+    return elapsed
@@ -0,0 +1,171 @@
+import socket
+import weakref
+
+
+# framed socket reads into a reusable, preallocated buffer. responses are read up
+# to the terminator, or by length for IEEE 488.2 definite length blocks, so large
+# buffered scans are neither truncated nor copied on the way in.
+
+BUFFER_SIZE = 64 * 1024  # bytes, grows if a single response needs more
+TERMINATOR = b"\n"
+
+
+class SocketReader:
+    """buffered reader for one socket connection.
+
+    the memoryview returned by a read points into the reader's buffer and is only
+    valid until the next read on the same reader. the reader only keeps a weak
+    reference to the socket, so it goes away with the socket it is attached to.
+    """
+
+    def __init__(
+        self,
+        device: socket.socket,
+        size: int = BUFFER_SIZE,
+        terminator: bytes = TERMINATOR,
+    ) -> None:
+        self._device = weakref.ref(device)
+        self.terminator = terminator
+        self._buffer = bytearray(size)
+        self._view = memoryview(self._buffer)
+        self._start = 0  # first unread byte
+        self._end = 0  # one past the last received byte
+
+    @property
+    def device(self) -> socket.socket:
+        device = self._device()
+        if device is None:
+            raise ConnectionError("socket was closed and released")
+        return device
+
+    def reset(self) -> None:
+        """drop anything left in the buffer, i.e. after a reconnect."""
+        self._start = 0
+        self._end = 0
+
+    def _make_room(self, needed: int) -> None:
+        # move the unread bytes to the front, then grow if there is still no room.
+        pending = self._end - self._start
+        if self._start > 0:
+            self._buffer[:pending] = self._buffer[self._start : self._end]
+            self._start = 0
+            self._end = pending
+        if self._end == len(self._buffer) or needed > len(self._buffer):
+            # a new buffer, views handed out earlier keep the old one alive.
+            buffer = bytearray(max(2 * len(self._buffer), needed))
+            buffer[:pending] = self._buffer[:pending]
+            self._buffer = buffer
+            self._view = memoryview(self._buffer)
+
+    def _fill(self, needed: int) -> None:
+        # receive until at least `needed` unread bytes are buffered.
+        while self._end - self._start < needed:
+            if self._end == len(self._buffer) or self._start + needed > len(
+                self._buffer
+            ):
+                self._make_room(needed)
+            received = self.device.recv_into(self._view[self._end :])
+            if received == 0:
+                raise ConnectionError("socket closed by instrument")
+            self._end += received
+
+    def _consume(self, length: int, skip: int = 0) -> memoryview:
+        payload = self._view[self._start : self._start + length]
+        self._start += length + skip
+        if self._start == self._end:
+            self._start = self._end = 0
+        return payload
+
+    def read_until(self, terminator: bytes | None = None) -> memoryview:
+        """read one response up to the terminator.
+
+        Args:
+            terminator (bytes | None, optional): end of message. Defaults to the reader's.
+
+        Returns:
+            memoryview: payload without the terminator (or a trailing CR).
+        """
+        terminator = terminator or self.terminator
+        searched = self._start
+        while (index := self._buffer.find(terminator, searched, self._end)) == -1:
+            # only the tail could hold a terminator split across two packets.
+            offset = max(0, self._end - self._start - len(terminator) + 1)
+            self._fill(self._end - self._start + 1)
+            searched = self._start + offset
+
+        length = index - self._start
+        skip = len(terminator)
+        if length and self._buffer[index - 1] == 0x0D:  # CR before LF
+            length -= 1
+            skip += 1
+        return self._consume(length, skip)
+
+    def read_block(self, expected_length: int | None = None) -> memoryview:
+        """read an IEEE 488.2 definite length block, i.e. #41024<1024 bytes>.
+
+        Args:
+            expected_length (int | None, optional): payload size for indefinite
+                length (#0) blocks, which may contain the terminator byte. Defaults
+                to None (read #0 blocks to the terminator).
+
+        Returns:
+            memoryview: block payload, header and terminator removed.
+        """
+        self._fill(2)
+        if self._buffer[self._start] != ord("#"):
+            raise ValueError("response is not an IEEE 488.2 block")
+        digits = self._buffer[self._start + 1] - ord("0")
+        header = 2 + digits
+        self._fill(header)
+        if digits == 0:
+            if expected_length is None:
+                # indefinite length block, runs to the terminator.
+                self._start += header
+                return self.read_until()
+            length = expected_length
+        else:
+            length = int(self._buffer[self._start + 2 : self._start + header])
+        # the block is followed by the terminator, wait for both before slicing.
+        self._fill(header + length + len(self.terminator))
+        self._start += header
+        return self._consume(length, len(self.terminator))
+
+    def read_response(self) -> memoryview:
+        """read one response, framed by length for blocks and by terminator otherwise.
+
+        Returns:
+            memoryview: response payload.
+        """
+        self._fill(1)
+        if self._buffer[self._start] == ord("#"):
+            return self.read_block()
+        return self.read_until()
+
+
+_readers = weakref.WeakKeyDictionary()
+
+
+def get_reader(device: socket.socket) -> SocketReader:
+    """get the reader attached to a socket, creating it on first use.
+
+    Args:
+        device (socket.socket): open socket connection to instrument
+
+    Returns:
+        SocketReader: buffered reader for the connection.
+    """
+    reader = _readers.get(device)
+    if reader is None:
+        reader = _readers[device] = SocketReader(device)
+    return reader
+
+
+def reset_reader(device: socket.socket) -> None:
+    """drop buffered data for a socket, i.e. after it was reconnected.
+
+    Args:
+        device (socket.socket): socket or pooled handle the reader is attached to
+    """
+    reader = _readers.get(device)
+    if reader is not None:
+        reader.reset()
@@ -83,6 +83,24 @@ DAQ_BAUD = 9600
 NUMBER_OF_CARDS = 2
 DAQ_TIMEOUT = 10  # seconds
 DAQ_ERROR_VALUE = 1e9  # volts
+# reading transfer format: ASCII, SREAL (4 byte) or DREAL (8 byte, keeps uV resolution).
+# the 2750 only sends binary readings over GPIB, RS-232 is always ASCII.
+DAQ_DATA_FORMAT = "ASCII"
+# check the channel tag of every decoded reading against the compiled scan layout.
+DAQ_VERIFY_CHANNELS = False
+# integration time policy. NPLC and filter count per channel group are picked from
+# the part's resolution/linearity and the noise floor measured at DAQ_DEFAULT_NPLC.
+DAQ_DEFAULT_NPLC = 0.05
+DAQ_NPLC_STEPS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10)
+DAQ_MAX_SAMPLES = 100  # largest averaging filter count of the 2750
+DAQ_MAX_READING_TIME = 0.5  # seconds one averaged channel reading may take
+DAQ_MAX_SCAN_TIME = 5  # seconds a scan of every channel may take, under DAQ_TIMEOUT
+DAQ_READ_TIMEOUT_MARGIN = 2  # seconds the DAQ port timeout allows over the scan time
+DAQ_READING_OVERHEAD = 0.003  # seconds of channel switching per reading
+DAQ_LINE_FREQUENCY = 60  # Hz
+DAQ_NOISE_FRACTION = 0.1  # allowed reading noise, fraction of the finest spec
+DAQ_TEMP_NOISE_TARGET = 1e-4  # V, 0.01 C on a 10 mV/C temperature output
+DAQ_NOISE_SCANS = 20  # scans used to measure the noise floor
 DAQ_PORT = stage_config_data["data_aq_com"]
 
 
@@ -94,6 +112,18 @@ TEMP_PROBE = "T"
 TEMP_CJC = "22.5"
 NUM_TEMP_CHANS = 2
 
+# thermocouple module, plate on channels 0-2 and pillar on 3-5. readings taken
+# within the TTL share one block read, i.e. all ports at one stage point.
+THERMOMETRY_TTL = 1.0  # seconds
+# background thermal monitor, samples every channel at a fixed rate.
+THERMAL_MONITOR = True
+THERMAL_MONITOR_PERIOD = 1.0  # seconds between block reads
+THERMAL_MONITOR_TAU = 10.0  # seconds, EWMA time constant of the filtered temps
+THERMAL_MONITOR_HISTORY = 3600  # samples kept
+# a chamber soak ends once the filtered plate state has been stable this long,
+# the soak time is only the limit.
+SOAK_STABLE_HOLD = 60.0  # seconds
+
 DIFF_PORT_CONFIG = {
     "PORT_1": ["101", "102", "103"],
     "PORT_2": ["104", "105", "106"],
@@ -143,9 +173,56 @@ STAGE_AXIS = "U"
 STAGE_SPEED = 25  # rev/min
 REVERSE_POLARITY = False
 STAGE_POINTS_TO_READ = 10  # points
+# collect command, error and sample time along with the position feedback.
+STAGE_DIAGNOSTICS = False
+STAGE_STATUS_INTERVAL = 0.005  # seconds between axis status polls while moving
+STAGE_STATUS_MAX_INTERVAL = 0.25  # serial status polls back off up to this
+# test plans visit their angles in one sweep. 1 approaches every angle from below,
+# -1 from above and 0 picks the shorter sweep. the offset is the lead-in overshoot.
+STAGE_APPROACH_DIRECTION = 0
+STAGE_APPROACH_OFFSET = 1.0  # degrees
 STAGE_ACCURACY = stage_config_data["stage_accuracy"]  # degrees
 CONTROLLER_TYPE = stage_config_data["stage_type"]
 STAGE_BAUD = 9600
 STAGE_PORT = stage_config_data["stage_com"]
 
 #####################################################################################################################
+
+# settle detection setup information
+#####################################################################################################################
+
+# end the wait after a move once the sensor outputs are stable. the part's settle
+# time is still the longest wait. False always waits the full settle time.
+SETTLE_DETECTION = True
+# keyword arguments for settle_detector.SettleCriteria, keyed by sensor family.
+# limits are in the units of the sampled outputs (V for JMX, deg for JDX).
+SETTLE_CRITERIA = {
+    "JMX": {"window": 2.0, "max_std": 1e-4, "max_slope": 2e-5, "min_time": 1.0},
+    "JDX": {"window": 2.0, "max_std": 2e-3, "max_slope": 1e-3, "min_time": 1.0},
+}
+# terminal output and csv rows of a point are written on a worker thread while the
+# stage moves to the next point. points queued before the loop waits, 0 disables.
+POINT_PIPELINE_DEPTH = 4
+
+#####################################################################################################################
+
+# command pacing setup information
+#####################################################################################################################
+
+# keyword arguments for command_pacing.PacingProfile, keyed by instrument.
+# min_gap is the starting gap in seconds, floor/ceiling bound what gets learned.
+PACING_PROFILES = {
+    "KEITHLEY 2750": {
+        "min_gap": 0.02,
+        "floor": 0.005,
+        "ceiling": 0.25,
+        "completion": "opc",
+        "opc_commands": ("*RST", "INIT", "SYST:CLE", ":TRAC:CLE"),
+    },
+    "SORENSEN": {"min_gap": 0.05, "floor": 0.02, "ceiling": 0.5},
+    "ENSEMBLE": {"min_gap": 0.02, "floor": 0.005, "ceiling": 0.25},
+    "WATLOW F4T": {"min_gap": 0.05, "floor": 0.01, "ceiling": 0.5},
+    "JDX": {"min_gap": 0.02, "floor": 0.005, "ceiling": 0.25},
+}
+
+#####################################################################################################################
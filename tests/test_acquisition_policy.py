@@ -0,0 +1,69 @@
+import logging
+
+import pytest
+
+from instrumentation import acquisition_policy
+from system import stage_configuration
+
+
+@pytest.fixture(autouse=True)
+def daq_settings(monkeypatch):
+    for name, value in {
+        "DAQ_DEFAULT_NPLC": 0.05,
+        "DAQ_NPLC_STEPS": (0.01, 0.05, 0.1, 1),
+        "DAQ_MAX_SAMPLES": 100,
+        "DAQ_MAX_READING_TIME": 0.5,
+        "DAQ_LINE_FREQUENCY": 60,
+        "DAQ_READING_OVERHEAD": 0.003,
+    }.items():
+        monkeypatch.setattr(stage_configuration, name, value)
+
+
+def test_quiet_channels_get_the_fastest_integration():
+    setting = acquisition_policy.choose_setting(["101"], noise=1e-5, target=1e-4)
+
+    assert (setting.nplc, setting.count) == (0.01, 1)
+    assert setting.expected <= setting.target
+
+
+def test_fastest_setting_that_meets_the_target():
+    # 0.05 x 3 takes 11.5 ms, 0.1 x 2 takes 9.3 ms and 1 x 1 takes 19.7 ms.
+    setting = acquisition_policy.choose_setting(["101"], noise=1e-4, target=6e-5)
+
+    assert (setting.nplc, setting.count) == (0.1, 2)
+    assert setting.expected == pytest.approx(5e-5)
+    assert setting.reading_time() == pytest.approx(2 * (0.1 / 60 + 0.003))
+
+
+def test_quietest_setting_when_the_target_can_not_be_met(caplog):
+    with caplog.at_level(logging.WARNING):
+        setting = acquisition_policy.choose_setting(
+            ["101", "102"], noise=1.0, target=1e-6, max_reading_time=10
+        )
+
+    assert (setting.nplc, setting.count) == (1, 100)
+    assert "over the" in caplog.text
+
+
+def test_default_integration_when_nothing_fits_the_reading_time():
+    setting = acquisition_policy.choose_setting(
+        ["101"], noise=1e-4, target=6e-5, max_reading_time=0.001
+    )
+
+    assert (setting.nplc, setting.count) == (0.05, 1)
+
+
+def test_group_commands():
+    averaged = acquisition_policy.GroupSetting(["101", "102"], 0.1, 4, 1e-4, 5e-5)
+    single = acquisition_policy.GroupSetting(["103"], 1, 1, 1e-4, 5e-5)
+
+    assert averaged.commands() == [
+        ":SENS:VOLT:DC:NPLC 0.1, (@101,102)",
+        ":SENS:VOLT:DC:AVER:TCON REP, (@101,102)",
+        ":SENS:VOLT:DC:AVER:COUN 4, (@101,102)",
+        ":SENS:VOLT:DC:AVER:STAT ON, (@101,102)",
+    ]
+    assert single.commands() == [
+        ":SENS:VOLT:DC:NPLC 1, (@103)",
+        ":SENS:VOLT:DC:AVER:STAT OFF, (@103)",
+    ]
@@ -0,0 +1,69 @@
+import socket
+import struct
+import threading
+
+import pytest
+
+from system import serial_protocols
+
+
+def test_decode_sreal():
+    payload = struct.pack("<3f", 1.5, -2.25, 1e-6)
+
+    readings = serial_protocols.decode_binary(payload, "SREAL")
+
+    assert readings.tolist() == pytest.approx([1.5, -2.25, 1e-6])
+
+
+def test_decode_dreal():
+    payload = struct.pack("<2d", 9.87654321, -1e-12)
+
+    readings = serial_protocols.decode_binary(payload, "DREAL")
+
+    assert readings.tolist() == [9.87654321, -1e-12]
+
+
+def test_decode_drops_a_partial_reading():
+    payload = struct.pack("<2f", 1.0, 2.0) + b"\x00\x00"
+
+    assert serial_protocols.decode_binary(payload).tolist() == [1.0, 2.0]
+
+
+def test_decode_reads_from_a_memoryview():
+    buffer = bytearray(b"xx" + struct.pack("<f", 4.0))
+
+    readings = serial_protocols.decode_binary(memoryview(buffer)[2:])
+
+    assert readings.tolist() == [4.0]
+
+
+def test_binary_format_commands():
+    assert serial_protocols.binary_format_commands("DREAL") == [
+        "FORM:DATA DREAL",
+        "FORM:BORD SWAP",
+    ]
+    assert serial_protocols.binary_format_commands("ASCII") == ["FORM:DATA ASC"]
+
+
+def test_socket_query_binary():
+    instrument, device = socket.socketpair()
+    device.settimeout(1)
+    payload = struct.pack("<3f", 0.125, -3.5, 10.0)
+
+    def answer():
+        query = b""
+        while not query.endswith(b"\n"):
+            query += instrument.recv(64)
+        instrument.sendall(b"#212" + payload + b"\n")
+
+    thread = threading.Thread(target=answer)
+    thread.start()
+    try:
+        readings = serial_protocols.socket_query_binary(
+            device, ':TRAC:DATA? 1, 3, "defbuffer1", READ', "SREAL", 3
+        )
+        assert readings.tolist() == [0.125, -3.5, 10.0]
+    finally:
+        thread.join()
+        instrument.close()
+        device.close()
@@ -0,0 +1,74 @@
+import array
+import socket
+
+import pytest
+
+from instrumentation import data_aq_read
+from instrumentation import simulated_instruments
+from system import command_pacing
+from system import serial_protocols
+from system import socket_reader
+from system import stage_configuration
+
+
+class SocketResource:
+    """the part of a pyvisa resource the DAQ code uses, over a plain socket."""
+
+    def __init__(self, address: tuple) -> None:
+        self.device = socket.create_connection(address, timeout=2)
+        self.reader = socket_reader.SocketReader(self.device)
+
+    def write(self, text: str) -> None:
+        self.device.sendall(f"{text}\n".encode())
+
+    def read(self) -> str:
+        return str(self.reader.read_until(), "utf-8")
+
+    def read_binary_values(self, datatype, is_big_endian, container, data_points=None):
+        return container(array.array(datatype, bytes(self.reader.read_block())))
+
+    def close(self) -> None:
+        self.device.close()
+
+
+@pytest.fixture
+def daq():
+    meter = simulated_instruments.KeithleyDMM(
+        noise=simulated_instruments.NoiseModel(
+            latency=0, jitter=0, per_reading=0, noise=1e-3
+        ),
+        signal=lambda chan, function: int(chan) / 100,
+    )
+    transport = simulated_instruments.TcpTransport(meter)
+    transport.start()
+    port = SocketResource((simulated_instruments.HOST, transport.port))
+    command_pacing.set_pacing_profile(port, command_pacing.PacingProfile("DMM", 0))
+    yield port
+    port.close()
+    transport.stop()
+
+
+@pytest.mark.parametrize("data_format", ["ASCII", "SREAL", "DREAL"])
+def test_buffered_scans_are_reduced_per_channel(daq, monkeypatch, data_format):
+    monkeypatch.setattr(stage_configuration, "DAQ_DATA_FORMAT", data_format)
+    monkeypatch.setattr(stage_configuration, "DAQ_TIMEOUT", 2)
+    commands = [":FORM:ELEM READ,CHAN", ":ROUT:SCAN (@101:103)"]
+    if data_format != "ASCII":
+        commands += serial_protocols.binary_format_commands(data_format)
+    serial_protocols.serial_write_batch(daq, commands)
+
+    statistics = data_aq_read.read_buffered_scans(daq, 200, 3)
+
+    assert statistics.scans == 200
+    assert statistics.channels == ["101", "102", "103"]
+    assert statistics.mean == pytest.approx([1.01, 1.02, 1.03], abs=5e-4)
+    assert statistics.std == pytest.approx([1e-3] * 3, rel=0.3)
+    for minimum, mean, maximum in zip(
+        statistics.minimum, statistics.mean, statistics.maximum
+    ):
+        assert minimum < mean < maximum
+
+
+def test_buffered_scans_must_fit_the_trace_buffer(daq):
+    with pytest.raises(ValueError):
+        data_aq_read.read_buffered_scans(daq, data_aq_read.TRACE_BUFFER_POINTS, 2)
@@ -0,0 +1,64 @@
+from instrumentation import data_aq_init
+
+
+def test_setting_key():
+    assert data_aq_init.setting_key("FUNC 'VOLT', (@101:106)") == "FUNC (@101:106)"
+    assert data_aq_init.setting_key(":ROUT:SCAN (@101:106)") == "ROUT:SCAN"
+    assert (
+        data_aq_init.setting_key(":sens:volt:dc:nplc 0.1, (@101,102)")
+        == "SENS:VOLT:DC:NPLC (@101,102)"
+    )
+    assert data_aq_init.setting_key("*RST") == "*RST"
+
+
+def test_first_delta_is_the_whole_configuration_without_reset():
+    state = data_aq_init.DaqState()
+    commands = ["*RST", "SYST:CLE", "TRIG:COUN 1", ":ROUT:SCAN (@101:106)"]
+
+    assert state.delta(commands) == commands[1:]
+
+
+def test_nothing_is_sent_when_no_setting_changed():
+    state = data_aq_init.DaqState()
+    commands = ["SYST:CLE", "TRIG:COUN 1", ":ROUT:SCAN (@101:106)", ":TRAC:CLE"]
+    state.update(commands)
+
+    assert state.delta(commands) == []
+
+
+def test_actions_go_along_with_a_changed_setting():
+    state = data_aq_init.DaqState()
+    state.update(["SYST:CLE", "TRIG:COUN 1", ":ROUT:SCAN (@101:106)"])
+
+    assert state.delta(["SYST:CLE", "TRIG:COUN 1", ":ROUT:SCAN (@101:103)"]) == [
+        "SYST:CLE",
+        ":ROUT:SCAN (@101:103)",
+    ]
+
+
+def test_a_new_function_drops_every_channel_setting():
+    state = data_aq_init.DaqState()
+    state.update(
+        [
+            "FUNC 'VOLT', (@101:106)",
+            ":SENS:VOLT:RANG 10, (@101:106)",
+            "TRIG:COUN 1",
+        ]
+    )
+    state.update(["FUNC 'TEMP', (@101)"])
+
+    assert state.settings == {
+        "TRIG:COUN": "TRIG:COUN 1",
+        "FUNC (@101)": "FUNC 'TEMP', (@101)",
+    }
+    assert state.delta(
+        ["FUNC 'VOLT', (@101:106)", ":SENS:VOLT:RANG 10, (@101:106)"]
+    ) == ["FUNC 'VOLT', (@101:106)", ":SENS:VOLT:RANG 10, (@101:106)"]
+
+
+def test_a_setting_on_another_channel_list_replaces_the_old_one():
+    state = data_aq_init.DaqState()
+    state.update([":SENS:VOLT:DC:NPLC 1, (@101:106)"])
+    state.update([":SENS:VOLT:DC:NPLC 0.1, (@101,102)"])
+
+    assert list(state.settings) == ["SENS:VOLT:DC:NPLC (@101,102)"]
@@ -0,0 +1,114 @@
+import pytest
+
+from system import io_metrics
+
+
+class Port:
+    port = "COM5"
+
+
+@pytest.fixture(autouse=True)
+def clean_histograms():
+    io_metrics.reset()
+    yield
+    io_metrics.reset()
+
+
+def test_empty_histogram():
+    histogram = io_metrics.LatencyHistogram()
+
+    assert histogram.percentile(0.5) == 0.0
+    assert histogram.mean() == 0.0
+
+
+def test_percentile_is_the_bucket_bound_capped_at_the_maximum():
+    histogram = io_metrics.LatencyHistogram()
+    for _ in range(90):
+        histogram.add(1e-4)
+    for _ in range(10):
+        histogram.add(0.5)
+
+    assert histogram.percentile(0.5) == pytest.approx(1e-4)
+    assert histogram.percentile(0.9) == pytest.approx(1e-4)
+    assert histogram.percentile(0.95) == 0.5
+    assert histogram.count == 100
+    assert histogram.mean() == pytest.approx((90 * 1e-4 + 10 * 0.5) / 100)
+    assert (histogram.minimum, histogram.maximum) == (1e-4, 0.5)
+
+
+def test_percentile_of_the_overflow_bucket_is_the_maximum():
+    histogram = io_metrics.LatencyHistogram()
+    histogram.add(250.0)
+
+    assert histogram.percentile(0.99) == 250.0
+
+
+@pytest.mark.parametrize(
+    "command, expected",
+    [
+        ("MOVEABS X 10 XF 20\n", "MOVEABS"),
+        (':TRAC:DATA? 1, 9, "defbuffer1", READ', "TRAC:DATA?"),
+        ("read?", "READ?"),
+        (b"*IDN?\r", "*IDN?"),
+        (";000,d,25", ";000,d"),
+        (";000,p,!,10", ";000,p,!"),
+        (":TRAC:CLE;:TRIG:COUN 1", "BATCH"),
+        ("", ""),
+    ],
+)
+def test_mnemonic(command, expected):
+    assert io_metrics.mnemonic(command) == expected
+
+
+def test_reads_are_filed_under_the_last_command():
+    port = Port()
+    io_metrics.record(port, io_metrics.OP_WRITE, "READ?", 0.001)
+    io_metrics.record(port, io_metrics.OP_READ, None, 0.02)
+    io_metrics.record(port, io_metrics.OP_READ, None, 0.03)
+
+    histograms = io_metrics.snapshot()
+
+    assert histograms[("COM5", "write", "READ?")].count == 1
+    assert histograms[("COM5", "read", "READ?")].count == 2
+
+
+def test_writes_and_reads_inside_an_exchange_are_not_counted_twice():
+    port = Port()
+    with io_metrics.exchange():
+        io_metrics.record(port, io_metrics.OP_WRITE, "*IDN?", 0.001)
+        io_metrics.record(port, io_metrics.OP_READ, None, 0.01)
+    io_metrics.record(port, io_metrics.OP_QUERY, "*IDN?", 0.011)
+
+    assert list(io_metrics.snapshot()) == [("COM5", "query", "*IDN?")]
+
+
+def test_renamed_instrument_gets_its_own_histograms():
+    port = Port()
+    io_metrics.record(port, io_metrics.OP_WRITE, "INIT", 0.001)
+    io_metrics.set_instrument_name(port, "KEITHLEY 2750")
+    io_metrics.record(port, io_metrics.OP_WRITE, "INIT", 0.001)
+
+    assert sorted(io_metrics.snapshot()) == [
+        ("COM5", "write", "INIT"),
+        ("KEITHLEY 2750 (COM5)", "write", "INIT"),
+    ]
+
+
+def test_reset_clears_the_histograms_cached_on_a_port():
+    port = Port()
+    io_metrics.record(port, io_metrics.OP_WRITE, "INIT", 0.001)
+    io_metrics.reset()
+    io_metrics.record(port, io_metrics.OP_WRITE, "INIT", 0.002)
+
+    assert io_metrics.snapshot()[("COM5", "write", "INIT")].count == 1
+
+
+def test_report_lists_the_slowest_command_first():
+    port = Port()
+    io_metrics.record(port, io_metrics.OP_QUERY, "READ?", 0.5)
+    io_metrics.record(port, io_metrics.OP_WRITE, "INIT", 0.001)
+
+    lines = io_metrics.report().splitlines()
+
+    assert "READ?" in lines[1]
+    assert "INIT" in lines[2]
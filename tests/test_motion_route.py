@@ -0,0 +1,123 @@
+import pytest
+
+from control import motion_route
+from system import stage_configuration
+
+
+def test_plan_visits_keeps_every_point():
+    visits = motion_route.plan_visits([(0, "Z"), (90, "L"), (0, "L"), -90])
+
+    assert [(v.angle, v.label, v.point) for v in visits] == [
+        (0, "Z", 0),
+        (90, "L", 1),
+        (0, "L", 2),
+        (-90, "", 3),
+    ]
+
+
+def test_route_is_one_sweep_from_below():
+    route = motion_route.plan_route(
+        [90, -90, 0, 45], start=-90, direction=1, offset=1.0
+    )
+
+    assert [visit.angle for visit in route.visits] == [-90, 0, 45, 90]
+    assert route.lead_in is None
+    assert route.travel == pytest.approx(180)
+
+
+def test_route_passes_the_first_angle_to_approach_it_from_below():
+    route = motion_route.plan_route([0, 10], start=5, direction=1, offset=1.0)
+
+    assert route.lead_in == -1.0
+    # 5 -> -1 -> 0 -> 10
+    assert route.travel == pytest.approx(6 + 1 + 10)
+
+
+def test_route_picks_the_shorter_sweep_when_either_direction_is_allowed():
+    route = motion_route.plan_route(
+        [-90, 0, 90], start=90, end=90, direction=0, offset=1.0
+    )
+
+    assert [visit.angle for visit in route.visits] == [90, 0, -90]
+    assert route.travel == pytest.approx(360)
+
+
+def test_same_angle_points_stay_together_in_plan_order():
+    route = motion_route.plan_route(
+        [(0, "A"), (90, "B"), (0, "C")], start=0, direction=1, offset=1.0
+    )
+
+    assert [(v.angle, v.label) for v in route.visits] == [
+        (0, "A"),
+        (0, "C"),
+        (90, "B"),
+    ]
+
+
+def test_empty_plan_only_parks():
+    route = motion_route.plan_route([], start=10, end=0, direction=1, offset=1.0)
+
+    assert route.visits == []
+    assert route.travel == 10
+
+
+def test_plan_order_hands_back_readings_in_plan_order():
+    route = motion_route.plan_route(
+        [(-90, "Y"), (0, "L"), (90, "Y"), (180, "Z"), (0, "Z")],
+        start=180,
+        direction=-1,
+        offset=1.0,
+    )
+    order = motion_route.PlanOrder(route)
+
+    released = []
+    for visit in route.visits:
+        released += order.add(visit, f"{visit.angle}{visit.label}")
+
+    assert released == [
+        ("Y", "-90Y"),
+        ("L", "0L"),
+        ("Y", "90Y"),
+        ("Z", "180Z"),
+        ("Z", "0Z"),
+    ]
+
+
+def test_plan_order_holds_a_reading_until_the_points_before_it_are_read():
+    visits = motion_route.plan_visits([10, 20])
+    order = motion_route.PlanOrder(motion_route.Route(visits[::-1]))
+
+    assert order.add(visits[1], "second") == []
+    assert order.add(visits[0], "first") == [("", "first"), ("", "second")]
+
+
+def test_move_to_drops_a_move_to_where_the_stage_is(monkeypatch):
+    moves = []
+    monkeypatch.setattr(stage_configuration, "STAGE_ACCURACY", 0.01)
+    monkeypatch.setattr(stage_configuration, "REVERSE_POLARITY", False)
+    monkeypatch.setattr(
+        motion_route.motor_control,
+        "move_stage_to_angle",
+        lambda port, angle: moves.append(angle) or angle,
+    )
+    monkeypatch.setattr(
+        motion_route.motor_control, "get_position_from_stage", lambda port: 45.0
+    )
+    stage = type("Stage", (), {})()
+
+    motion_route.move_to(stage, 45.0)
+    motion_route.move_to(stage, 45.0)
+    motion_route.move_to(stage, 90.0)
+
+    assert moves == [45.0, 90.0]
+
+
+def test_move_to_raises_a_failed_move(monkeypatch):
+    def fail(port, angle):
+        raise RuntimeError("move timed out")
+
+    monkeypatch.setattr(motion_route.motor_control, "move_stage_to_angle", fail)
+    stage = type("Stage", (), {})()
+
+    with pytest.raises(RuntimeError):
+        motion_route.move_to(stage, 10.0)
@@ -0,0 +1,78 @@
+import array
+
+import pytest
+
+from instrumentation import data_aq_init
+from instrumentation import data_aq_read
+from system import stage_configuration
+
+
+class Port:
+    pass
+
+
+@pytest.fixture(autouse=True)
+def port_config(monkeypatch):
+    monkeypatch.setattr(
+        stage_configuration,
+        "DIFF_PORT_CONFIG",
+        {"PORT_1": ["101", "102", "103"], "PORT_2": ["104", "105", "106"]},
+    )
+    monkeypatch.setattr(stage_configuration, "DAQ_VERIFY_CHANNELS", True)
+
+
+def scan_response(scan_list: list) -> str:
+    return ",".join(f"{0.5 + int(chan)},{chan}" for chan in scan_list)
+
+
+def test_gather_ascii_in_port_order():
+    scan_list = ["104", "105", "106", "101", "102", "103"]
+    layout = data_aq_read.ScanLayout(scan_list, 2)
+
+    values = layout.gather(scan_response(scan_list))
+
+    assert values.tolist() == [101.5, 102.5, 103.5, 104.5, 105.5, 106.5]
+
+
+def test_gather_binary_values():
+    scan_list = ["101", "102", "103"]
+    layout = data_aq_read.ScanLayout(scan_list, 1)
+    readings = array.array("f", [1.0, 101, 2.0, 102, 3.0, 103])
+
+    assert layout.gather(readings).tolist() == [1.0, 2.0, 3.0]
+
+
+def test_gather_rejects_short_and_mismatched_responses():
+    scan_list = ["101", "102", "103"]
+    layout = data_aq_read.ScanLayout(scan_list, 1)
+
+    assert layout.gather("1.0,101,2.0,102") is None
+    assert layout.gather(scan_response(["101", "103", "102"])) is None
+
+
+def test_no_layout_when_the_scan_misses_a_port_channel():
+    port = Port()
+
+    assert data_aq_read.compile_scan_layout(port, ["101", "102"], 1) is None
+    assert port not in data_aq_read._layouts
+
+
+def test_temperature_configuration_drops_the_voltage_layout(monkeypatch):
+    monkeypatch.setattr(stage_configuration, "DAQ_IDN", "KEITHLEY")
+    monkeypatch.setattr(data_aq_init, "apply_configuration", lambda port, cmds: False)
+    port = Port()
+    data_aq_read.compile_scan_layout(port, ["101", "102", "103"], 1)
+    assert port in data_aq_read._layouts
+
+    data_aq_init.config_data_aq_for_temp(port)
+
+    assert port not in data_aq_read._layouts
+
+
+def test_reset_drops_the_layout():
+    port = Port()
+    data_aq_read.compile_scan_layout(port, ["101", "102", "103"], 1)
+
+    data_aq_init.reset_daq_state(port)
+
+    assert port not in data_aq_read._layouts
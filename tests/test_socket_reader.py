@@ -0,0 +1,99 @@
+import socket
+import struct
+
+import pytest
+
+from system import socket_reader
+
+
+@pytest.fixture
+def connection():
+    instrument, device = socket.socketpair()
+    device.settimeout(1)
+    yield instrument, device
+    instrument.close()
+    device.close()
+
+
+def test_read_until_strips_the_terminator_and_cr(connection):
+    instrument, device = connection
+    reader = socket_reader.SocketReader(device)
+    instrument.sendall(b'0,"No error"\r\nKEITHLEY\n')
+
+    assert bytes(reader.read_until()) == b'0,"No error"'
+    assert bytes(reader.read_until()) == b"KEITHLEY"
+
+
+def test_read_until_waits_for_a_split_terminator(connection):
+    instrument, device = connection
+    reader = socket_reader.SocketReader(device, terminator=b"\r\n")
+    instrument.sendall(b"1.25\r")
+    instrument.sendall(b"\n")
+
+    assert bytes(reader.read_until()) == b"1.25"
+
+
+def test_buffer_grows_for_a_long_response(connection):
+    instrument, device = connection
+    reader = socket_reader.SocketReader(device, size=8)
+    response = b",".join(b"%.6e" % n for n in range(200))
+    instrument.sendall(response + b"\n")
+
+    assert bytes(reader.read_until()) == response
+
+
+def test_read_block_uses_the_length_not_the_terminator(connection):
+    instrument, device = connection
+    reader = socket_reader.SocketReader(device)
+    # the last reading's first byte is the terminator.
+    payload = struct.pack("<2f", 10.0, 0.5) + b"\n\x00\x00\x00"
+    instrument.sendall(b"#212" + payload + b"\n1\n")
+
+    assert bytes(reader.read_response()) == payload
+    assert bytes(reader.read_response()) == b"1"
+
+
+def test_read_block_in_pieces(connection):
+    instrument, device = connection
+    reader = socket_reader.SocketReader(device, size=4)
+    payload = bytes(range(256)) * 4
+    message = b"#41024" + payload + b"\n"
+    for start in range(0, len(message), 100):
+        instrument.sendall(message[start : start + 100])
+
+    assert bytes(reader.read_block()) == payload
+
+
+def test_indefinite_block_with_expected_length(connection):
+    instrument, device = connection
+    reader = socket_reader.SocketReader(device)
+    payload = b"\n\n\n\n"
+    instrument.sendall(b"#0" + payload + b"\n")
+
+    assert bytes(reader.read_block(expected_length=4)) == payload
+
+
+def test_read_block_rejects_text(connection):
+    instrument, device = connection
+    reader = socket_reader.SocketReader(device)
+    instrument.sendall(b"1.0,2.0\n")
+
+    with pytest.raises(ValueError):
+        reader.read_block()
+
+
+def test_closed_instrument_raises(connection):
+    instrument, device = connection
+    reader = socket_reader.SocketReader(device)
+    instrument.sendall(b"partial")
+    instrument.close()
+
+    with pytest.raises(ConnectionError):
+        reader.read_until()
+
+
+def test_get_reader_is_kept_per_socket(connection):
+    _, device = connection
+    reader = socket_reader.get_reader(device)
+
+    assert socket_reader.get_reader(device) is reader